@@ -0,0 +1,122 @@
+import heapq
+import itertools
+import time
+
+
+# --------------------
+# 애니메이션 하나
+# --------------------
+class Animation:
+    __slots__ = ("item", "frames", "frame_ms", "loop", "on_done", "index", "due", "seq",
+                 "active", "visible")
+
+    def __init__(self, item, frames, frame_ms, loop, on_done):
+        self.item = item
+        self.frames = frames
+        self.frame_ms = frame_ms
+        self.loop = loop
+        self.on_done = on_done
+        self.index = 0
+        self.due = 0.0
+        self.seq = 0
+        self.active = True
+        self.visible = True
+
+
+# --------------------
+# 타임라인 (after 체인 대신 시계 하나)
+# --------------------
+class Timeline:
+    """모든 스프라이트 애니메이션을 우선순위 큐 하나로 돌림.
+
+    update()는 렌더 프레임마다 한 번 — 다음 프레임 시각이 지난 것만 꺼내 진행하고,
+    바뀐 이미지는 아이템별로 모아서 마지막에 apply(item, image)로 한 번씩 보냄.
+    안 보이는(set_visible(False)) 애니메이션은 큐에서 빠져 비용이 없다.
+    """
+
+    def __init__(self, apply, clock=time.perf_counter):
+        self.apply = apply
+        self.clock = clock
+        self.heap = []
+        self.counter = itertools.count()
+        self.applied = 0    # 누적 apply 호출 수
+
+    def _push(self, anim):
+        anim.seq = next(self.counter)
+        heapq.heappush(self.heap, (anim.due, anim.seq, anim))
+
+    def play(self, item, frames, frame_ms, loop=True, on_done=None):
+        """첫 프레임을 바로 보여주고 등록. frames가 비었으면 None."""
+        if not frames:
+            return None
+        anim = Animation(item, frames, frame_ms, loop, on_done)
+        anim.due = self.clock() + frame_ms / 1000.0
+        self.apply(item, frames[0])
+        self.applied += 1
+        self._push(anim)
+        return anim
+
+    def stop(self, anim):
+        # 큐에서는 꺼낼 때 버림 (지연 삭제)
+        if anim is not None:
+            anim.active = False
+
+    def set_visible(self, anim, visible):
+        if anim is None or anim.visible == visible:
+            return
+        anim.visible = visible
+        if visible and anim.active:
+            # 다시 보이면 지금부터 이어서 재생
+            anim.due = self.clock()
+            self._push(anim)
+
+    def set_frames(self, anim, frames):
+        # 창 크기 변경 등으로 같은 애니메이션의 이미지 목록만 바뀔 때
+        if anim is None or not frames:
+            return
+        anim.frames = frames
+        anim.index %= len(frames)
+        if anim.active and anim.visible:
+            self.apply(anim.item, frames[anim.index])
+            self.applied += 1
+
+    def update(self, now=None):
+        """지난 프레임만큼 진행. 이번에 바꾼 아이템 수 반환."""
+        if now is None:
+            now = self.clock()
+        heap = self.heap
+        batch = {}
+        finished = []
+        while heap and heap[0][0] <= now:
+            due, seq, anim = heapq.heappop(heap)
+            if not anim.active or not anim.visible or seq != anim.seq:
+                continue
+            step_s = anim.frame_ms / 1000.0
+            # 밀린 프레임은 건너뛰고 지금 보여야 할 프레임으로
+            steps = 1 + int((now - due) / step_s)
+            index = anim.index + steps
+            if index >= len(anim.frames):
+                if not anim.loop:
+                    anim.active = False
+                    finished.append(anim)
+                    continue
+                index %= len(anim.frames)
+            anim.index = index
+            anim.due = due + steps * step_s
+            batch[anim.item] = anim.frames[index]
+            self._push(anim)
+        for item, image in batch.items():
+            self.apply(item, image)
+        self.applied += len(batch)
+        for anim in finished:
+            if anim.on_done is not None:
+                anim.on_done(anim)
+        return len(batch)
+
+    def clear(self):
+        for _, _, anim in self.heap:
+            anim.active = False
+        self.heap = []
+
+    def __len__(self):
+        return sum(1 for _, seq, anim in self.heap if anim.active and seq == anim.seq)
@@ -0,0 +1,164 @@
+"""스프라이트 아틀라스 팩 (빌드 타임에 미리 잘라서/키워서 저장).
+
+    python atlas.py build                       # sprites.json → sprites.atlas
+    python atlas.py build --manifest m.json --out out.atlas
+    python atlas.py info sprites.atlas
+
+팩 구조: MAGIC(8) + 인덱스 길이(uint32 LE) + 인덱스 JSON + 패딩 + RGBA 프레임 데이터.
+런타임에는 mmap으로 열어서 PNG 디코딩/크롭/리샘플 없이 프레임을 꺼낸다.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+from PIL import Image
+
+import sprite_cache
+
+MAGIC = b"PXATLAS1"
+FORMAT_VERSION = 1
+ALIGN = 16
+DEFAULT_MANIFEST = "sprites.json"
+DEFAULT_PACK = "sprites.atlas"
+
+
+# --------------------
+# 빌드
+# --------------------
+def build(manifest_path=DEFAULT_MANIFEST, out_path=DEFAULT_PACK):
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    sizes = manifest.get("frame_sizes", [sprite_cache.FALLBACK_SIZE])
+
+    index = {"version": FORMAT_VERSION, "sheets": {}}
+    chunks = []
+    offset = 0
+    for sheet in manifest["sheets"]:
+        path = sheet["path"]
+        src = os.path.join(base, path)
+        frame_w = sheet.get("frame_width", sprite_cache.FRAME_WIDTH)
+        img = sprite_cache.safe_open_pil(src)
+        entry = {"name": sheet.get("name", path), "mtime": sprite_cache.file_mtime(src),
+                 "frame_width": frame_w, "frame_ms": sheet.get("frame_ms"), "sizes": {}}
+        for size in sizes:
+            # 런타임과 똑같은 방식으로 자름 (slice_frames)
+            offsets = []
+            for frame in sprite_cache.slice_frames(img, size, frame_w):
+                raw = frame.tobytes()
+                offsets.append(offset)
+                chunks.append(raw)
+                offset += len(raw)
+            entry["sizes"][str(size)] = offsets
+        index["sheets"][path] = entry
+
+    header = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    head_len = len(MAGIC) + 4 + len(header)
+    pad = (-head_len) % ALIGN
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * pad)
+        for raw in chunks:
+            f.write(raw)
+    os.replace(tmp, out_path)
+    return index
+
+
+# --------------------
+# 런타임 로더
+# --------------------
+class AtlasPack:
+    """mmap으로 연 아틀라스. frames()는 PIL 이미지를 복사 없이 바로 만든다."""
+
+    def __init__(self, path=DEFAULT_PACK):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"아틀라스 파일이 아님: {path}")
+        (head_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.index = json.loads(self._mm[start:start + head_len].decode("utf-8"))
+        if self.index.get("version") != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 아틀라스 버전: {self.index.get('version')}")
+        end = start + head_len
+        self.data_start = end + (-end) % ALIGN
+        self._view = memoryview(self._mm)
+
+    def has(self, path, size, mtime=None, frame_w=sprite_cache.FRAME_WIDTH):
+        entry = self.index["sheets"].get(path)
+        if entry is None or str(size) not in entry["sizes"] or entry["frame_width"] != frame_w:
+            return False
+        # 원본 PNG가 빌드 이후 바뀌었으면 팩 내용은 낡은 것
+        return mtime is None or entry["mtime"] == mtime
+
+    def frames(self, path, size):
+        offsets = self.index["sheets"][path]["sizes"][str(size)]
+        n = size * size * 4
+        frames = []
+        for off in offsets:
+            start = self.data_start + off
+            frames.append(Image.frombuffer("RGBA", (size, size), self._view[start:start + n],
+                                           "raw", "RGBA", 0, 1))
+        return frames
+
+    def frame_ms(self, path):
+        entry = self.index["sheets"].get(path)
+        return entry.get("frame_ms") if entry else None
+
+    def close(self):
+        # 아직 살아있는 프레임이 버퍼를 잡고 있으면 GC에 맡김
+        try:
+            if getattr(self, "_view", None) is not None:
+                self._view.release()
+                self._view = None
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+        except BufferError:
+            pass
+        self._file.close()
+
+
+def load_pack(path=DEFAULT_PACK):
+    # 팩이 없거나 깨졌으면 None (PNG 경로로 동작)
+    if not os.path.exists(path):
+        return None
+    try:
+        return AtlasPack(path)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스프라이트 아틀라스 빌드/조회")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build")
+    b.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    b.add_argument("--out", default=DEFAULT_PACK)
+    i = sub.add_parser("info")
+    i.add_argument("path", nargs="?", default=DEFAULT_PACK)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        index = build(args.manifest, args.out)
+        print(f"{args.out}: {len(index['sheets'])} sheets, {os.path.getsize(args.out)} bytes")
+    else:
+        pack = AtlasPack(args.path)
+        for path, entry in pack.index["sheets"].items():
+            print(f"{path}: sizes={','.join(entry['sizes'])} frames={len(next(iter(entry['sizes'].values())))}"
+                  f" frame_ms={entry['frame_ms']}")
+        pack.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+from PIL import Image
+
+from sprite_cache import LRUCache, to_photo
+
+# --------------------
+# 설정
+# --------------------
+SETTLE_MS = 120        # 마지막 Configure 이후 이만큼 조용하면 실제 리샘플
+SCALES_PER_MAP = 4     # 맵마다 보관할 배경 크기 개수
+
+
+# --------------------
+# 배경 렌더러
+# --------------------
+class BackgroundRenderer:
+    """창 크기 변경을 모아서 한 번만 리샘플하고, 크기별 배경을 맵마다 캐시."""
+
+    def __init__(self, root, canvas, settle_ms=SETTLE_MS, scales_per_map=SCALES_PER_MAP):
+        self.root = root
+        self.canvas = canvas
+        self.settle_ms = settle_ms
+        self.scales_per_map = scales_per_map
+        self.caches = {}       # 맵 키 -> LRUCache((w, h) -> PhotoImage)
+        self.key = None
+        self.source = None
+        self.bg_id = None
+        self.photo = None      # 현재 표시 중인 이미지 (GC 방지)
+        self.shown_size = None
+        self.target_size = None
+        self.pending = None
+        self.resamples = 0
+        self.on_settled = None  # 실제 크기가 정해졌을 때 (w, h) 알림 (선읽기용)
+        # 맵이 화면보다 넓을 때 같은 배경을 이어 붙이는 추가 아이템 (보이는 칸만 사용)
+        self.tile_ids = []
+        self.tiles_shown = 0
+        self.scroll_offset = (0, 0)
+        self.placed = None
+        self.hidden = False     # 배경 PNG가 없는 맵(타일맵 등)에서는 숨김
+
+    def set_source(self, key, image):
+        # 맵 변경: 원본 교체. 실제 표시는 request_size에서
+        self.cancel_pending()
+        self.key = key
+        self.source = image
+        self.shown_size = None
+        if image is None:
+            self._hide()
+
+    def cancel_pending(self):
+        if self.pending is not None:
+            try:
+                self.root.after_cancel(self.pending)
+            except Exception:
+                pass
+            self.pending = None
+
+    def _cache(self):
+        cache = self.caches.get(self.key)
+        if cache is None:
+            cache = self.caches[self.key] = LRUCache(self.scales_per_map)
+        return cache
+
+    def _nearest_cached(self, w, h):
+        cache = self._cache()
+        best = None
+        for (cw, ch) in cache.items:
+            score = abs(cw - w) + abs(ch - h)
+            if best is None or score < best[0]:
+                best = (score, (cw, ch))
+        return best[1] if best else None
+
+    def _hide(self):
+        if self.bg_id is None or self.hidden:
+            return
+        for item in self.items():
+            self.canvas.itemconfig(item, state="hidden")
+        self.tiles_shown = 0
+        self.placed = None
+        self.hidden = True
+
+    def _show(self, size, photo):
+        if self.hidden:
+            self.canvas.itemconfig(self.bg_id, state="normal")
+            self.hidden = False
+        if self.bg_id is None:
+            self.bg_id = self.canvas.create_image(0, 0, image=photo, anchor="nw")
+            self.canvas.tag_lower(self.bg_id)
+        elif size != self.shown_size:
+            self.canvas.itemconfig(self.bg_id, image=photo)
+            for tile in self.tile_ids:
+                self.canvas.itemconfig(tile, image=photo)
+        self.photo = photo
+        self.shown_size = size
+        self.placed = None
+        self._place_tiles()
+
+    # --------------------
+    # 스크롤 (카메라)
+    # --------------------
+    def scroll(self, ox, oy):
+        # 카메라 위치(화면 픽셀)에 맞춰 배경을 타일처럼 이어서 배치
+        self.scroll_offset = (round(ox), round(oy))
+        self._place_tiles()
+
+    def _place_tiles(self):
+        if self.bg_id is None or self.shown_size is None:
+            return
+        tw, th = self.shown_size
+        ox, oy = self.scroll_offset
+        x0, y0 = -(ox % tw), -(oy % th)
+        vw = self.canvas.winfo_width() or tw
+        vh = self.canvas.winfo_height() or th
+        key = (x0, y0, tw, th, vw, vh)
+        if key == self.placed:
+            return
+        self.placed = key
+        spots = [(x, y) for x in range(x0, vw, tw) for y in range(y0, vh, th)] or [(x0, y0)]
+        self.canvas.coords(self.bg_id, *spots[0])
+        extra = spots[1:]
+        while len(self.tile_ids) < len(extra):
+            tile = self.canvas.create_image(0, 0, image=self.photo, anchor="nw")
+            self.canvas.tag_raise(tile, self.bg_id)
+            self.tile_ids.append(tile)
+        for n, tile in enumerate(self.tile_ids):
+            if n < len(extra):
+                self.canvas.coords(tile, *extra[n])
+                if n >= self.tiles_shown:
+                    self.canvas.itemconfig(tile, state="normal")
+            elif n < self.tiles_shown:
+                self.canvas.itemconfig(tile, state="hidden")
+        self.tiles_shown = len(extra)
+
+    def reposition(self):
+        # canvas.move 등으로 밖에서 옮겨진 뒤 제자리로
+        self.placed = None
+        self._place_tiles()
+
+    def items(self):
+        # 지금 보이는 배경 아이템들 (맵 전환 슬라이드용)
+        if self.bg_id is None or self.hidden:
+            return []
+        return [self.bg_id] + self.tile_ids[:self.tiles_shown]
+
+    def request_size(self, w, h, immediate=False):
+        if self.source is None or w <= 0 or h <= 0:
+            return
+        size = (w, h)
+        self.target_size = size
+        cache = self._cache()
+        photo = cache.get(size)
+        if photo is not None:
+            self.cancel_pending()
+            self._show(size, photo)
+            return
+        nearest = self._nearest_cached(w, h)
+        if immediate or nearest is None:
+            # 처음 보는 맵이면 기다리지 않고 바로 그림
+            self.cancel_pending()
+            self._apply()
+            return
+        # 연속 드래그 중엔 가장 가까운 캐시 크기를 보여주고 마지막 크기만 처리
+        if nearest != self.shown_size or self.bg_id is None:
+            self._show(nearest, cache.items[nearest])
+        self.cancel_pending()
+        self.pending = self.root.after(self.settle_ms, self._apply)
+
+    def _apply(self):
+        self.pending = None
+        if self.source is None or self.target_size is None:
+            return
+        size = self.target_size
+        cache = self._cache()
+        photo = cache.get(size)
+        if photo is None:
+            photo = to_photo(self.source.resize(size, Image.NEAREST))
+            cache.put(size, photo)
+            self.resamples += 1
+        self._show(size, photo)
+        if self.on_settled is not None:
+            self.on_settled(size)
+
+    def has(self, key, size):
+        cache = self.caches.get(key)
+        return cache is not None and size in cache
+
+    def store(self, key, size, scaled):
+        # 미리 리샘플된 PIL 이미지를 캐시에 넣기 (Tk 스레드에서만 호출)
+        cache = self.caches.get(key)
+        if cache is None:
+            cache = self.caches[key] = LRUCache(self.scales_per_map)
+        if size not in cache:
+            cache.put(size, to_photo(scaled))
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.caches.clear()
+        else:
+            self.caches.pop(key, None)
+        self.shown_size = None
@@ -0,0 +1,578 @@
+"""화면 없이 돌리는 벤치마크.
+
+    python bench.py                          # 실행 후 bench_results.json 저장
+    python bench.py --save-baseline base.json
+    python bench.py --baseline base.json --threshold 0.25   # 느려지면 종료코드 1
+
+캔버스는 호출 수만 세는 대역(FakeCanvas)을 쓰고, Tk를 띄울 수 없으면
+PhotoImage도 대역으로 바꾼다. 에셋은 임시 폴더에 생성한다.
+맵 로드/리사이즈/틱/렌더/맵 전환은 main.py의 함수를 그대로 부른다 (setup_game).
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageTk
+
+import savegame
+import sprite_cache
+import tilemap
+from camera import Camera, EntityIndex, visible_walls, visible_entities
+from entities import EntityStore, NPC, MONSTER, DEFAULT_SIZE
+from combat import Combat, attack_hitbox
+from navigation import Navigator, astar
+from animation import Timeline
+from overlay import RetainedCanvas
+from compositor import SoftImage, SoftwareCanvas
+from ui import GameUI
+from game_state import GameState, BASE_WIDTH, BASE_HEIGHT, BASE_PLAYER_SIZE, SHOP_ITEMS
+from transition import MapTransition
+
+# --------------------
+# 설정
+# --------------------
+WINDOW_SIZES = [(800, 600), (1024, 768), (1920, 1080)]
+WALL_COUNTS = [4, 100, 1000]
+ENTITY_COUNTS = [10, 100, 1000]
+SHEET_FRAMES = {"player": 5, "attack": 9, "shop": 2, "monster": 4}
+MIN_MS = 0.005           # 이보다 짧은 지표는 잡음이라 회귀 판정에서 제외
+DEFAULT_THRESHOLD = 0.25
+
+
+# --------------------
+# Tk 대역
+# --------------------
+class FakeCanvas:
+    def __init__(self, width=BASE_WIDTH, height=BASE_HEIGHT):
+        self.width = width
+        self.height = height
+        self.next_id = 1
+        self.calls = 0
+
+    def _new(self):
+        self.calls += 1
+        self.next_id += 1
+        return self.next_id
+
+    def create_image(self, *a, **k):
+        return self._new()
+
+    def create_rectangle(self, *a, **k):
+        return self._new()
+
+    def create_text(self, *a, **k):
+        return self._new()
+
+    def coords(self, *a):
+        self.calls += 1
+
+    def itemconfig(self, *a, **k):
+        self.calls += 1
+
+    def move(self, *a):
+        self.calls += 1
+
+    def delete(self, *a):
+        self.calls += 1
+
+    def tag_raise(self, *a):
+        self.calls += 1
+
+    def tag_lower(self, *a):
+        self.calls += 1
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+
+class FakeRoot:
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, fn=None):
+        self.next_id += 1
+        self.pending[self.next_id] = fn
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        # 예약된 after 콜백을 지금 실행 (시간은 흐르지 않음)
+        pending, self.pending = self.pending, {}
+        for fn in pending.values():
+            fn()
+
+
+class FakePhoto:
+    def __init__(self, image=None, **kw):
+        self.size = image.size if image is not None else (0, 0)
+
+
+def setup_photo_backend():
+    # 화면이 있으면 진짜 PhotoImage, 없으면 대역
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return "tk", root
+    except Exception:
+        ImageTk.PhotoImage = FakePhoto
+        return "fake", None
+
+
+def setup_game(paths, maps, start):
+    """main.py를 창 없이 — FakeRoot/FakeCanvas를 물리고 에셋 경로만 임시 폴더로 바꿈.
+
+    끝나면 game.shutdown()으로 선읽기 스레드를 정리.
+    """
+    import main as game
+    game.root = FakeRoot()
+    game.warm_imports()
+    game.SPRITE_PATHS = {d: paths["player"] for d in game.SPRITES}
+    game.SHOP_SPRITE_PATH = paths["shop"]
+    game.ATTACK_SPRITE_PATH = game.BACK_ATTACK_SPRITE_PATH = paths["attack"]
+    game.MONSTER_SPRITE_PATH = paths["monster"]
+    game.MAPS = maps
+    game.state = GameState(maps, start)
+    game.state.profiler = game.profiler
+    # 이전 벤치가 남긴 그리기 상태
+    game.player_sprite = None
+    game.cull_state = None
+    game.shop_anims.clear()
+    game.attack_anim = None
+    game.transition = None
+    game.map_transitioning = False
+    game.streamer = None
+    game.setup_canvas(FakeCanvas())
+    game.load_map(start)
+    return game
+
+
+# --------------------
+# 측정
+# --------------------
+def measure(fn, repeat, warmup=3):
+    for _ in range(warmup):
+        fn()
+    times = []
+    total_start = time.perf_counter()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    total = time.perf_counter() - total_start
+    times.sort()
+    def pick(q):
+        return times[min(len(times) - 1, int(q * len(times)))] * 1000
+    return {"ops_per_sec": repeat / total if total > 0 else float("inf"),
+            "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99),
+            "repeat": repeat}
+
+
+# --------------------
+# 에셋/맵 생성
+# --------------------
+def make_assets(folder):
+    rng = random.Random(1)
+    paths = {}
+    for name, frames in SHEET_FRAMES.items():
+        img = Image.new("RGBA", (32 * frames, 32))
+        img.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)
+                     for _ in range(img.width * img.height)])
+        paths[name] = os.path.join(folder, name + ".png")
+        img.save(paths[name])
+    bg = Image.new("RGB", (1152, 648), (40, 120, 60))
+    paths["bg"] = os.path.join(folder, "bg.png")
+    bg.save(paths["bg"])
+    paths["bg2"] = os.path.join(folder, "bg2.png")
+    bg.save(paths["bg2"])
+    return paths
+
+def make_map(wall_count, bg_path, seed=0):
+    rng = random.Random(seed)
+    walls = [(0, 0, BASE_WIDTH, 32), (0, BASE_HEIGHT - 32, BASE_WIDTH, BASE_HEIGHT)]
+    while len(walls) < wall_count:
+        x = rng.randrange(64, BASE_WIDTH - 96)
+        y = rng.randrange(64, BASE_HEIGHT - 96)
+        walls.append((x, y, x + rng.randrange(8, 48), y + rng.randrange(8, 24)))
+    return {"bg": bg_path, "npc": [(800, 400)], "shop": [(200, 150)], "walls": walls,
+            "player_start": (100, BASE_HEIGHT - 32 - 64 - 1),
+            "left_map_trigger": None, "right_map_trigger": None,
+            "left_map": None, "right_map": None, "gravity": True}
+
+
+# --------------------
+# 벤치마크들
+# --------------------
+def bench_spritesheet(paths, results):
+    for w, h in WINDOW_SIZES:
+        size = max(4, int(64 * min(w / BASE_WIDTH, h / BASE_HEIGHT)))
+        def cold():
+            sprite_cache.invalidate()
+            sprite_cache.get_frames(paths["attack"], size)
+        def warm():
+            sprite_cache.get_frames(paths["attack"], size)
+        results[f"spritesheet_cold_{w}x{h}"] = measure(cold, 50)
+        results[f"spritesheet_warm_{w}x{h}"] = measure(warm, 2000)
+
+def bench_rescale(paths, results):
+    # main.rescale_elements: 창 크기 그대로인 Configure / 배경 리샘플까지 하는 경우
+    game = setup_game(paths, {"m": make_map(100, paths["bg"])}, "m")
+    canvas = game.canvas
+    for w, h in WINDOW_SIZES:
+        canvas.width, canvas.height = w, h
+        def rescale_cold():
+            game.bg_renderer.invalidate()
+            game.rescale_elements(immediate=True)
+        results[f"rescale_warm_{w}x{h}"] = measure(game.rescale_elements, 500)
+        results[f"rescale_bg_resample_{w}x{h}"] = measure(rescale_cold, 20)
+    game.shutdown()
+
+def bench_load_map(paths, results):
+    for count in WALL_COUNTS:
+        maps = {"a": make_map(count, paths["bg"], 1), "b": make_map(count, paths["bg2"], 2)}
+        game = setup_game(paths, maps, "a")
+        names = ["a", "b"]
+        def load():
+            names.reverse()
+            game.load_map(names[0])
+        results[f"load_map_{count}_walls"] = measure(load, 100)
+        game.shutdown()
+
+def bench_collision(paths, results):
+    for count in WALL_COUNTS:
+        state = GameState({"m": make_map(count, paths["bg"])}, "m")
+        state.load_map("m")
+        rng = random.Random(3)
+        points = [(rng.randrange(0, BASE_WIDTH - 64), rng.randrange(0, BASE_HEIGHT - 64))
+                  for _ in range(256)]
+        def check():
+            for x, y in points:
+                state.check_collision(x, y)
+        r = measure(check, 200)
+        r["ops_per_sec"] *= len(points)
+        results[f"check_collision_{count}_walls"] = r
+
+def bench_tick(paths, results):
+    # main.move_loop (state.step + 퀘스트/UI/포탈 확인)
+    for count in WALL_COUNTS:
+        game = setup_game(paths, {"m": make_map(count, paths["bg"])}, "m")
+        inputs = [{'d'}] * 40 + [{'a'}] * 40
+        i = [0]
+        def tick():
+            keys = game.state.keys_pressed
+            keys.clear()
+            keys.update(inputs[i[0] % len(inputs)])
+            if i[0] % 17 == 0:
+                game.state.start_jump()
+            game.move_loop()
+            i[0] += 1
+        results[f"tick_{count}_walls"] = measure(tick, 5000)
+        game.shutdown()
+
+def bench_render(paths, results):
+    # main.render 한 프레임: 걸어 다닐 때 / 가만히 있을 때 (retained가 Tcl 호출을 거의 다 건너뜀)
+    for count in WALL_COUNTS:
+        game = setup_game(paths, {"m": make_map(count, paths["bg"])}, "m")
+        canvas = game.canvas
+        i = [0]
+        def walk():
+            keys = game.state.keys_pressed
+            keys.clear()
+            keys.add('d' if i[0] // 40 % 2 == 0 else 'a')
+            i[0] += 1
+            game.move_loop()
+            game.render()
+        canvas.calls = 0
+        r = measure(walk, 1000)
+        r["tcl_calls"] = canvas.calls
+        results[f"render_walk_{count}_walls"] = r
+        game.state.keys_pressed.clear()
+        game.move_loop()
+        game.render()
+        canvas.calls = 0
+        r = measure(game.render, 1000)
+        r["tcl_calls"] = canvas.calls
+        results[f"render_idle_{count}_walls"] = r
+        game.shutdown()
+
+def bench_entities(paths, results):
+    for count in ENTITY_COUNTS:
+        rng = random.Random(4)
+        store = EntityStore()
+        for n in range(count):
+            kind = MONSTER if n % 2 else NPC
+            store.spawn(kind, rng.randrange(64, BASE_WIDTH - 128), rng.randrange(64, BASE_HEIGHT - 128),
+                        vx=rng.choice((-3, 3)) if kind == MONSTER else 0, frame_count=8, frame_ms=100)
+        bounds = (0, 0, BASE_WIDTH, BASE_HEIGHT)
+        r = measure(lambda: store.update(50, bounds), 500)
+        results[f"entities_update_{count}"] = r
+
+def bench_interaction(paths, results):
+    for count in ENTITY_COUNTS:
+        rng = random.Random(5)
+        data = make_map(4, paths["bg"])
+        data["npc"] = [(rng.randrange(BASE_WIDTH), rng.randrange(BASE_HEIGHT)) for _ in range(count)]
+        data["shop"] = [(rng.randrange(BASE_WIDTH), rng.randrange(BASE_HEIGHT)) for _ in range(count)]
+        state = GameState({"m": data}, "m")
+        state.load_map("m")
+        points = [(rng.randrange(BASE_WIDTH), rng.randrange(BASE_HEIGHT)) for _ in range(256)]
+        def query():
+            for x, y in points:
+                state.interactions.nearest(x, y)
+        r = measure(query, 200)
+        r["ops_per_sec"] *= len(points)
+        results[f"interaction_nearest_{count * 2}"] = r
+
+def bench_combat(paths, results):
+    # 화면 가득한 몬스터에 공격 판정 한 틱 (맞아도 죽지 않게 hp를 크게)
+    for count in ENTITY_COUNTS:
+        rng = random.Random(8)
+        store = EntityStore()
+        for _ in range(count):
+            store.spawn(MONSTER, rng.randrange(BASE_WIDTH), rng.randrange(BASE_HEIGHT), vx=2, hp=30000)
+        combat = Combat()
+        box = attack_hitbox(BASE_WIDTH / 2, BASE_HEIGHT / 2, BASE_PLAYER_SIZE, 'd')
+        def swing():
+            combat.start_swing()
+            combat.resolve(store, box)
+        results[f"combat_resolve_{count}"] = measure(swing, 1000)
+
+def bench_navigation(paths, results):
+    # 벽 많은 맵에서 구석 -> 구석 경로: 캐시 없는 탐색 / 캐시 적중 / 몬스터 100마리 요청의 틱당 비용
+    data = make_map(100, paths["bg"], seed=9)
+    nav = Navigator()
+    nav.build(data["walls"], BASE_WIDTH, BASE_HEIGHT, DEFAULT_SIZE[MONSTER])
+    grid = nav.grid
+    start, goal = grid.cell_of(64, 64), grid.cell_of(BASE_WIDTH - 128, BASE_HEIGHT - 128)
+    def search():
+        for _ in astar(grid, start, goal):
+            pass
+    results["nav_astar_uncached"] = measure(search, 50)
+    nav.request(0, (64, 64), (BASE_WIDTH - 128, BASE_HEIGHT - 128))
+    nav.update(math.inf)
+    def cached():
+        nav.request(0, (64, 64), (BASE_WIDTH - 128, BASE_HEIGHT - 128))
+        nav.take_all()
+    results["nav_cached"] = measure(cached, 1000)
+    rng = random.Random(9)
+    agents = [(rng.randrange(BASE_WIDTH), rng.randrange(BASE_HEIGHT)) for _ in range(100)]
+    def tick():
+        # 매번 새 목표 — 캐시를 비우고 예산만큼만 진행
+        nav.cache.clear()
+        for i, xy in enumerate(agents):
+            nav.request(i, xy, (BASE_WIDTH / 2, BASE_HEIGHT / 2))
+        nav.update()
+    results["nav_tick_100_agents"] = measure(tick, 100)
+
+def bench_animation(paths, results):
+    # 렌더 프레임(16ms)마다 update — 애니메이션 수가 늘어도 타이머는 하나
+    for count in ENTITY_COUNTS:
+        canvas = FakeCanvas()
+        retained = RetainedCanvas(canvas)
+        now = [0.0]
+        timeline = Timeline(lambda item, image: retained.config(item, image=image), clock=lambda: now[0])
+        frames = ["f%d" % n for n in range(8)]
+        for n in range(count):
+            timeline.play(canvas.create_image(), frames, 120 + n % 7 * 20)
+        canvas.calls = 0
+        def frame():
+            now[0] += 0.016
+            timeline.update()
+        r = measure(frame, 1000)
+        r["tcl_calls"] = canvas.calls
+        results[f"animation_update_{count}"] = r
+
+def bench_camera(paths, results):
+    # 20000px 폭 맵을 한쪽 끝에서 끝까지 걸으며 컬링 (화면 한 장 맵과 비교)
+    for width in (BASE_WIDTH, 20000):
+        rng = random.Random(6)
+        data = make_map(4, paths["bg"])
+        data["size"] = (width, BASE_HEIGHT)
+        data["walls"] = [(0, 0, width, 32), (0, BASE_HEIGHT - 32, width, BASE_HEIGHT)] + [
+            (x, 400, x + 40, 420) for x in range(100, width, 150)]
+        data["npc"] = [(rng.randrange(width), rng.randrange(BASE_HEIGHT)) for _ in range(width // 40)]
+        state = GameState({"m": data}, "m")
+        state.load_map("m")
+        camera = Camera()
+        index = EntityIndex(NPC)
+        xs = list(range(0, width, 6))
+        i = [0]
+        def frame():
+            x = xs[i[0] % len(xs)]
+            i[0] += 1
+            camera.follow(x, 400, state.world_w, state.world_h)
+            visible_walls(state.wall_index, camera)
+            visible_entities(index, state.entities, camera)
+        results[f"camera_cull_{width}px"] = measure(frame, 1000)
+
+def bench_compositor(paths, results):
+    # 소프트웨어 렌더러: 배경 + 움직이는 스프라이트 N개를 dirty 영역만 다시 합성
+    bg = SoftImage(Image.open(paths["bg"]).resize((BASE_WIDTH, BASE_HEIGHT)))
+    sprite = SoftImage(Image.new("RGBA", (BASE_PLAYER_SIZE, BASE_PLAYER_SIZE), (255, 0, 0, 200)))
+    for count in (1, 10, 100):
+        rng = random.Random(7)
+        soft = SoftwareCanvas(None, BASE_WIDTH, BASE_HEIGHT)
+        soft.create_image(0, 0, image=bg, anchor="nw")
+        items = [soft.create_image(rng.randrange(BASE_WIDTH), rng.randrange(BASE_HEIGHT), image=sprite)
+                 for _ in range(count)]
+        soft.present()
+        def frame():
+            for item in items:
+                soft.move(item, 2, 0)
+            soft.present()
+        results[f"compositor_{count}_moving"] = measure(frame, 100)
+    results["compositor_idle"] = measure(soft.present, 1000)
+
+def bench_ui(paths, results):
+    # 상점 패널: 내용이 그대로인 프레임 / 구매로 글자가 바뀌는 프레임
+    state = GameState({"m": make_map(4, paths["bg"])}, "m")
+    state.load_map("m")
+    canvas = FakeCanvas()
+    ui = GameUI(canvas, RetainedCanvas(canvas), state, SHOP_ITEMS, on_buy=lambda name, price: True)
+    ui.open_shop()
+    ui.draw(BASE_WIDTH, BASE_HEIGHT)
+    results["ui_idle_frame"] = measure(lambda: ui.draw(BASE_WIDTH, BASE_HEIGHT), 1000)
+    n = [0]
+    def changed():
+        n[0] += 1
+        state.gold = n[0]
+        ui.draw(BASE_WIDTH, BASE_HEIGHT)
+    results["ui_changed_frame"] = measure(changed, 1000)
+
+def bench_save(paths, results):
+    # Tk 스레드가 내는 비용(스냅샷 + 저장 요청)과 저장 스레드 쪽 인코딩/원자적 쓰기를 따로
+    state = GameState({"m": make_map(4, paths["bg"])}, "m")
+    state.load_map("m")
+    state.inventory = ["체력포션", "마나포션", "강화석"] * 100
+    path = os.path.join(os.path.dirname(paths["bg"]), "save.dat")
+    saver = savegame.AutoSaver(path)
+    results["save_snapshot_submit"] = measure(lambda: saver.save(state.snapshot()), 1000)
+    saver.shutdown()
+    snap = state.snapshot()
+    results["save_encode"] = measure(lambda: savegame.encode(snap), 200)
+    blob = savegame.encode(snap)
+    results["save_write_atomic"] = measure(lambda: savegame.write_atomic(path, blob), 50)
+    results["save_load"] = measure(lambda: savegame.load(path), 200)
+
+def bench_tilemap(paths, results):
+    # 컴파일본 로드는 헤더만 읽으므로 맵 폭과 거의 무관해야 함
+    folder = os.path.dirname(paths["bg"])
+    for chunks_w in (2, 40):
+        src = os.path.join(folder, f"tiles_{chunks_w}.json")
+        tilemap.new_map(src, chunks_w, 2)
+        tilemap.TileMap(src).close()
+        def load():
+            tilemap.TileMap(src).close()
+        results[f"tilemap_load_{chunks_w}_chunks"] = measure(load, 200)
+    tmap = tilemap.TileMap(src)
+    results["tilemap_render_chunk"] = measure(lambda: tmap.render_chunk(3, 1, (512, 512)), 50)
+    tmap.close()
+
+def bench_transition(paths, results):
+    # main.animate_map_transition을 16ms 프레임마다 render()로 끝까지 (시계만 가짜)
+    maps = {"a": make_map(100, paths["bg"], 1), "b": make_map(100, paths["bg2"], 2)}
+    game = setup_game(paths, maps, "a")
+    now = [0.0]
+    game.MapTransition = lambda *a, **k: MapTransition(*a, clock=lambda: now[0], **k)
+    names = ["a", "b"]
+    def run():
+        names.reverse()
+        game.animate_map_transition(names[0])
+        while game.transition is not None:
+            now[0] += 0.016
+            game.render()
+        game.root.run_pending()    # 전환 뒤 쿨다운 해제
+    game.canvas.calls = 0
+    r = measure(run, 50)
+    r["tcl_calls"] = game.canvas.calls
+    results["map_transition"] = r
+    game.MapTransition = MapTransition
+    game.shutdown()
+
+
+BENCHES = [bench_spritesheet, bench_rescale, bench_load_map, bench_collision, bench_tick, bench_render,
+           bench_entities, bench_interaction, bench_combat, bench_navigation,
+           bench_animation, bench_camera, bench_tilemap, bench_compositor,
+           bench_ui, bench_save, bench_transition]
+
+
+# --------------------
+# 실행/비교
+# --------------------
+def run_all(only=None):
+    backend, root = setup_photo_backend()
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        paths = make_assets(folder)
+        for bench in BENCHES:
+            if only and only not in bench.__name__:
+                continue
+            bench(paths, results)
+        sprite_cache.invalidate()
+    if root is not None:
+        root.destroy()
+    return {"backend": backend, "python": sys.version.split()[0], "results": results}
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    # p50 지연이 기준보다 threshold 비율 이상 늘면 회귀
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        cur = current["results"].get(name)
+        if cur is None:
+            continue
+        if max(base["p50_ms"], cur["p50_ms"]) < MIN_MS:
+            continue
+        if cur["p50_ms"] > base["p50_ms"] * (1 + threshold):
+            regressions.append((name, base["p50_ms"], cur["p50_ms"]))
+    return regressions
+
+def print_table(report):
+    print(f"backend={report['backend']} python={report['python']}")
+    print("%-36s %12s %9s %9s %9s" % ("bench", "ops/sec", "p50 ms", "p95 ms", "p99 ms"))
+    for name, r in report["results"].items():
+        print("%-36s %12.1f %9.4f %9.4f %9.4f" % (name, r["ops_per_sec"], r["p50_ms"],
+                                                r["p95_ms"], r["p99_ms"]))
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="픽셀 RPG headless 벤치마크")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", help="이번 결과를 기준으로 저장")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 벤치만 실행")
+    args = parser.parse_args(argv)
+
+    report = run_all(args.only)
+    print_table(report)
+    write_json(args.out, report)
+    if args.save_baseline:
+        write_json(args.save_baseline, report)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"회귀: {name} p50 {before:.4f}ms -> {after:.4f}ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+from entities import COLUMN_PX
+from game_state import BASE_WIDTH, BASE_HEIGHT
+
+# --------------------
+# 설정
+# --------------------
+CULL_MARGIN = 64   # 화면 밖이라도 이만큼 안쪽은 미리 배치 (가장자리 튐 방지)
+
+
+# --------------------
+# 카메라
+# --------------------
+class Camera:
+    """월드 좌표에서 화면 한 장(view_w x view_h) 크기의 창.
+
+    follow()로 대상을 가운데 두되 맵 밖은 보이지 않게 맵 경계 안으로 제한.
+    화면 좌표 = (월드 좌표 - 카메라 위치) * 창 배율.
+    """
+
+    def __init__(self, view_w=BASE_WIDTH, view_h=BASE_HEIGHT, margin=CULL_MARGIN):
+        self.view_w = view_w
+        self.view_h = view_h
+        self.margin = margin
+        self.x = 0.0
+        self.y = 0.0
+
+    def follow(self, cx, cy, world_w, world_h):
+        # (cx, cy)를 가운데로. 위치가 바뀌었으면 True
+        x = min(max(cx - self.view_w / 2, 0), max(0, world_w - self.view_w))
+        y = min(max(cy - self.view_h / 2, 0), max(0, world_h - self.view_h))
+        if x == self.x and y == self.y:
+            return False
+        self.x, self.y = x, y
+        return True
+
+    def view_rect(self, margin=None):
+        m = self.margin if margin is None else margin
+        return (self.x - m, self.y - m, self.x + self.view_w + m, self.y + self.view_h + m)
+
+
+# --------------------
+# 컬링
+# --------------------
+def visible_walls(wall_index, camera):
+    # 화면(+여유) 안에 걸친 벽만 — 격자 조회라 맵 전체 벽 수와 무관
+    return wall_index.query(*camera.view_rect())
+
+def visible_entities(index, store, camera):
+    """화면(+여유)과 겹치는 살아있는 엔티티 번호 목록 (index의 종류만)."""
+    return index.query(store, *camera.view_rect())
+
+
+class EntityIndex:
+    """종류 하나의 엔티티를 왼쪽 x가 든 칸(store.col, COLUMN_PX 폭)별로 묶은 색인.
+
+    생성/제거(store.version)가 있을 때만 다시 만든다. 움직이는 엔티티는 store.col_log에
+    남은 칸 이동만 따라 옮기므로 매 틱 움직이는 몬스터도 맵 전체를 훑지 않는다.
+    조회는 화면 폭에 걸친 칸만 본다.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.key = None
+        self.columns = {}    # 칸 번호 -> [엔티티 번호]
+        self.max_w = 0.0     # 가장 넓은 엔티티 폭 (왼쪽 칸에서 걸쳐 들어오는 것까지 보려고)
+        self.seen = 0        # 여기까지 반영한 col_log 누적 위치
+        self.rebuilds = 0
+        self.moved = 0       # 칸을 옮긴 누적 횟수
+
+    def _rebuild(self, store):
+        col, ws = store.col, store.w
+        columns = {}
+        max_w = 0.0
+        for i in store.indices(self.kind):
+            columns.setdefault(col[i], []).append(i)
+            max_w = max(max_w, ws[i])
+        self.columns = columns
+        self.max_w = max_w
+        self.seen = store.col_log_base + len(store.col_log)
+        self.rebuilds += 1
+
+    def _apply_moves(self, store):
+        log, base = store.col_log, store.col_log_base
+        if self.seen == base + len(log):
+            return
+        if self.seen < base:
+            # 기록이 잘려 나간 뒤라 따라갈 수 없음
+            self._rebuild(store)
+            return
+        kinds, kind, columns = store.kind, self.kind, self.columns
+        for i, old, new in log[self.seen - base:]:
+            if kinds[i] != kind:
+                continue
+            columns[old].remove(i)
+            columns.setdefault(new, []).append(i)
+            self.moved += 1
+        self.seen = base + len(log)
+
+    def query(self, store, x1, y1, x2, y2):
+        key = (id(store), store.version)
+        if key != self.key:
+            self._rebuild(store)
+            self.key = key
+        else:
+            self._apply_moves(store)
+        xs, ys, ws, hs, columns = store.x, store.y, store.w, store.h, self.columns
+        found = []
+        for c in range(int((x1 - self.max_w) // COLUMN_PX), int(x2 // COLUMN_PX) + 1):
+            bucket = columns.get(c)
+            if bucket:
+                found.extend(i for i in bucket
+                             if xs[i] < x2 and xs[i] + ws[i] > x1 and ys[i] < y2 and ys[i] + hs[i] > y1)
+        return found
@@ -0,0 +1,40 @@
+# --------------------
+# 캔버스 아이템 풀
+# --------------------
+class CanvasPool:
+    """같은 종류의 캔버스 아이템을 지우지 않고 숨겼다가 다시 씀.
+
+    create(canvas)는 새 아이템 id를 돌려주는 함수. 필요 개수가 늘 때만 만든다.
+    """
+
+    def __init__(self, canvas, create):
+        self.canvas = canvas
+        self.create = create
+        self.active = []
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self):
+        if self.free:
+            item = self.free.pop()
+            self.canvas.itemconfig(item, state="normal")
+            self.reused += 1
+        else:
+            item = self.create(self.canvas)
+            self.created += 1
+        self.active.append(item)
+        return item
+
+    def sync(self, count):
+        # 활성 아이템 수를 count로 맞춤 (남는 건 숨기고, 모자랄 때만 생성)
+        while len(self.active) > count:
+            item = self.active.pop()
+            self.canvas.itemconfig(item, state="hidden")
+            self.free.append(item)
+        while len(self.active) < count:
+            self.acquire()
+        return list(self.active)
+
+    def __len__(self):
+        return len(self.active) + len(self.free)
@@ -0,0 +1,98 @@
+import math
+
+# --------------------
+# 설정
+# --------------------
+CELL_SIZE = 128
+
+
+# --------------------
+# swept AABB
+# --------------------
+def _axis_times(b1, b2, r1, r2, d):
+    # 한 축에서 진입/이탈 시간 (움직이지 않으면 겹침 여부로 판정)
+    if d > 0:
+        return (r1 - b2) / d, (r2 - b1) / d
+    if d < 0:
+        return (r2 - b1) / d, (r1 - b2) / d
+    if b2 > r1 and b1 < r2:
+        return -math.inf, math.inf
+    return None
+
+def swept_aabb(box, dx, dy, rect):
+    """box가 (dx, dy)만큼 움직일 때 rect와 처음 닿는 (t, nx, ny). 안 닿으면 None.
+
+    시작부터 겹쳐 있는 경우도 None (끼인 상태에서 빠져나올 수 있게).
+    """
+    bx1, by1, bx2, by2 = box
+    rx1, ry1, rx2, ry2 = rect
+    tx = _axis_times(bx1, bx2, rx1, rx2, dx)
+    if tx is None:
+        return None
+    ty = _axis_times(by1, by2, ry1, ry2, dy)
+    if ty is None:
+        return None
+    entry = max(tx[0], ty[0])
+    exit_ = min(tx[1], ty[1])
+    if entry >= exit_ or entry < 0 or entry > 1:
+        return None
+    if tx[0] > ty[0]:
+        return entry, (-1 if dx > 0 else 1), 0
+    return entry, 0, (-1 if dy > 0 else 1)
+
+
+# --------------------
+# 공간 해시 (균일 격자)
+# --------------------
+class SpatialHash:
+    """벽 사각형을 격자 칸에 넣어두고 근처 칸만 검사."""
+
+    def __init__(self, rects=(), cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.rects = []
+        self.cells = {}
+        for r in rects:
+            self.insert(r)
+
+    def _cell_range(self, x1, y1, x2, y2):
+        cs = self.cell_size
+        return (int(x1 // cs), int(y1 // cs), int(x2 // cs), int(y2 // cs))
+
+    def insert(self, rect):
+        idx = len(self.rects)
+        self.rects.append(tuple(rect))
+        cx1, cy1, cx2, cy2 = self._cell_range(*rect)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                self.cells.setdefault((cx, cy), []).append(idx)
+
+    def query(self, x1, y1, x2, y2):
+        found = set()
+        cx1, cy1, cx2, cy2 = self._cell_range(x1, y1, x2, y2)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return [self.rects[i] for i in found]
+
+    def overlaps(self, x1, y1, x2, y2):
+        for (rx1, ry1, rx2, ry2) in self.query(x1, y1, x2, y2):
+            if x2 > rx1 and x1 < rx2 and y2 > ry1 and y1 < ry2:
+                return True
+        return False
+
+    def sweep(self, box, dx, dy):
+        # 이동 경로 전체를 덮는 범위의 칸만 후보로 보고 가장 먼저 닿는 벽을 찾음
+        bx1, by1, bx2, by2 = box
+        candidates = self.query(min(bx1, bx1 + dx), min(by1, by1 + dy),
+                                max(bx2, bx2 + dx), max(by2, by2 + dy))
+        best = None
+        for rect in candidates:
+            hit = swept_aabb(box, dx, dy, rect)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = (hit[0], hit[1], hit[2], rect)
+        return best
+
+    def __len__(self):
+        return len(self.rects)
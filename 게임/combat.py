@@ -0,0 +1,77 @@
+from entities import MONSTER
+
+# --------------------
+# 설정
+# --------------------
+# 공격 시트 9프레임 x 80ms 중 칼이 앞으로 나온 프레임에서만 판정 [시작, 끝)
+ATTACK_FRAME_MS = 80
+ATTACK_ACTIVE_FRAMES = (3, 7)
+ATTACK_REACH = 48      # 몸 앞쪽으로 닿는 거리 (px)
+ATTACK_DAMAGE = 1
+QUEST_KILLS = 3        # 퀘스트 완료에 필요한 처치 수
+
+
+# --------------------
+# 히트박스
+# --------------------
+def attack_frame(elapsed_ms, frame_ms=ATTACK_FRAME_MS):
+    # 공격 시작 후 경과 시간 -> 지금 보이는 공격 프레임 번호
+    return int(elapsed_ms // frame_ms)
+
+def attack_hitbox(x, y, size, facing, reach=ATTACK_REACH):
+    """공격 판정 사각형. facing은 마지막 수평키 ('a'면 왼쪽, 그 외 오른쪽 — 스프라이트 선택과 같음)."""
+    half = size / 2
+    if facing == 'a':
+        return (x - reach, y, x + half, y + size)
+    return (x + half, y, x + size + reach, y + size)
+
+
+# --------------------
+# 판정
+# --------------------
+class Combat:
+    """공격 한 번(swing)마다 몬스터를 최대 한 번씩만 때림.
+
+    resolve()는 틱마다 한 번 — 히트박스와 살아있는 몬스터 전체를 열 배열 위에서
+    한 번에 겹침 검사하고, 맞은 몬스터의 hp를 깎아 0 이하면 제거.
+    """
+
+    def __init__(self):
+        self.hit = set()       # 이번 공격에 이미 맞은 엔티티 번호
+        self.kills = 0         # 누적 처치 수
+        self.tests = 0         # 누적 겹침 검사한 몬스터 수 (벤치마크용)
+        self.monsters = []     # 살아있는 몬스터 번호 (저장소 version이 바뀔 때만 다시 구함)
+        self.version = None
+
+    def start_swing(self):
+        self.hit.clear()
+
+    def monsters_of(self, store):
+        # 살아있는 몬스터 번호 (추적에서도 같이 씀)
+        if store.version != self.version:
+            self.monsters = store.indices(MONSTER)
+            self.version = store.version
+        return self.monsters
+
+    def resolve(self, store, box, damage=ATTACK_DAMAGE):
+        """box와 겹친 몬스터에 피해. 이번에 쓰러뜨린 엔티티 번호 목록 반환."""
+        x1, y1, x2, y2 = box
+        xs, ys, ws, hs, hit = store.x, store.y, store.w, store.h, self.hit
+        monsters = self.monsters_of(store)
+        self.tests += len(monsters)
+        hits = [i for i in monsters
+                if xs[i] < x2 and xs[i] + ws[i] > x1 and ys[i] < y2 and ys[i] + hs[i] > y1
+                and i not in hit]
+        if not hits:
+            return []
+        hit.update(hits)
+        hp = store.hp
+        killed = []
+        for i in hits:
+            hp[i] -= damage
+            if hp[i] <= 0:
+                killed.append(i)
+        for i in killed:
+            store.kill(i)
+        self.kills += len(killed)
+        return killed
@@ -0,0 +1,297 @@
+"""소프트웨어 렌더러: 장면 전체를 PIL RGBA 프레임 하나에 합성.
+
+SoftwareCanvas는 main.py/RetainedCanvas/CanvasPool/BackgroundRenderer/MapTransition이
+쓰는 tk.Canvas 메서드를 그대로 흉내내서, 그리는 쪽 코드를 바꾸지 않고 백엔드만 고른다.
+
+    python main.py --renderer software
+
+바뀐 아이템의 이전/새 영역만 dirty로 모아서 그 부분만 다시 합성하고, 실제 캔버스에는
+이미지 아이템 하나만 둔다. 텍스트(힌트/오버레이)는 한글 글꼴 때문에 진짜 캔버스로 넘긴다.
+"""
+import itertools
+
+from PIL import Image, ImageDraw, ImageTk
+
+# --------------------
+# 설정
+# --------------------
+FIRST_ID = 1_000_000       # 진짜 캔버스 아이템 번호와 겹치지 않게
+FULL_REDRAW_RATIO = 0.5    # dirty 면적이 화면의 이 비율을 넘으면 전체 다시 그림
+CLEAR_COLOR = (0, 0, 0, 255)
+
+
+class SoftImage:
+    """PhotoImage 대신 쓰는 PIL 이미지 묶음 (sprite_cache.set_photo_factory용)."""
+    __slots__ = ("image",)
+
+    def __init__(self, image):
+        self.image = image if image.mode == "RGBA" else image.convert("RGBA")
+
+    def width(self):
+        return self.image.width
+
+    def height(self):
+        return self.image.height
+
+
+class _Item:
+    __slots__ = ("kind", "coords", "image", "fill", "outline", "hidden")
+
+    def __init__(self, kind, coords, image=None, fill="", outline=""):
+        self.kind = kind
+        self.coords = coords
+        self.image = image
+        self.fill = fill
+        self.outline = outline
+        self.hidden = False
+
+    def bbox(self):
+        if self.kind == "image":
+            if self.image is None:
+                return None
+            x, y = self.coords[0], self.coords[1]
+            return (int(x), int(y), int(x) + self.image.width(), int(y) + self.image.height())
+        x1, y1, x2, y2 = self.coords
+        return (int(min(x1, x2)), int(min(y1, y2)), int(max(x1, x2)) + 1, int(max(y1, y2)) + 1)
+
+    def drawn(self):
+        if self.hidden:
+            return False
+        if self.kind == "image":
+            return self.image is not None
+        return bool(self.fill or self.outline)
+
+
+def _intersect(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    if x1 >= x2 or y1 >= y2:
+        return None
+    return (x1, y1, x2, y2)
+
+def merge_rects(rects):
+    # 겹치는 dirty 사각형을 합침 (개수가 적어 단순 반복으로 충분)
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        while rects:
+            r = rects.pop()
+            for i, o in enumerate(out):
+                if r[0] <= o[2] and o[0] <= r[2] and r[1] <= o[3] and o[1] <= r[3]:
+                    out[i] = (min(r[0], o[0]), min(r[1], o[1]), max(r[2], o[2]), max(r[3], o[3]))
+                    merged = True
+                    break
+            else:
+                out.append(r)
+        rects = out
+    return rects
+
+
+# --------------------
+# 캔버스 흉내
+# --------------------
+class SoftwareCanvas:
+    """tk.Canvas와 같은 호출로 아이템을 받아 present()에서 한 장으로 합성.
+
+    canvas: 실제 tk.Canvas (없으면 headless — 벤치마크용). 모르는 속성은 그쪽으로 넘김.
+    """
+
+    def __init__(self, canvas=None, width=None, height=None):
+        self.canvas = canvas
+        self.items = {}
+        self.order = []             # 아래 -> 위
+        self.ids = itertools.count(FIRST_ID)
+        self.size = (width or 1, height or 1)
+        self.frame = Image.new("RGBA", self.size, CLEAR_COLOR)
+        self.dirty = [(0, 0) + self.size]
+        self.photo = None           # 실제 캔버스에 올린 PhotoImage
+        self.photo_item = None
+        self.scratch = {}           # 부분 갱신용 (w, h) -> PhotoImage
+        self.frames = 0
+        self.full_redraws = 0
+        self.pixels = 0             # 누적 다시 합성한 픽셀 수
+
+    def __getattr__(self, name):
+        # bind/pack/focus_set 등은 실제 캔버스로
+        if self.canvas is None:
+            raise AttributeError(name)
+        return getattr(self.canvas, name)
+
+    def _soft(self, item):
+        return item in self.items
+
+    def _mark(self, item):
+        box = item.bbox() if item.drawn() else None
+        if box is not None:
+            self.dirty.append(box)
+
+    # --------------------
+    # tk.Canvas 호출
+    # --------------------
+    def create_image(self, x, y, image=None, anchor="nw", **kw):
+        return self._add(_Item("image", (x, y), image=image))
+
+    def create_rectangle(self, x1, y1, x2, y2, fill="", outline="black", **kw):
+        if kw.get("width") == 0:
+            outline = ""
+        return self._add(_Item("rect", (x1, y1, x2, y2), fill=fill, outline=outline))
+
+    def create_text(self, *args, **kw):
+        return self.canvas.create_text(*args, **kw)
+
+    def _add(self, item):
+        item_id = next(self.ids)
+        self.items[item_id] = item
+        self.order.append(item_id)
+        self._mark(item)
+        return item_id
+
+    def coords(self, item_id, *xy):
+        if not self._soft(item_id):
+            return self.canvas.coords(item_id, *xy)
+        item = self.items[item_id]
+        if not xy:
+            return list(item.coords)
+        self._mark(item)
+        item.coords = tuple(xy)
+        self._mark(item)
+
+    def itemconfig(self, item_id, **opts):
+        if not self._soft(item_id):
+            return self.canvas.itemconfig(item_id, **opts)
+        item = self.items[item_id]
+        self._mark(item)
+        if "image" in opts:
+            item.image = opts["image"]
+        if "state" in opts:
+            item.hidden = opts["state"] == "hidden"
+        if "fill" in opts:
+            item.fill = opts["fill"]
+        if "outline" in opts:
+            item.outline = opts["outline"]
+        self._mark(item)
+
+    itemconfigure = itemconfig
+
+    def move(self, item_id, dx, dy):
+        if not self._soft(item_id):
+            return self.canvas.move(item_id, dx, dy)
+        item = self.items[item_id]
+        self._mark(item)
+        c = item.coords
+        item.coords = tuple(v + (dx if n % 2 == 0 else dy) for n, v in enumerate(c))
+        self._mark(item)
+
+    def delete(self, item_id):
+        if not self._soft(item_id):
+            return self.canvas.delete(item_id)
+        self._mark(self.items.pop(item_id))
+        self.order.remove(item_id)
+
+    def tag_raise(self, item_id, above=None):
+        if not self._soft(item_id):
+            return self.canvas.tag_raise(item_id, *(() if above is None else (above,)))
+        self.order.remove(item_id)
+        if above is None or above not in self.items:
+            self.order.append(item_id)
+        else:
+            self.order.insert(self.order.index(above) + 1, item_id)
+        self._mark(self.items[item_id])
+
+    def tag_lower(self, item_id, below=None):
+        if not self._soft(item_id):
+            return self.canvas.tag_lower(item_id, *(() if below is None else (below,)))
+        self.order.remove(item_id)
+        if below is None or below not in self.items:
+            self.order.insert(0, item_id)
+        else:
+            self.order.insert(self.order.index(below), item_id)
+        self._mark(self.items[item_id])
+
+    def winfo_width(self):
+        return self.canvas.winfo_width() if self.canvas is not None else self.size[0]
+
+    def winfo_height(self):
+        return self.canvas.winfo_height() if self.canvas is not None else self.size[1]
+
+    # --------------------
+    # 합성
+    # --------------------
+    def resize(self, w, h):
+        if (w, h) == self.size or w <= 0 or h <= 0:
+            return
+        self.size = (w, h)
+        self.frame = Image.new("RGBA", self.size, CLEAR_COLOR)
+        self.dirty = [(0, 0, w, h)]
+        self.photo = None
+        self.scratch.clear()
+
+    def compose(self):
+        """dirty 영역을 다시 합성하고 그 사각형 목록 반환 (없으면 빈 목록)."""
+        if not self.dirty:
+            return []
+        screen = (0, 0) + self.size
+        rects = [r for r in (_intersect(d, screen) for d in merge_rects(self.dirty)) if r]
+        self.dirty = []
+        area = sum((r[2] - r[0]) * (r[3] - r[1]) for r in rects)
+        if area > FULL_REDRAW_RATIO * self.size[0] * self.size[1]:
+            rects = [screen]
+            self.full_redraws += 1
+        frame = self.frame
+        draw = ImageDraw.Draw(frame)
+        visible = [(self.items[i], self.items[i].bbox()) for i in self.order if self.items[i].drawn()]
+        for rect in rects:
+            frame.paste(CLEAR_COLOR, rect)
+            self.pixels += (rect[2] - rect[0]) * (rect[3] - rect[1])
+            for item, box in visible:
+                part = _intersect(box, rect)
+                if part is None:
+                    continue
+                if item.kind == "image":
+                    ox, oy = box[0], box[1]
+                    frame.alpha_composite(item.image.image, (part[0], part[1]),
+                                          (part[0] - ox, part[1] - oy, part[2] - ox, part[3] - oy))
+                else:
+                    # 사각형은 잘린 영역 안에서만 다시 그림
+                    x1, y1, x2, y2 = box[0], box[1], box[2] - 1, box[3] - 1
+                    if item.fill:
+                        draw.rectangle(part[:2] + (part[2] - 1, part[3] - 1), fill=item.fill)
+                    if item.outline:
+                        for edge in ((x1, y1, x2, y1), (x1, y2, x2, y2), (x1, y1, x1, y2), (x2, y1, x2, y2)):
+                            seg = _intersect((edge[0], edge[1], edge[2] + 1, edge[3] + 1), part)
+                            if seg is not None:
+                                draw.rectangle((seg[0], seg[1], seg[2] - 1, seg[3] - 1), fill=item.outline)
+        self.frames += 1
+        return rects
+
+    def present(self):
+        # 렌더 프레임 끝에서 한 번 — 바뀐 부분만 실제 PhotoImage에 반영
+        if self.canvas is not None:
+            self.resize(self.canvas.winfo_width(), self.canvas.winfo_height())
+        rects = self.compose()
+        if not rects or self.canvas is None:
+            return rects
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(self.frame)
+            if self.photo_item is None:
+                self.photo_item = self.canvas.create_image(0, 0, image=self.photo, anchor="nw")
+                self.canvas.tag_lower(self.photo_item)
+            else:
+                self.canvas.itemconfig(self.photo_item, image=self.photo)
+            return rects
+        if rects == [(0, 0) + self.size]:
+            self.photo.paste(self.frame)
+            return rects
+        for x1, y1, x2, y2 in rects:
+            # 작은 PhotoImage에 붙인 뒤 Tk 안에서 큰 이미지로 복사 (전체 paste보다 쌈)
+            size = (x2 - x1, y2 - y1)
+            scratch = self.scratch.get(size)
+            if scratch is None:
+                scratch = self.scratch[size] = ImageTk.PhotoImage("RGBA", size)
+            scratch.paste(self.frame.crop((x1, y1, x2, y2)))
+            self.canvas.tk.call(str(self.photo), "copy", str(scratch), "-to", x1, y1)
+        if len(self.scratch) > 32:
+            self.scratch.clear()
+        return rects
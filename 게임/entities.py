@@ -0,0 +1,180 @@
+from array import array
+
+# --------------------
+# 종류
+# --------------------
+NPC = 0
+SHOP = 1
+MONSTER = 2
+
+KIND_NAMES = {NPC: "npc", SHOP: "shop", MONSTER: "monster"}
+# 맵 데이터의 목록 키 -> 종류
+MAP_KEYS = (("npc", NPC), ("shop", SHOP), ("monsters", MONSTER))
+
+DEFAULT_SIZE = {NPC: 32, SHOP: 64, MONSTER: 48}
+DEFAULT_HP = {MONSTER: 3}
+# 종류 -> (프레임 수, 프레임 ms): 몬스터.png는 32px 8프레임
+DEFAULT_ANIM = {MONSTER: (8, 120)}
+
+COLUMN_PX = 256        # 컬링 색인의 x 칸 폭 — col[i] = int(x[i] // COLUMN_PX)
+COLUMN_LOG_MAX = 4096  # 칸 이동 기록을 이만큼 넘으면 앞 절반을 버림 (못 따라온 색인은 다시 만듦)
+
+
+# --------------------
+# 엔티티 저장소 (열 단위 배열)
+# --------------------
+class EntityStore:
+    """엔티티를 객체 대신 종류별 값 배열로 보관.
+
+    i번째 엔티티 = (x[i], y[i], vx[i], ...). 죽은 칸은 free 목록으로 재사용.
+    update()는 벡터 연산이 아니라 평범한 파이썬 루프 하나 — 엔티티 객체/메서드 호출 없이
+    열 배열만 읽고 써서 가볍게 유지한다.
+    """
+
+    def __init__(self):
+        self.x = array("d")
+        self.y = array("d")
+        self.vx = array("d")
+        self.vy = array("d")
+        self.w = array("d")
+        self.h = array("d")
+        self.kind = array("b")
+        self.alive = array("b")
+        self.frame = array("H")
+        self.frame_count = array("H")
+        self.frame_ms = array("H")
+        self.anim_ms = array("d")
+        self.hp = array("h")
+        self.col = array("l")
+        self.free = []
+        self.version = 0    # 생성/제거가 있을 때마다 증가 (렌더러가 풀 크기 맞출 때 사용)
+        self.kind_version = {}   # 종류 -> 그 종류만의 생성/제거 횟수 (몬스터가 죽어도 NPC 색인은 그대로)
+        self.anim = dict(DEFAULT_ANIM)   # 종류 -> (프레임 수, 프레임 ms)
+        # update()에서 x 칸이 바뀐 엔티티 (번호, 이전 칸, 새 칸) — 컬링 색인이 그 번호만 옮김
+        self.col_log = []
+        self.col_log_base = 0   # col_log[0]의 누적 위치
+
+    def __len__(self):
+        return len(self.x) - len(self.free)
+
+    def clear(self):
+        for col in (self.x, self.y, self.vx, self.vy, self.w, self.h, self.kind, self.alive,
+                    self.frame, self.frame_count, self.frame_ms, self.anim_ms, self.hp, self.col):
+            del col[:]
+        self.free = []
+        for kind in self.kind_version:
+            self.kind_version[kind] += 1
+        self.col_log_base += len(self.col_log)
+        self.col_log = []
+        self.version += 1
+
+    def spawn(self, kind, x, y, w=None, h=None, vx=0.0, vy=0.0, frame_count=1, frame_ms=0, hp=None):
+        size = DEFAULT_SIZE.get(kind, 32)
+        hp = DEFAULT_HP.get(kind, 1) if hp is None else hp
+        values = (x, y, vx, vy, size if w is None else w, size if h is None else h)
+        if self.free:
+            i = self.free.pop()
+            self.x[i], self.y[i], self.vx[i], self.vy[i], self.w[i], self.h[i] = values
+            self.kind[i] = kind
+            self.alive[i] = 1
+            self.frame[i] = 0
+            self.frame_count[i] = frame_count
+            self.frame_ms[i] = frame_ms
+            self.anim_ms[i] = 0.0
+            self.hp[i] = hp
+            self.col[i] = int(x // COLUMN_PX)
+        else:
+            i = len(self.x)
+            for col, v in zip((self.x, self.y, self.vx, self.vy, self.w, self.h), values):
+                col.append(v)
+            self.kind.append(kind)
+            self.alive.append(1)
+            self.frame.append(0)
+            self.frame_count.append(frame_count)
+            self.frame_ms.append(frame_ms)
+            self.anim_ms.append(0.0)
+            self.hp.append(hp)
+            self.col.append(int(x // COLUMN_PX))
+        self.version += 1
+        self.kind_version[kind] = self.kind_version.get(kind, 0) + 1
+        return i
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = 0
+            self.vx[i] = self.vy[i] = 0.0
+            self.free.append(i)
+            self.version += 1
+            self.kind_version[self.kind[i]] += 1
+
+    def kinds_version(self, kinds):
+        # 주어진 종류들만의 생성/제거 상태 (색인이 다시 만들지 판단할 때)
+        return tuple(self.kind_version.get(k, 0) for k in kinds)
+
+    def load_from_map(self, data):
+        # 맵의 "npc"/"shop"/"monsters" 목록 전부 생성. 세 번째 값이 있으면 수평 속도 (순찰)
+        self.clear()
+        for key, kind in MAP_KEYS:
+            frame_count, frame_ms = self.anim.get(kind, (1, 0))
+            for entry in data.get(key, ()):
+                x, y = entry[0], entry[1]
+                vx = entry[2] if len(entry) > 2 else 0.0
+                self.spawn(kind, x, y, vx=vx, frame_count=frame_count, frame_ms=frame_ms)
+
+    def set_anim(self, kind, frame_count, frame_ms):
+        # 종류의 프레임 수/속도 변경 — 이미 있는 엔티티에도 바로 적용
+        self.anim[kind] = (frame_count, frame_ms)
+        for i in self.indices(kind):
+            self.frame_count[i] = frame_count
+            self.frame_ms[i] = frame_ms
+
+    def indices(self, kind=None):
+        alive, kinds = self.alive, self.kind
+        return [i for i in range(len(alive)) if alive[i] and (kind is None or kinds[i] == kind)]
+
+    # --------------------
+    # 틱마다 갱신
+    # --------------------
+    def update(self, dt_ms, bounds=None):
+        """모든 엔티티의 이동/애니메이션을 루프 한 번으로 진행. 움직인 개수 반환."""
+        x, y, vx, vy, w, h = self.x, self.y, self.vx, self.vy, self.w, self.h
+        alive, frame, count, fms, acc = self.alive, self.frame, self.frame_count, self.frame_ms, self.anim_ms
+        if bounds is not None:
+            bx1, by1, bx2, by2 = bounds
+        col, log = self.col, self.col_log
+        moved = 0
+        for i in range(len(x)):
+            if not alive[i]:
+                continue
+            dx, dy = vx[i], vy[i]
+            if dx or dy:
+                nx = x[i] + dx
+                ny = y[i] + dy
+                if bounds is not None:
+                    # 경계에 닿으면 반대로 튕김
+                    if nx < bx1 or nx + w[i] > bx2:
+                        vx[i] = -dx
+                        nx = x[i]
+                    if ny < by1 or ny + h[i] > by2:
+                        vy[i] = -dy
+                        ny = y[i]
+                x[i] = nx
+                y[i] = ny
+                moved += 1
+                c = int(nx // COLUMN_PX)
+                if c != col[i]:
+                    log.append((i, col[i], c))
+                    col[i] = c
+            if fms[i] and count[i] > 1:
+                a = acc[i] + dt_ms
+                if a >= fms[i]:
+                    steps = int(a // fms[i])
+                    frame[i] = (frame[i] + steps) % count[i]
+                    a -= steps * fms[i]
+                acc[i] = a
+        if len(log) > COLUMN_LOG_MAX:
+            drop = len(log) // 2
+            del log[:drop]
+            self.col_log_base += drop
+        return moved
+
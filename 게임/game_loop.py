@@ -0,0 +1,88 @@
+import time
+
+from game_state import TICK_MS
+
+# --------------------
+# 설정
+# --------------------
+RENDER_MS = 16          # 화면 갱신 주기 (시뮬레이션과 별개)
+MAX_CATCHUP_STEPS = 5   # 한 프레임에 따라잡을 최대 틱 수 (넘치면 버림)
+
+
+# --------------------
+# 고정 틱 루프
+# --------------------
+class FixedStepLoop:
+    """시뮬레이션은 항상 step_ms 단위로, 그리기는 render_ms마다 보간해서.
+
+    update()는 인자 없이 한 틱을 진행하고, render(alpha)는 직전 틱과 현재 틱
+    사이 비율(0~1)을 받아 그린다.
+    """
+
+    def __init__(self, root, update, render, step_ms=TICK_MS, render_ms=RENDER_MS,
+                 max_steps=MAX_CATCHUP_STEPS, clock=time.perf_counter):
+        self.root = root
+        self.update = update
+        self.render = render
+        self.step = step_ms / 1000.0
+        self.render_interval = render_ms / 1000.0
+        self.max_steps = max_steps
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last_time = None
+        self.next_frame = None
+        self.after_id = None
+        self.running = False
+        self.steps = 0
+        self.frames = 0
+        self.dropped = 0.0      # 너무 밀려서 버린 시간(초)
+
+    def start(self):
+        self.running = True
+        self.last_time = self.next_frame = self.clock()
+        self._frame()
+
+    def stop(self):
+        self.running = False
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+
+    def reset_clock(self):
+        # 오래 멈춘 뒤(맵 로드/다시 읽기 등) 한꺼번에 따라잡지 않도록
+        self.last_time = self.clock()
+        self.accumulator = 0.0
+
+    def advance(self, now):
+        # 경과 시간만큼 고정 틱을 돌리고 보간 비율을 돌려줌
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        limit = self.step * self.max_steps
+        if self.accumulator > limit:
+            self.dropped += self.accumulator - limit
+            self.accumulator = limit
+        while self.accumulator >= self.step:
+            self.update()
+            self.accumulator -= self.step
+            self.steps += 1
+        return self.accumulator / self.step
+
+    def _frame(self):
+        self.after_id = None
+        if not self.running:
+            return
+        now = self.clock()
+        alpha = self.advance(now)
+        self.render(alpha)
+        self.frames += 1
+
+        # 목표 시각 기준으로 다음 프레임 예약 (처리 시간만큼 밀리지 않게)
+        self.next_frame += self.render_interval
+        now = self.clock()
+        if self.next_frame < now:
+            self.next_frame = now
+        delay = int((self.next_frame - now) * 1000)
+        self.after_id = self.root.after(max(1, delay), self._frame)
@@ -0,0 +1,426 @@
+"""Tk 없이 돌아가는 게임 상태/물리 (main.py는 이걸 그리기만 함)."""
+
+from collision import SpatialHash
+from combat import Combat, attack_frame, attack_hitbox, ATTACK_ACTIVE_FRAMES, QUEST_KILLS
+from entities import EntityStore, NPC, SHOP, MONSTER, KIND_NAMES, DEFAULT_SIZE
+from interaction import InteractionIndex
+from navigation import Navigator
+from profiler import NULL_PROFILER
+
+# --------------------
+# 설정
+# --------------------
+BASE_WIDTH = 1024
+BASE_HEIGHT = 768
+BASE_PLAYER_SIZE = 64
+MOVE_SPEED = 6
+MAX_SPEED = 24
+ACCEL = 1
+TICK_MS = 50
+
+# 중력/점프 ("gravity"가 켜진 맵에서만 활성)
+GRAVITY = 1.6
+JUMP_VELOCITY = -20
+
+# 공격(Z) 지속 시간: 공격 시트 9프레임 x 80ms 에 맞춘 틱 수
+ATTACK_TICKS = 15
+
+NPC_RANGE = 50
+SHOP_RANGE = 60
+# 종류 -> (반경, 우선순위): 범위가 겹치면 NPC 먼저
+INTERACT_RULES = {NPC: (NPC_RANGE, 0), SHOP: (SHOP_RANGE, 1)}
+
+# 상점 판매 목록 (이름, 가격) — 화면의 번호 순서
+SHOP_ITEMS = [("체력포션", 30), ("마나포션", 20), ("강화석", 50)]
+
+# 몬스터 추적 (중력 없는 맵에서만 — 벽을 돌아 플레이어에게 옴)
+MONSTER_AGGRO = 320    # 플레이어와 x, y 차이가 둘 다 이 안이면 쫓아감
+MONSTER_SPEED = 3
+REPATH_TICKS = 10      # 경로 다시 요청하는 간격
+
+# --------------------
+# 맵 데이터
+# --------------------
+# "size": (폭, 높이)가 없으면 화면 한 장 (BASE_WIDTH x BASE_HEIGHT). 더 크면 카메라가 따라감
+MAPS = {
+    "village": {
+        "bg": "village_bg.png",
+        "npc": [(800, 400)],
+        "shop": [(200, 150)],
+        "walls": [
+            (0, 0, 1024, 32),
+            (0, 736, 1024, 768),
+            (0, 0, 32, 768),
+            (992, 0, 1024, 768)
+        ],
+        "player_start": (512, 384),
+        "left_map_trigger": (0, 0, 32, 768),
+        "right_map_trigger": (992, 0, 1024, 768),
+        "left_map": None,
+        "right_map": "forest",
+        # 중력 없는 맵 — 가까이 가면 경로를 찾아 쫓아옴 (숲 몬스터는 바닥을 왕복)
+        "monsters": [(120, 620), (880, 120)]
+    },
+    "forest": {
+        "bg": "forest_bg.png",
+        "npc": [(500, 300)],
+        "shop": [(100, 100)],
+        "walls": [
+            (0, 0, 1024, 32),
+            (0, 736, 1024, 768)
+        ],
+        "player_start": (100, 650),
+        "left_map_trigger": (0, 0, 32, 768),
+        "right_map_trigger": (992, 0, 1024, 768),
+        "left_map": "village",
+        # maps/long_forest.json 청크 타일맵 (main의 warm_maps가 MAPS에 올림)
+        "right_map": "long_forest",
+        "monsters": [(300, 688, 2), (650, 688, -2), (850, 688, 3)],
+        "gravity": True
+    }
+}
+
+
+def map_size(data):
+    return tuple(data.get("size", (BASE_WIDTH, BASE_HEIGHT)))
+
+
+# --------------------
+# 게임 상태
+# --------------------
+class GameState:
+    def __init__(self, maps=None, map_name="village"):
+        self.maps = MAPS if maps is None else maps
+        self.current_map = map_name
+        self.data = self.maps[map_name]
+
+        self.player_x = self.player_y = 0
+        self.prev_x = self.prev_y = 0    # 직전 틱 위치 (보간용)
+        self.player_size = BASE_PLAYER_SIZE
+        self.player_dir = "down"
+        self.player_frame = 0
+        self.last_horizontal = None   # 'a' 또는 'd' 중 마지막으로 눌린 수평키
+        self.current_speed = MOVE_SPEED
+        self.vertical_velocity = 0.0
+        self.on_ground = False
+        self.is_attacking = False
+        self.attack_ticks = 0
+        self.moved = False            # 이번 틱에 입력으로 움직였는지 (걷기 애니용)
+
+        self.keys_pressed = set()
+
+        self.walls = []
+        self.wall_index = SpatialHash()
+        self.world_w, self.world_h = BASE_WIDTH, BASE_HEIGHT
+        # 맵의 NPC/상점/몬스터 전부 (열 단위 배열)
+        self.entities = EntityStore()
+        self.entities_moved = 0   # 이번 틱에 움직인 엔티티 수 (렌더러가 다시 그릴지 판단)
+        self.interactions = InteractionIndex(INTERACT_RULES)
+        self.combat = Combat()
+        self.killed = []          # 이번 틱에 쓰러뜨린 몬스터 번호
+        self.nav = Navigator()
+        self.paths = {}           # 몬스터 번호 -> 남은 경유점 [(x, y)]
+
+        self.gold = 100
+        self.inventory = []
+        self.quest_active = False
+        self.quest_completed = False
+        self.quest_kills = 0      # 퀘스트를 받은 뒤 쓰러뜨린 몬스터 수
+
+        self.tick = 0
+        self.profiler = NULL_PROFILER   # main에서 실제 Profiler로 교체 가능
+
+    # --------------------
+    # map
+    # --------------------
+    def load_map(self, map_name, start_pos=None):
+        self.current_map = map_name
+        self.data = data = self.maps[map_name]
+        self.world_w, self.world_h = map_size(data)
+        self.walls = [tuple(w) for w in data["walls"]]
+        # 맵 로드 때 한 번만 격자 구성
+        self.wall_index = SpatialHash(self.walls)
+        if start_pos is None:
+            self.player_x, self.player_y = data["player_start"]
+        else:
+            self.player_x, self.player_y = start_pos
+        # 순간이동이므로 보간하지 않음
+        self.prev_x, self.prev_y = self.player_x, self.player_y
+        self.entities.load_from_map(data)
+        self.interactions.build(self.entities)
+        self.combat.start_swing()
+        # 벽이 같으면 통행 격자/경로 캐시는 그대로
+        self.nav.build(self.walls, self.world_w, self.world_h, DEFAULT_SIZE[MONSTER])
+        self.paths.clear()
+
+    def has_gravity(self):
+        return bool(self.data.get("gravity"))
+
+    # --------------------
+    # collision
+    # --------------------
+    def check_collision(self, new_x, new_y):
+        size = self.player_size
+        return self.wall_index.overlaps(new_x, new_y, new_x + size, new_y + size)
+
+    def move_player(self, dx, dy):
+        # 벽에 닿으면 접촉 지점에서 정확히 멈춤. 닿았으면 법선 (nx, ny) 반환
+        size = self.player_size
+        box = (self.player_x, self.player_y, self.player_x + size, self.player_y + size)
+        hit = self.wall_index.sweep(box, dx, dy)
+        if hit is None:
+            self.player_x += dx
+            self.player_y += dy
+            return None
+        t, nx, ny, (x1, y1, x2, y2) = hit
+        # 닿은 축은 벽 모서리에 딱 붙이고, 나머지 축은 t만큼 진행
+        if nx:
+            self.player_x = x1 - size if nx < 0 else x2
+            self.player_y += dy * t
+        else:
+            self.player_y = y1 - size if ny < 0 else y2
+            self.player_x += dx * t
+        return nx, ny
+
+    def _touching_floor(self):
+        return (self.check_collision(self.player_x, self.player_y + 1)
+                or self.player_y >= self.world_h - self.player_size - 1)
+
+    # --------------------
+    # step (move_loop 한 틱)
+    # --------------------
+    def step(self, inputs=None):
+        keys = self.keys_pressed if inputs is None else inputs
+        self.tick += 1
+        self.prev_x, self.prev_y = self.player_x, self.player_y
+        dx = dy = 0
+        # 착지 판정 먼저 갱신
+        self.on_ground = self._touching_floor()
+
+        if not self.is_attacking:
+            # gravity 맵에서는 'w'를 위로 이동에 사용하지 않음(점프는 Space)
+            if 'a' in keys:
+                dx = -self.current_speed; self.player_dir = 'left'
+            elif 'd' in keys:
+                dx = self.current_speed; self.player_dir = 'right'
+            elif not self.has_gravity():
+                if 'w' in keys:
+                    dy = -self.current_speed; self.player_dir = 'up'
+                elif 's' in keys:
+                    dy = self.current_speed; self.player_dir = 'down'
+
+        with self.profiler.phase("collision"):
+            if dx != 0 or dy != 0:
+                self.move_player(dx, dy)
+                self.current_speed = min(self.current_speed + ACCEL, MAX_SPEED)
+            else:
+                self.current_speed = MOVE_SPEED
+
+        with self.profiler.phase("navigation"):
+            if not self.has_gravity():
+                self._chase()
+
+        with self.profiler.phase("entities"):
+            self.entities_moved = self.entities.update(TICK_MS, (0, 0, self.world_w, self.world_h))
+
+        with self.profiler.phase("gravity"):
+            if self.has_gravity():
+                self._apply_gravity()
+            else:
+                self.vertical_velocity = 0
+                self.on_ground = True
+
+        # 맵 경계에서 벗어나지 않게 강제
+        self.player_x = max(0, min(self.player_x, self.world_w - self.player_size))
+        self.player_y = max(0, min(self.player_y, self.world_h - self.player_size))
+
+        self.moved = dx != 0 or dy != 0
+        if self.moved and not self.is_attacking:
+            self.player_frame += 1
+
+        with self.profiler.phase("combat"):
+            self.killed = self._resolve_attack()
+            if self.killed and self.quest_active:
+                self.quest_kills += len(self.killed)
+
+        if self.is_attacking:
+            self.attack_ticks -= 1
+            if self.attack_ticks <= 0:
+                # 공격 끝나면 대기 프레임 0으로 복귀
+                self.is_attacking = False
+                self.player_frame = 0
+
+    def _chase(self):
+        # 가까운 몬스터는 경로를 요청하고, 받은 경유점을 향해 속도를 맞춤
+        ents, nav, paths = self.entities, self.nav, self.paths
+        xs, ys, vx, vy, alive = ents.x, ents.y, ents.vx, ents.vy, ents.alive
+        if self.tick % REPATH_TICKS == 0:
+            px, py = self.player_x, self.player_y
+            for i in self.combat.monsters_of(ents):
+                if abs(xs[i] - px) < MONSTER_AGGRO and abs(ys[i] - py) < MONSTER_AGGRO:
+                    nav.request(i, (xs[i], ys[i]), (px, py))
+                elif i in paths:
+                    del paths[i]
+                    vx[i] = vy[i] = 0.0
+        nav.update()
+        for i, waypoints in nav.take_all():
+            paths[i] = waypoints
+        for i, waypoints in list(paths.items()):
+            if not alive[i] or not waypoints:
+                del paths[i]
+                vx[i] = vy[i] = 0.0
+                continue
+            tx, ty = waypoints[0]
+            dx, dy = tx - xs[i], ty - ys[i]
+            dist = (dx * dx + dy * dy) ** 0.5
+            if dist <= MONSTER_SPEED:
+                # 이번 틱에 경유점 도착 — 딱 맞춰 서고 다음 경유점으로
+                vx[i], vy[i] = dx, dy
+                waypoints.pop(0)
+            else:
+                vx[i] = dx / dist * MONSTER_SPEED
+                vy[i] = dy / dist * MONSTER_SPEED
+
+    def _apply_gravity(self):
+        self.vertical_velocity += GRAVITY
+        # 머리/바닥에 닿으면 접촉 지점에서 멈추고 수직속도 0
+        if self.move_player(0, self.vertical_velocity) is not None:
+            self.vertical_velocity = 0
+        self.player_y = max(0, min(self.player_y, self.world_h - self.player_size))
+        # 수직속도가 거의 0이면 착지로 간주
+        self.on_ground = abs(self.vertical_velocity) < 1e-3 and self._touching_floor()
+
+    def _resolve_attack(self):
+        # 공격 중 칼이 나온 프레임에서만 히트박스 검사
+        if not self.is_attacking:
+            return []
+        frame = attack_frame((ATTACK_TICKS - self.attack_ticks) * TICK_MS)
+        if not ATTACK_ACTIVE_FRAMES[0] <= frame < ATTACK_ACTIVE_FRAMES[1]:
+            return []
+        box = attack_hitbox(self.player_x, self.player_y, self.player_size, self.last_horizontal)
+        return self.combat.resolve(self.entities, box)
+
+    def interpolated(self, alpha):
+        # 직전 틱과 현재 틱 사이 위치 (렌더링 전용)
+        return (self.prev_x + (self.player_x - self.prev_x) * alpha,
+                self.prev_y + (self.player_y - self.prev_y) * alpha)
+
+    def start_attack(self, ticks=ATTACK_TICKS):
+        if self.is_attacking:
+            return False
+        self.is_attacking = True
+        self.attack_ticks = ticks
+        self.combat.start_swing()
+        return True
+
+    def start_jump(self):
+        if not self.has_gravity():
+            return False
+        # 이미 공중이면 무시
+        if not self.on_ground or abs(self.vertical_velocity) > 1e-3:
+            return False
+        self.vertical_velocity = JUMP_VELOCITY
+        self.on_ground = True
+        return True
+
+    # --------------------
+    # 주변/포탈 판정
+    # --------------------
+    def nearby_entity(self):
+        # 힌트와 E 키가 같이 쓰는 판정 -> (종류 이름, 엔티티 번호) 또는 None
+        i = self.interactions.nearest(self.player_x, self.player_y)
+        if i is None:
+            return None
+        return KIND_NAMES[self.entities.kind[i]], i
+
+    def nearby(self):
+        near = self.nearby_entity()
+        return near[0] if near else None
+
+    def portal(self):
+        # 트리거 안에 있고 이웃 맵이 있으면 (다음 맵, 시작 위치)
+        data = self.data
+        left_t = data.get('left_map_trigger')
+        right_t = data.get('right_map_trigger')
+        if left_t and self.player_x <= left_t[2]:
+            nxt = data.get('left_map')
+            if nxt in self.maps:
+                # 다음 맵의 오른쪽 끝에서 시작
+                next_w, next_h = map_size(self.maps[nxt])
+                return nxt, (next_w - BASE_PLAYER_SIZE - 10, self._entry_y(next_h))
+            return None
+        if right_t and self.player_x + self.player_size >= right_t[0]:
+            nxt = data.get('right_map')
+            if nxt in self.maps:
+                _, next_h = map_size(self.maps[nxt])
+                return nxt, (10, self._entry_y(next_h))
+        return None
+
+    def _entry_y(self, next_h):
+        return int(min(max(self.player_y, 0), next_h - BASE_PLAYER_SIZE))
+
+    # --------------------
+    # quest / shop
+    # --------------------
+    def interact(self):
+        # E 키: (대상, 제목, 메시지). 화면 표시는 호출한 쪽이 함
+        near = self.nearby()
+        if near == "npc":
+            if not self.quest_active and not self.quest_completed:
+                self.start_quest()
+                return "npc", "퀘스트", "괴물을 물리치고 돌아오세요!"
+            if self.quest_active and not self.quest_completed:
+                return "npc", "NPC", "아직 퀘스트를 완료하지 않았습니다."
+            if self.quest_completed:
+                self.claim_reward(50)
+                return "npc", "NPC", "퀘스트 완료! 보상 50G"
+        elif near == "shop":
+            return "shop", None, None
+        return None
+
+    def start_quest(self):
+        self.quest_active = True
+        self.quest_kills = 0
+
+    def quest_ready(self):
+        # 몬스터를 충분히 쓰러뜨렸으면 complete_quest() 할 차례
+        return self.quest_active and self.quest_kills >= QUEST_KILLS
+
+    def complete_quest(self):
+        if not self.quest_active:
+            return False
+        self.quest_active = False
+        self.quest_completed = True
+        return True
+
+    def claim_reward(self, amount=50):
+        self.gold += amount
+        self.quest_completed = False
+
+    def buy(self, item, price):
+        if self.gold < price:
+            return False
+        self.gold -= price
+        self.inventory.append(item)
+        return True
+
+    # --------------------
+    # snapshot (리플레이 검증/저장용)
+    # --------------------
+    SNAPSHOT_FIELDS = ("current_map", "player_x", "player_y", "player_dir", "player_frame",
+                       "last_horizontal", "current_speed", "vertical_velocity", "on_ground",
+                       "is_attacking", "attack_ticks", "gold", "inventory", "quest_active",
+                       "quest_completed", "quest_kills", "tick")
+
+    def snapshot(self):
+        snap = {name: getattr(self, name) for name in self.SNAPSHOT_FIELDS}
+        snap["inventory"] = list(self.inventory)
+        return snap
+
+    def restore(self, snap):
+        self.load_map(snap["current_map"], (snap["player_x"], snap["player_y"]))
+        for name in self.SNAPSHOT_FIELDS:
+            if name in snap:
+                setattr(self, name, snap[name])
+        self.inventory = list(snap.get("inventory", []))
+        self.keys_pressed.clear()
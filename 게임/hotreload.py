@@ -0,0 +1,80 @@
+import ast
+import os
+
+# --------------------
+# 설정
+# --------------------
+POLL_MS = 500   # 파일 수정 시각 확인 주기
+
+
+# --------------------
+# 파일 감시 (mtime 폴링)
+# --------------------
+class FileWatcher:
+    """등록한 파일의 (mtime, 크기)가 바뀌면 콜백(path) 호출.
+
+    poll()은 Tk 스레드에서 주기적으로 부름. 없는 파일은 생길 때까지 기다리고,
+    콜백이 예외를 내면 알리기만 하고 다음 변경을 계속 기다린다.
+    """
+
+    def __init__(self):
+        self.callbacks = {}    # 경로 -> 콜백
+        self.stamps = {}       # 경로 -> 마지막으로 본 (mtime, 크기) 또는 None
+        self.reloads = 0
+
+    def watch(self, path, callback):
+        self.callbacks[path] = callback
+        self.stamps[path] = self._stamp(path)
+
+    def unwatch(self, path):
+        self.callbacks.pop(path, None)
+        self.stamps.pop(path, None)
+
+    def _stamp(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime, st.st_size
+
+    def poll(self):
+        """바뀐 파일 경로 목록 반환."""
+        changed = []
+        for path, callback in list(self.callbacks.items()):
+            stamp = self._stamp(path)
+            if stamp == self.stamps.get(path):
+                continue
+            self.stamps[path] = stamp
+            if stamp is None:
+                continue    # 지워짐 (저장 중 잠깐 없어지는 편집기도 있음)
+            changed.append(path)
+            try:
+                callback(path)
+                self.reloads += 1
+            except Exception as e:
+                print(f"다시 읽기 실패: {path}: {e}")
+        return changed
+
+    def __len__(self):
+        return len(self.callbacks)
+
+
+# --------------------
+# 맵 데이터
+# --------------------
+def read_literal(path, name="MAPS"):
+    """파이썬 파일에서 `name = {...}` 리터럴만 읽음 (모듈을 다시 import하지 않음).
+
+    문법 오류거나 리터럴이 아니면 예외 — 편집 중인 파일은 다음 저장을 기다리면 됨.
+    """
+    with open(path, encoding="utf-8-sig") as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == name for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"{path}에 {name} 정의가 없음")
+
+def changed_keys(old, new):
+    # 새로 생겼거나 내용이 바뀐 항목 이름
+    return [key for key, value in new.items() if old.get(key) != value]
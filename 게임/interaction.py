@@ -0,0 +1,60 @@
+# --------------------
+# 상호작용 색인 (E 키 / 힌트용)
+# --------------------
+class InteractionIndex:
+    """말 걸 수 있는 엔티티를 격자 칸에 나눠 담고 주변 9칸만 봄.
+
+    rules: 종류 -> (반경, 우선순위). 우선순위 숫자가 작은 종류가 먼저이고,
+    같은 우선순위면 더 가까운 쪽. 칸 크기 = 가장 큰 반경이라 이웃 칸만 보면 충분.
+    거리 판정은 기존처럼 좌상단 기준 |dx| < 반경 and |dy| < 반경.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.cell_size = max(radius for radius, _ in rules.values())
+        self.cells = {}
+        self.store = None
+        self.version = None     # 만들 때의 store.kinds_version(rules) — 몬스터 생성/제거는 무시
+        self.builds = 0
+
+    def build(self, store):
+        # 맵 로드/엔티티 생성·제거 후 한 번
+        size = self.cell_size
+        cells = {}
+        for i in store.indices():
+            if store.kind[i] not in self.rules:
+                continue
+            key = (int(store.x[i] // size), int(store.y[i] // size))
+            cells.setdefault(key, []).append(i)
+        self.cells = cells
+        self.store = store
+        self.version = store.kinds_version(self.rules)
+        self.builds += 1
+
+    def nearest(self, px, py):
+        """범위 안의 최우선 엔티티 번호, 없으면 None."""
+        store = self.store
+        if store is None:
+            return None
+        if store.kinds_version(self.rules) != self.version:
+            self.build(store)
+        size = self.cell_size
+        cx = int(px // size)
+        cy = int(py // size)
+        xs, ys, kinds, rules, cells = store.x, store.y, store.kind, self.rules, self.cells
+        best = None
+        best_key = None
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for i in cells.get((gx, gy), ()):
+                    radius, priority = rules[kinds[i]]
+                    dx = abs(px - xs[i])
+                    dy = abs(py - ys[i])
+                    if dx < radius and dy < radius:
+                        key = (priority, dx + dy)
+                        if best_key is None or key < best_key:
+                            best, best_key = i, key
+        return best
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.cells.values())
@@ -1,67 +1,75 @@
-﻿import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
-import os
+﻿import time
+STARTUP_T0 = time.perf_counter()
+
+import math
+import sys
+import tkinter as tk
+from tkinter import ttk
+
+from game_loop import FixedStepLoop
+from transition import MapTransition, TRANSITION_MS
+from overlay import RetainedCanvas
+from animation import Timeline
+from canvas_pool import CanvasPool
+from camera import Camera, CULL_MARGIN, EntityIndex, visible_walls, visible_entities
+from ui import GameUI
+from profiler import Profiler
+from replay import Recorder
+import tilemap
+import hotreload
+import savegame
+import game_state
+from game_state import GameState, MAPS, BASE_WIDTH, BASE_HEIGHT, BASE_PLAYER_SIZE, SHOP_ITEMS
+from entities import NPC, SHOP, MONSTER, DEFAULT_SIZE, DEFAULT_ANIM
 
 # --------------------
-# 설정
+# 전역 상태
 # --------------------
-BASE_WIDTH = 1024
-BASE_HEIGHT = 768
-BASE_PLAYER_SIZE = 64
-MOVE_SPEED = 6
-MAX_SPEED = 24
-ACCEL = 1
-TICK_MS = 50
+root = None       # main()에서 만듦 — import만 해서는 창이 뜨지 않음 (bench.py/tests)
 
-# --------------------
-# 맵 데이터
-# --------------------
-MAPS = {
-    "village": {
-        "bg": "village_bg.png",
-        "npc": [(800, 400)],
-        "shop": [(200, 150)],
-        "walls": [
-            (0, 0, 1024, 32),
-            (0, 736, 1024, 768),
-            (0, 0, 32, 768),
-            (992, 0, 1024, 768)
-        ],
-        "player_start": (512, 384),
-        "left_map_trigger": (0, 0, 32, 768),
-        "right_map_trigger": (992, 0, 1024, 768),
-        "left_map": None,
-        "right_map": "forest"
-    },
-    "forest": {
-        "bg": "forest_bg.png",
-        "npc": [(500, 300)],
-        "shop": [(100, 100)],
-        "walls": [
-            (0, 0, 1024, 32),
-            (0, 736, 1024, 768)
-        ],
-        "player_start": (100, 650),
-        "left_map_trigger": (0, 0, 32, 768),
-        "right_map_trigger": (992, 0, 1024, 768),
-        "left_map": "village",
-        "right_map": None
-    }
-}
+# PIL을 쓰는 모듈은 시작 화면이 뜬 뒤 warm_imports()에서 불러옴
+sprite_cache = None
+atlas = None
+ImageTk = None
+BackgroundRenderer = None
+Prefetcher = None
 
-current_map = "village"
+canvas = None
+retained = None   # 바뀐 coords/이미지/힌트만 Tcl로 보내는 층
+timeline = None   # 상점/공격 등 스프라이트 애니메이션 전부를 도는 시계 하나
+ui = None         # 대화창/상점/가방 (캔버스 위 패널, 게임은 멈추지 않음)
 
-# --------------------
-# 전역 상태
-# --------------------
-root = tk.Tk()
-root.title("픽셀 RPG")
-root.geometry(f"{BASE_WIDTH}x{BASE_HEIGHT}")
+# 게임 데이터(위치/입력/골드/퀘스트)는 전부 state가 가짐 — 여기는 그리기 전용
+state = GameState(MAPS)
 
-canvas = None
+# F3: 단계별 시간 오버레이 켜기/끄기, F4: trace.json 저장 (chrome://tracing / Perfetto)
+profiler = Profiler()
+state.profiler = profiler
+PROFILER_OVERLAY_MS = 500
+profiler_overlay_at = 0.0
+TRACE_PATH = "trace.json"
+
+# python main.py --record session.rec  → 종료 시 입력 녹화 저장 (replay.py로 재생)
+RECORD_PATH = sys.argv[sys.argv.index("--record") + 1] if "--record" in sys.argv[:-1] else None
+recorder = None
+
+# python main.py --watch  → 맵(game_state.py의 MAPS, maps/*.json)이나 스프라이트 PNG를
+# 저장하면 재시작 없이 그 부분만 다시 읽음 (위치/골드/인벤토리/퀘스트 유지)
+WATCH = "--watch" in sys.argv
+watcher = None
+
+# python main.py --renderer software  → 캔버스 아이템 대신 PIL 프레임 한 장에 합성해서
+# PhotoImage 하나만 갱신 (compositor.py). 기본은 canvas
+RENDERER = sys.argv[sys.argv.index("--renderer") + 1] if "--renderer" in sys.argv[:-1] else "canvas"
+SOFTWARE = RENDERER == "software"
+
+# 진행 상태 자동 저장 (AUTOSAVE_MS마다 + 맵 이동 때 + 종료 때). 다음 실행은 이어서 시작
+saver = None
 
 map_transitioning = False
+transition = None
+TRANSITION_EASING = "ease_in_out"
+game_loop = None
 
 SPRITES = {"down": [], "up": [], "left": [], "right": []}
 SPRITE_PATHS = {
@@ -76,93 +84,72 @@ SHOP_SPRITE_PATH = "shop_spritesheet.png"
 SHOP_SPRITES = []
 
 bg_image = None
-BG_PHOTO = None
-bg_id = None
+bg_renderer = None
+prefetcher = None
 
-BASE_WALLS = []
 walls = []
+wall_rects = []    # walls[i]가 지금 그리는 벽 (화면 근처 것만)
+wall_pool = None   # 벽 사각형 재사용 풀 (맵이 바뀌어도 새로 만들지 않음)
+
+# 맵이 화면보다 크면 플레이어를 따라감. 화면(+CULL_MARGIN) 밖 벽/엔티티는 아이템을 쓰지 않음
+camera = Camera()
+# 타일맵(maps/*.json) 맵: 배경 PNG 대신 플레이어 주변 청크 그림만 스트리밍
+streamer = None
+chunk_pool = None
+chunk_items = []
+
+cull_state = None   # 마지막 컬링 때 (엔티티 버전, 카메라 x, y, 엔티티가 움직인 틱)
+# 종류별 x 칸 색인 — 컬링이 맵 전체 엔티티를 훑지 않게
+entity_index = {kind: EntityIndex(kind) for kind in (NPC, SHOP, MONSTER)}
 
-player_x = player_y = 0
-player_dir = "down"
-player_frame = 0
 player_sprite = None
 PLAYER_DISPLAY_SIZE = BASE_PLAYER_SIZE
 
-npc = None
-npc_x = npc_y = 0
+# NPC/상점은 맵마다 여러 개 — 엔티티 수만큼 풀에서 꺼내 씀
+npc_pool = None
+shop_pool = None
+monster_pool = None
+npc_items = []    # [(엔티티 번호, 캔버스 아이템)]
+shop_items = []
+monster_items = []
 
-shop = None
-shop_x = shop_y = 0
+# 몬스터 (프레임 진행은 state.entities가 함 — 여기선 frame 값의 이미지만 붙임)
+MONSTER_SPRITE_PATH = "몬스터.png"
+MONSTER_SPRITES = []
 
-# 상점 애니메이션 상태
-shop_frame = 0
+# 상점 애니메이션 (상점 아이템 -> timeline 애니메이션)
+# 프레임 속도는 아틀라스(sprites.json의 frame_ms)를 따르고, 팩이 없을 때만 아래 기본값
 SHOP_ANIM_DELAY = 180  # 밀리초, 프레임 전환 속도
-shop_anim_id = None
+shop_anims = {}
 
 # 공격(attack) 애니메이션 상태 (Z 키)
 ATTACK_SPRITE_PATH = "player_attack.png"
 ATTACK_SPRITES = []
-attack_frame = 0
 ATTACK_ANIM_DELAY = 80
-is_attacking = False
-attack_anim_id = None
+attack_anim = None
 
-# 뒤집어 때리기
+# 뒤로 때리기 spritesheet 파일명
 BACK_ATTACK_SPRITE_PATH = "player_back_attack.png"
 BACK_ATTACK_SPRITES = []
 
-# 현재 공격 재생 리스트
-current_attack_sprites = None
-
-# 원래 플레이어 상태 저장용
-saved_player_dir = None
-saved_player_frame = 0
-
-# 전역: 뒤로 공격 스프라이트 및 상태
-BACK_ATTACK_SPRITE_PATH = "player_back_attack.png"   # 뒤로 때리기 spritesheet 파일명으로 변경
-BACK_ATTACK_SPRITES = []
-
-last_horizontal = None           # 'a' 또는 'd' 중 마지막으로 눌린 수평키
-current_attack_sprites = None    # 현재 재생 중인 공격 프레임 목록
-
-# 중력/점프 변수 (forest에서만 활성)
-GRAVITY = 1.6
-JUMP_VELOCITY = -20
-vertical_velocity = 0.0
-
-# 착지 플래그 추가
-on_ground = False
-
-keys_pressed = set()
-current_speed = MOVE_SPEED
-
-gold = 100
-inventory = []
-quest_active = False
-quest_completed = False
-
 # --------------------
 # helpers
 # --------------------
 def safe_open_pil(path):
-    if path and os.path.exists(path):
-        try:
-            return Image.open(path).convert("RGBA")
-        except:
-            pass
-    return Image.new("RGBA", (BASE_PLAYER_SIZE, BASE_PLAYER_SIZE), (200, 200, 200, 255))
+    return sprite_cache.safe_open_pil(path, BASE_PLAYER_SIZE)
 
 def load_spritesheet_frames(path, size):
-    img = safe_open_pil(path)
-    frame_w = 32
-    num = max(1, img.width // frame_w)
-    frames = []
-    for i in range(num):
-        left = i * frame_w
-        frame = img.crop((left, 0, left + frame_w, img.height))
-        frame = frame.resize((size, size), Image.NEAREST)
-        frames.append(ImageTk.PhotoImage(frame))
-    return frames
+    # (경로, 수정시각, 크기) 키로 캐시됨 — 이미 본 크기면 디스크/리샘플 없음
+    return sprite_cache.get_frames(path, size)
+
+def to_screen(x, y, w_s, h_s):
+    # 월드 좌표 -> 캔버스 좌표
+    return round((x - camera.x) * w_s), round((y - camera.y) * h_s)
+
+def follow_camera(x, y):
+    # 플레이어 중심을 화면 가운데로 (맵 경계 안에서). 움직였으면 True
+    half = state.player_size / 2
+    return camera.follow(x + half, y + half, state.world_w, state.world_h)
 
 def get_scales():
     if canvas is None:
@@ -177,8 +164,9 @@ def get_scales():
 # --------------------
 # rescale elements
 # --------------------
-def rescale_elements():
-    global PLAYER_DISPLAY_SIZE, SPRITES, BG_PHOTO
+@profiler.timed("rescale")
+def rescale_elements(immediate=False):
+    global PLAYER_DISPLAY_SIZE, SPRITES
     if canvas is None:
         return
     w_scale, h_scale, uniform = get_scales()
@@ -188,540 +176,658 @@ def rescale_elements():
     for d, p in SPRITE_PATHS.items():
         SPRITES[d] = load_spritesheet_frames(p, PLAYER_DISPLAY_SIZE)
 
-    canvas.coords(player_sprite, player_x * w_scale, player_y * h_scale)
-    frames = SPRITES.get(player_dir) or SPRITES["down"]
-    if frames:
-        canvas.itemconfig(player_sprite, image=frames[player_frame % len(frames)])
+    retained.coords(player_sprite, *to_screen(state.player_x, state.player_y, w_scale, h_scale))
+    frames = SPRITES.get(state.player_dir) or SPRITES["down"]
+    if frames and not state.is_attacking:
+        retained.config(player_sprite, image=frames[state.player_frame % len(frames)])
     canvas.tag_raise(player_sprite)
 
-    if npc is not None:
-        canvas.coords(npc, npc_x * w_scale, npc_y * h_scale, (npc_x + 32) * w_scale, (npc_y + 32) * h_scale)
-        canvas.tag_raise(npc)
-
     # --- 변경: 상점 스프라이트를 캐릭터 크기로 다시 로드 및 적용 ---
     globals()["SHOP_SPRITES"] = load_spritesheet_frames(SHOP_SPRITE_PATH, PLAYER_DISPLAY_SIZE)
     # 공격 프레임도 동일 크기로 재생성
     globals()["ATTACK_SPRITES"] = load_spritesheet_frames(ATTACK_SPRITE_PATH, PLAYER_DISPLAY_SIZE)
     globals()["BACK_ATTACK_SPRITES"] = load_spritesheet_frames(BACK_ATTACK_SPRITE_PATH, PLAYER_DISPLAY_SIZE)
-    if shop is not None:
-        canvas.coords(shop, shop_x * w_scale, shop_y * h_scale)
-        if SHOP_SPRITES:
-            canvas.itemconfig(shop, image=SHOP_SPRITES[0])
-        canvas.tag_raise(shop)
-
-    for i, (mx1, my1, mx2, my2) in enumerate(BASE_WALLS):
-        if i < len(walls):
-            canvas.coords(walls[i], mx1 * w_scale, my1 * h_scale, mx2 * w_scale, my2 * h_scale)
-
-    global bg_image
-    if bg_image:
-        w, h = canvas.winfo_width(), canvas.winfo_height()
-        if w > 0 and h > 0:
-            bg_resized = bg_image.resize((w, h), Image.NEAREST)
-            bg_photo_new = ImageTk.PhotoImage(bg_resized)
-            if globals().get("bg_id") is None:
-                globals()["bg_id"] = canvas.create_image(0, 0, image=bg_photo_new, anchor="nw")
-            else:
-                canvas.itemconfig(globals()["bg_id"], image=bg_photo_new)
-            globals()["BG_PHOTO"] = bg_photo_new
+    globals()["MONSTER_SPRITES"] = load_spritesheet_frames(MONSTER_SPRITE_PATH, monster_display_size(uniform))
+    cull(force=True)
+    draw_world(w_scale, h_scale)
+    for anim in shop_anims.values():
+        timeline.set_frames(anim, SHOP_SPRITES)
+    for _, item in npc_items + shop_items + monster_items:
+        canvas.tag_raise(item)
+
+    # 배경: 드래그 중 연속 Configure는 모아서 마지막 크기만 리샘플
+    if bg_renderer is not None and bg_image:
+        bg_renderer.request_size(canvas.winfo_width(), canvas.winfo_height(), immediate=immediate)
+        bg_renderer.scroll(camera.x * w_scale, camera.y * h_scale)
+
+def cull(force=False):
+    # 화면(+여유)과 겹치는 벽/엔티티만 풀에서 꺼내 씀.
+    # 카메라가 여유의 절반 이상 움직였거나 엔티티가 생기고/없어지고/움직인 틱에만 다시 계산
+    global cull_state
+    ents = state.entities
+    moved_tick = state.tick if state.entities_moved else None
+    if not force and cull_state is not None:
+        version, cx, cy, tick = cull_state
+        if (version == ents.version and tick == moved_tick
+                and abs(camera.x - cx) < CULL_MARGIN / 2 and abs(camera.y - cy) < CULL_MARGIN / 2):
+            return False
+    cull_state = (ents.version, camera.x, camera.y, moved_tick)
+    wall_rects[:] = visible_walls(state.wall_index, camera)
+    walls[:] = wall_pool.sync(len(wall_rects))
+    for kind, pool, items in ((NPC, npc_pool, npc_items), (SHOP, shop_pool, shop_items),
+                              (MONSTER, monster_pool, monster_items)):
+        idx = visible_entities(entity_index[kind], ents, camera)
+        items[:] = zip(idx, pool.sync(len(idx)))
+    # 풀에서 숨겨진 상점 아이템의 애니메이션은 큐에서 빼 두었다가 다시 보이면 이어서 재생
+    live = {item for _, item in shop_items}
+    for item, anim in shop_anims.items():
+        timeline.set_visible(anim, item in live)
+    for item in live:
+        if item not in shop_anims:
+            shop_anims[item] = timeline.play(item, SHOP_SPRITES, sprite_cache.frame_ms(SHOP_SPRITE_PATH, SHOP_ANIM_DELAY),
+                                             loop=True)
+    return True
+
+def new_chunk_item(c):
+    # 청크 그림은 항상 맨 아래
+    item = c.create_image(0, 0, anchor="nw")
+    c.tag_lower(item)
+    return item
+
+def stream_chunks(w_s, h_s):
+    # 화면에 걸친 청크 중 그림이 준비된 것만 풀 아이템으로 배치
+    if streamer is None:
+        if chunk_items:
+            chunk_items[:] = chunk_pool.sync(0)
+        return
+    cp = streamer.tmap.chunk_px
+    size = (math.ceil(cp * w_s), math.ceil(cp * h_s))
+    visible = streamer.update(camera.view_rect(0), size)
+    streamer.poll()
+    ready = []
+    for key in visible:
+        # 새 크기 그림이 오기 전엔 이전 크기라도 보여줌
+        photo = streamer.get(key, size) or streamer.get(key)
+        if photo is not None:
+            ready.append((key, photo))
+    chunk_items[:] = chunk_pool.sync(len(ready))
+    for item, ((cx, cy), photo) in zip(chunk_items, ready):
+        retained.coords(item, *to_screen(cx * cp, cy * cp, w_s, h_s))
+        retained.config(item, image=photo)
+
+def draw_world(w_scale, h_scale):
+    # 컬링된 벽/엔티티 배치. 위치가 같으면 retained가 Tcl 호출을 건너뜀
+    for rect, (x1, y1, x2, y2) in zip(walls, wall_rects):
+        retained.coords(rect, *to_screen(x1, y1, w_scale, h_scale), *to_screen(x2, y2, w_scale, h_scale))
+    ents = state.entities
+    xs, ys, ws, hs = ents.x, ents.y, ents.w, ents.h
+    for i, item in npc_items:
+        x, y = xs[i], ys[i]
+        retained.coords(item, *to_screen(x, y, w_scale, h_scale),
+                        *to_screen(x + ws[i], y + hs[i], w_scale, h_scale))
+    for i, item in shop_items:
+        retained.coords(item, *to_screen(xs[i], ys[i], w_scale, h_scale))
+    for i, item in monster_items:
+        retained.coords(item, *to_screen(xs[i], ys[i], w_scale, h_scale))
+
+def monster_display_size(uniform):
+    return max(4, int(DEFAULT_SIZE[MONSTER] * uniform))
+
+def draw_monster_frames():
+    # 프레임이 그대로면 retained가 건너뜀
+    if not MONSTER_SPRITES:
+        return
+    frame, n = state.entities.frame, len(MONSTER_SPRITES)
+    for i, item in monster_items:
+        retained.config(item, image=MONSTER_SPRITES[frame[i] % n])
+
+def schedule_prefetch(*_):
+    # 이웃 맵 배경/스프라이트를 지금 창 크기로 미리 준비
+    if prefetcher is None or canvas is None:
+        return
+    sheets = list(SPRITE_PATHS.values()) + [SHOP_SPRITE_PATH, ATTACK_SPRITE_PATH, BACK_ATTACK_SPRITE_PATH]
+    prefetcher.schedule(state.current_map, (canvas.winfo_width(), canvas.winfo_height()),
+                        sheets, PLAYER_DISPLAY_SIZE)
+
+def on_configure(evt):
+    # 전환 중엔 슬라이드 위치를 깨뜨리지 않도록 건너뜀 (끝날 때 다시 맞춤)
+    if transition is None:
+        rescale_elements()
 
 # --------------------
 # load map
 # --------------------
+@profiler.timed("load_map")
 def load_map(map_name, start_pos=None):
-    global current_map, BASE_WALLS, bg_image, player_x, player_y, player_sprite
-    global npc, npc_x, npc_y, shop, shop_x, shop_y, walls
+    global player_sprite, streamer
 
-    current_map = map_name
+    state.load_map(map_name, start_pos)
+    record_event(f"map:{map_name}:{state.player_x}:{state.player_y}")
     data = MAPS[map_name]
-    BASE_WALLS = list(data["walls"])
 
     bg_path = data.get("bg")
-    bg_image_local = safe_open_pil(bg_path) if bg_path else None
+    bg_image_local = sprite_cache.get_sheet(bg_path) if bg_path else None
     globals()["bg_image"] = bg_image_local
+    if bg_renderer is not None:
+        bg_renderer.set_source(bg_path, bg_image_local)
 
-    if start_pos is None:
-        player_x, player_y = data["player_start"]
-    else:
-        player_x, player_y = start_pos
+    tmap = data.get("tilemap")
+    if streamer is not None and streamer.tmap is not tmap:
+        streamer.shutdown()
+        streamer = None
+    if tmap is not None and streamer is None:
+        streamer = tilemap.ChunkStreamer(tmap, sprite_cache.to_photo)
 
-    _, _, uniform = get_scales()
+    follow_camera(state.player_x, state.player_y)
+    w_scale, h_scale, uniform = get_scales()
     display_size = max(4, int(BASE_PLAYER_SIZE * uniform))
     for d, p in SPRITE_PATHS.items():
         SPRITES[d] = load_spritesheet_frames(p, display_size)
 
     if player_sprite is None:
-        globals()["player_sprite"] = canvas.create_image(player_x * (canvas.winfo_width() / BASE_WIDTH),
-                                                         player_y * (canvas.winfo_height() / BASE_HEIGHT),
-                                                         image=SPRITES[player_dir][0], anchor="nw")
+        player_sprite = canvas.create_image(*to_screen(state.player_x, state.player_y, w_scale, h_scale),
+                                            image=SPRITES[state.player_dir][0], anchor="nw")
     else:
-        canvas.coords(player_sprite, player_x * (canvas.winfo_width() / BASE_WIDTH),
-                      player_y * (canvas.winfo_height() / BASE_HEIGHT))
-        canvas.itemconfig(player_sprite, image=SPRITES[player_dir][0])
+        retained.coords(player_sprite, *to_screen(state.player_x, state.player_y, w_scale, h_scale))
+        retained.config(player_sprite, image=SPRITES[state.player_dir][0])
     canvas.tag_raise(player_sprite)
 
-    npc_x_val, npc_y_val = data["npc"][0]
-    globals()["npc_x"], globals()["npc_y"] = npc_x_val, npc_y_val
-    if npc is None:
-        globals()["npc"] = canvas.create_rectangle(npc_x_val, npc_y_val, npc_x_val + 32, npc_y_val + 32,
-                                                  fill="orange", outline="black")
-    else:
-        canvas.coords(npc, npc_x_val, npc_y_val, npc_x_val + 32, npc_y_val + 32)
-
-    shop_x_val, shop_y_val = data["shop"][0]
-    globals()["shop_x"], globals()["shop_y"] = shop_x_val, shop_y_val
-
-    # 상점: 이전에 사각형으로 만들던 부분을 스프라이트 이미지로 변경
-    # SHOP_SPRITES에 프레임을 로드하고 캔버스에 이미지로 생성/업데이트
+    # 벽(보이지 않는 디버그용 사각형)/NPC/상점 배치는 아래 rescale_elements가 함
+    # 화면 근처 것만 풀에서 꺼내 쓰고 남는 건 숨김 (충돌은 state가 월드 좌표로 처리)
     globals()["SHOP_SPRITES"] = load_spritesheet_frames(SHOP_SPRITE_PATH, display_size)
-    if shop is None:
-        # anchor="nw"로 좌상단 기준 배치
-        globals()["shop"] = canvas.create_image(shop_x_val, shop_y_val,
-                                                image=SHOP_SPRITES[0] if SHOP_SPRITES else None,
-                                                anchor="nw")
-    else:
-        canvas.coords(shop, shop_x_val, shop_y_val)
-        if SHOP_SPRITES:
-            canvas.itemconfig(shop, image=SHOP_SPRITES[0])
-
-    for r in list(walls):
-        try:
-            canvas.delete(r)
-        except:
-            pass
-    walls.clear()
-    for (x1, y1, x2, y2) in BASE_WALLS:
-        rect = canvas.create_rectangle(x1, y1, x2, y2, outline="", fill="", width=0)
-        walls.append(rect)
-
-    rescale_elements()
+    globals()["MONSTER_SPRITES"] = load_spritesheet_frames(MONSTER_SPRITE_PATH, monster_display_size(uniform))
 
-# --------------------
-# collision
-# --------------------
-def check_collision(new_x, new_y):
-    w_scale, h_scale, _ = get_scales()
-    px1 = new_x * w_scale
-    py1 = new_y * h_scale
-    px2 = px1 + PLAYER_DISPLAY_SIZE
-    py2 = py1 + PLAYER_DISPLAY_SIZE
-    for rect in walls:
-        x1, y1, x2, y2 = canvas.coords(rect)
-        if px2 > x1 and px1 < x2 and py2 > y1 and py1 < y2:
-            return True
-    return False
+    rescale_elements(immediate=True)
+    schedule_prefetch()
 
 # --------------------
 # movement
 # --------------------
+@profiler.timed("tick")
 def move_loop():
-    global player_x, player_y, player_dir, player_frame, current_speed, map_transitioning, vertical_velocity, on_ground
-    # 수평 입력 계산
-    dx = dy = 0
-    # --- 착지 판정 먼저 갱신 (간단한 아래 검사) ---
-    try:
-        on_ground = check_collision(player_x, player_y + 1) or (player_y >= BASE_HEIGHT - PLAYER_DISPLAY_SIZE - 1)
-    except Exception:
-        on_ground = (player_y >= BASE_HEIGHT - PLAYER_DISPLAY_SIZE - 1)
-    # --- 기존 코드 유지: 수평/수직 입력 처리 ---
-    if not is_attacking:
-        # forest에서는 'w'를 위로 이동에 사용하지 않음(점프은 Space)
-        if 'a' in keys_pressed:
-            dx = -current_speed; player_dir = 'left'
-        elif 'd' in keys_pressed:
-            dx = current_speed; player_dir = 'right'
-        else:
-            if current_map != "forest":
-                if 'w' in keys_pressed:
-                    dy = -current_speed; player_dir = 'up'
-                elif 's' in keys_pressed:
-                    dy = current_speed; player_dir = 'down'
-    else:
-        dx = dy = 0
-
-    # 수평/수직 이동 적용 (충돌 검사)
-    if dx != 0 or dy != 0:
-        new_x = player_x + dx
-        new_y = player_y + dy
-        if not check_collision(new_x, new_y):
-            player_x = new_x
-            player_y = new_y
-        current_speed = min(current_speed + ACCEL, MAX_SPEED)
-    else:
-        current_speed = MOVE_SPEED
-
-    # 중력/점프 처리 (forest에서만)
-    if current_map == "forest":
-        vertical_velocity += GRAVITY
-        attempted_y = player_y + vertical_velocity
-
-        # clamp 시드 (안전 범위)
-        min_y = 0
-        max_y = BASE_HEIGHT - PLAYER_DISPLAY_SIZE
-
-        # 상승 충돌 처리
-        if vertical_velocity < 0:
-            tries = 0
-            while check_collision(player_x, attempted_y) and tries < 8:
-                attempted_y += 1
-                vertical_velocity = 0
-                tries += 1
-            attempted_y = max(min_y, min(attempted_y, max_y))
-        else:
-            if check_collision(player_x, attempted_y):
-                tries = 0
-                while check_collision(player_x, attempted_y) and tries < 16 and attempted_y > min_y:
-                    attempted_y -= 1
-                    tries += 1
-                vertical_velocity = 0
-            attempted_y = max(min_y, min(attempted_y, max_y))
-        player_y = attempted_y
-        # 착지 판정 재설정 (수정: 수직속도가 거의 0이면 착지로 간주)
-        if abs(vertical_velocity) < 1e-3 and (check_collision(player_x, player_y + 1) or player_y >= BASE_HEIGHT - PLAYER_DISPLAY_SIZE - 1):
-            on_ground = True
-        else:
-            on_ground = False
-    else:
-        vertical_velocity = 0
-        on_ground = True
-
-    # 화면/맵 경계에서 X도 벗어나지 않게 강제
-    min_x = 0
-    max_x = BASE_WIDTH - PLAYER_DISPLAY_SIZE
-    player_x = max(min_x, min(player_x, max_x))
-    player_y = max(0, min(player_y, BASE_HEIGHT - PLAYER_DISPLAY_SIZE))
-
-    # 스프라이트 위치 업데이트
-    w_scale, h_scale, _ = get_scales()
-    try:
+    # 시뮬레이션 한 틱 (TICK_MS 고정 — 예약은 game_loop가 함)
+    # 맵 전환 중에는 월드를 멈추되 입력(keys_pressed)은 계속 받음
+    if transition is not None:
+        return
+    if recorder is not None:
+        recorder.record_tick(state.keys_pressed)
+    state.step()
+    if state.quest_ready():
+        complete_quest()
+    ui.tick()
+    with profiler.phase("portal"):
+        target = state.portal()
+        if target and 'w' in state.keys_pressed and not map_transitioning:
+            animate_map_transition(target[0], start_pos=target[1])
+
+@profiler.timed("render")
+def render(alpha=1.0):
+    if prefetcher is not None:
+        with profiler.phase("prefetch"):
+            prefetcher.poll()
+    if transition is not None:
+        with profiler.phase("transition"):
+            transition.update()
+        present()
+        return
+    w_s, h_s, _ = get_scales()
+    draw_x, draw_y = state.interpolated(alpha)
+
+    with profiler.phase("animation"):
+        # state 쪽 공격이 끝났으면 공격 프레임 재생도 끝 (아래에서 대기 프레임으로)
+        if attack_anim is not None and not state.is_attacking:
+            stop_attack_anim()
+        timeline.update()
+
+    with profiler.phase("camera"):
+        # 카메라나 엔티티가 움직였을 때만 컬링/재배치
+        cam_moved = follow_camera(draw_x, draw_y)
+        culled = cull()
+        if cam_moved or culled or state.entities_moved:
+            draw_world(w_s, h_s)
+        if cam_moved and bg_renderer is not None:
+            bg_renderer.scroll(camera.x * w_s, camera.y * h_s)
+        stream_chunks(w_s, h_s)
+
+    with profiler.phase("sprites"):
+        # 스프라이트 위치 업데이트 (제자리면 Tcl 호출 없음)
         if player_sprite is not None:
-            canvas.coords(player_sprite, player_x * w_scale, player_y * h_scale)
-    except Exception:
-        pass
-
-    # 걷기 애니메이션 — 공격 중이면 건너뜀
-    if not is_attacking:
-        if dx != 0 or dy != 0:
-            frames = SPRITES.get(player_dir) or SPRITES["down"]
-            player_frame = (player_frame + 1) % max(1, len(frames))
+            retained.coords(player_sprite, *to_screen(draw_x, draw_y, w_s, h_s))
+
+        # 걷기 애니메이션 — 공격 중이면 건너뜀
+        if not state.is_attacking:
+            frames = SPRITES.get(state.player_dir) or SPRITES["down"]
             if frames and player_sprite is not None:
-                canvas.itemconfig(player_sprite, image=frames[player_frame % len(frames)])
+                idx = state.player_frame % len(frames) if state.moved else 0
+                retained.config(player_sprite, image=frames[idx])
+        draw_monster_frames()
+
+    with profiler.phase("hints"):
+        # 힌트/포탈 표시 — 한 번 만든 텍스트를 옮기거나 숨기기만 함
+        near = state.nearby_entity()
+        if near is not None:
+            kind, i = near
+            ents = state.entities
+            hx, hy = to_screen(ents.x[i], ents.y[i], w_s, h_s)
+            retained.label("hint", hx + 20, hy - 20, text="[E] 말하기" if kind == "npc" else "[E] 상점", fill="black")
         else:
-            frames = SPRITES.get(player_dir) or SPRITES["down"]
-            if frames and player_sprite is not None:
-                canvas.itemconfig(player_sprite, image=frames[0])
+            retained.hide("hint")
 
-    # 힌트/포탈 표시 (트리거가 있을 때만 표시/진입 허용)
-    canvas.delete("hint")
-    canvas.delete("portal_hint")
-    w_s, h_s, _ = get_scales()
-    if abs(player_x - npc_x) < 50 and abs(player_y - npc_y) < 50:
-        canvas.create_text(npc_x * w_s + 20, npc_y * h_s - 20, text="[E] 말하기", fill="black", tag="hint")
-    elif abs(player_x - shop_x) < 60 and abs(player_y - shop_y) < 60:
-        canvas.create_text(shop_x * w_s + 20, shop_y * h_s - 20, text="[E] 상점", fill="black", tag="hint")
-
-    data = MAPS[current_map]
-    left_t = data.get('left_map_trigger')
-    right_t = data.get('right_map_trigger')
-
-    if left_t and player_x <= left_t[2]:
-        nxt = data.get('left_map')
-        if nxt:
-            canvas.create_text(player_x * w_s + 20, player_y * h_s - 40, text="[W] 입장", fill="blue", tag="portal_hint")
-            if 'w' in keys_pressed and not map_transitioning:
-                start_x = BASE_WIDTH - BASE_PLAYER_SIZE - 10
-                clamped_y = int(min(max(player_y, 0), BASE_HEIGHT - BASE_PLAYER_SIZE))
-                animate_map_transition(nxt, start_pos=(start_x, clamped_y))
-    elif right_t and player_x + PLAYER_DISPLAY_SIZE >= right_t[0]:
-        nxt = data.get('right_map')
-        if nxt:
-            canvas.create_text(player_x * w_s + 20, player_y * h_s - 40, text="[W] 입장", fill="blue", tag="portal_hint")
-            if 'w' in keys_pressed and not map_transitioning:
-                start_x = 10
-                clamped_y = int(min(max(player_y, 0), BASE_HEIGHT - BASE_PLAYER_SIZE))
-                animate_map_transition(nxt, start_pos=(start_x, clamped_y))
-
-    root.after(TICK_MS, move_loop)
-
-# ...existing code...
-def start_jump():
-    """Forest 맵에서만 작동하는 점프 시작 (on_ground 사용)."""
-    global vertical_velocity, on_ground
-    if current_map != "forest":
-        return
-    # 이미 공중이면 무시
-    if not on_ground or abs(vertical_velocity) > 1e-3:
+        if state.portal():
+            px, py = to_screen(draw_x, draw_y, w_s, h_s)
+            retained.label("portal_hint", px + 20, py - 40, text="[W] 입장", fill="blue")
+        else:
+            retained.hide("portal_hint")
+
+    with profiler.phase("ui"):
+        ui.draw(canvas.winfo_width(), canvas.winfo_height())
+
+    if profiler.enabled:
+        update_profiler_overlay()
+    present()
+
+def present():
+    # 소프트웨어 렌더러: 이번 프레임에 바뀐 영역만 합성해서 화면에 올림
+    if SOFTWARE:
+        with profiler.phase("present"):
+            canvas.present()
+
+# --------------------
+# profiler overlay
+# --------------------
+def update_profiler_overlay(force=False):
+    # 매 프레임이 아니라 PROFILER_OVERLAY_MS마다만 글자를 바꿈
+    global profiler_overlay_at
+    now = profiler.clock()
+    if not force and now - profiler_overlay_at < PROFILER_OVERLAY_MS / 1000.0:
         return
-    vertical_velocity = JUMP_VELOCITY
-    on_ground = True
-# ...existing code...
+    profiler_overlay_at = now
+    retained.label("profiler", 8, 8, text="\n".join(profiler.summary_lines()),
+                   fill="white", anchor="nw", font=("Courier", 10))
+
+def toggle_profiler():
+    profiler.enabled = not profiler.enabled
+    if profiler.enabled:
+        profiler.reset()
+        update_profiler_overlay(force=True)
+    else:
+        retained.hide("profiler")
+
+def dump_profiler_trace():
+    count = profiler.dump_trace(TRACE_PATH)
+    print(f"trace 저장: {TRACE_PATH} ({count} events)")
 
 # --------------------
 # input
 # --------------------
 def on_key_press(evt):
-    global last_horizontal, player_x
     key = evt.keysym.lower()
-    first_press = key not in keys_pressed
-    keys_pressed.add(key)
+    first_press = key not in state.keys_pressed
+    state.keys_pressed.add(key)
 
     # 마지막 수평키 추적 (a 또는 d)
     if key in ('a', 'd'):
-        last_horizontal = key
+        state.last_horizontal = key
+
+    # 열린 대화창/상점/가방이 쓰는 키면 여기서 끝 (E로 닫기, 숫자로 구매 등)
+    if first_press and ui is not None and ui.key(key):
+        return
 
     # 동작은 최초 누름(first_press)에서만 실행하여 '씹힘' 방지
     if key == 'e' and first_press:
         handle_action()
-    elif key == 'space' :
-        # forest에서 Space로 점프
-        if current_map == "forest":
-                start_jump()
-                return
+    elif key == 'space':
+        # gravity 맵(forest)에서 Space로 점프
+        record_event("jump")
+        state.start_jump()
     elif key == 'w' and first_press:
         # 기존 포탈/입장 키는 w로 유지
         try_enter_portal()
     elif key == 'z' and first_press:
         start_attack()
+    elif key == 'f3' and first_press:
+        toggle_profiler()
+    elif key == 'f4' and first_press:
+        dump_profiler_trace()
 
 def on_key_release(evt):
-    keys_pressed.discard(evt.keysym.lower())
+    state.keys_pressed.discard(evt.keysym.lower())
+
+def record_event(name):
+    # 상태를 바꾸는 1회성 동작을 녹화 (replay.apply_event와 같은 이름)
+    if recorder is not None:
+        recorder.event(name)
 
 # --------------------
-# 포탈 진입 및 상점 애니메이션 (start_screen보다 위에 있어야 함)
+# 포탈 진입 및 공격 애니메이션 (start_screen보다 위에 있어야 함)
 # --------------------
 def try_enter_portal():
-    global player_x, player_y, map_transitioning
     if map_transitioning:
         return
-    data = MAPS[current_map]
-    left_t = data.get('left_map_trigger')
-    right_t = data.get('right_map_trigger')
-
-    if left_t and player_x <= left_t[2]:
-        nxt = data.get('left_map')
-        if nxt:
-            start_x = BASE_WIDTH - BASE_PLAYER_SIZE - 10
-            clamped_y = int(min(max(player_y, 0), BASE_HEIGHT - BASE_PLAYER_SIZE))
-            animate_map_transition(nxt, start_pos=(start_x, clamped_y))
-            return
-
-    if right_t and player_x + PLAYER_DISPLAY_SIZE >= right_t[0]:
-        nxt = data.get('right_map')
-        if nxt:
-            start_x = 10
-            clamped_y = int(min(max(player_y, 0), BASE_HEIGHT - BASE_PLAYER_SIZE))
-            animate_map_transition(nxt, start_pos=(start_x, clamped_y))
-
-def animate_shop():
-    global shop_frame, shop_anim_id
-    try:
-        if canvas is None:
-            return
-        if SHOP_SPRITES and shop is not None:
-            shop_frame = (shop_frame + 1) % len(SHOP_SPRITES)
-            canvas.itemconfig(shop, image=SHOP_SPRITES[shop_frame])
-    except Exception:
-        pass
-    shop_anim_id = root.after(SHOP_ANIM_DELAY, animate_shop)
+    target = state.portal()
+    if target:
+        animate_map_transition(target[0], start_pos=target[1])
 
 def start_attack():
-    global is_attacking, attack_frame, attack_anim_id, current_attack_sprites
-    global saved_player_dir, saved_player_frame, last_horizontal, map_transitioning
+    global attack_anim
     # 이미 공격 중이거나 맵 전환 중이면 무시
-    if is_attacking or map_transitioning:
+    if state.is_attacking or map_transitioning:
         return
 
     # 공격 스프라이트 선택
-    if last_horizontal == 'a' and BACK_ATTACK_SPRITES:
+    if state.last_horizontal == 'a' and BACK_ATTACK_SPRITES:
         sprites = BACK_ATTACK_SPRITES
-    elif last_horizontal == 'd' and ATTACK_SPRITES:
+    elif state.last_horizontal == 'd' and ATTACK_SPRITES:
         sprites = ATTACK_SPRITES
     else:
         sprites = ATTACK_SPRITES or BACK_ATTACK_SPRITES
 
     if not sprites:
         return
+    path = BACK_ATTACK_SPRITE_PATH if sprites is BACK_ATTACK_SPRITES else ATTACK_SPRITE_PATH
 
-    # 현재 상태 저장
-    saved_player_dir = player_dir
-    saved_player_frame = player_frame
+    # 공격 지속 시간은 state가 틱 단위로 관리, 여기선 프레임만 재생
+    record_event("attack")
+    state.start_attack()
+    if player_sprite is not None:
+        # 한 번만 재생 — 마지막 프레임 뒤 stop_attack_anim
+        attack_anim = timeline.play(player_sprite, sprites, sprite_cache.frame_ms(path, ATTACK_ANIM_DELAY),
+                                    loop=False, on_done=lambda _: stop_attack_anim())
 
-    current_attack_sprites = sprites
-    is_attacking = True
-    attack_frame = 0
-    try:
-        if player_sprite is not None:
-            canvas.itemconfig(player_sprite, image=current_attack_sprites[0])
-    except Exception:
-        pass
-    attack_anim_id = root.after(ATTACK_ANIM_DELAY, animate_attack)
-
-def animate_attack():
-    global attack_frame, is_attacking, attack_anim_id, current_attack_sprites
-    global player_dir, player_frame, saved_player_dir, saved_player_frame
-    try:
-        if not current_attack_sprites or player_sprite is None:
-            is_attacking = False
-            current_attack_sprites = None
-            return
-
-        attack_frame += 1
-        if attack_frame < len(current_attack_sprites):
-            canvas.itemconfig(player_sprite, image=current_attack_sprites[attack_frame])
-            attack_anim_id = root.after(ATTACK_ANIM_DELAY, animate_attack)
-        else:
-            # 애니 끝나면 저장해둔 상태로 복귀 (프레임은 대기 프레임 0)
-            is_attacking = False
-            current_attack_sprites = None
-            if saved_player_dir is not None:
-                player_dir = saved_player_dir
-            player_frame = 0
-            frames = SPRITES.get(player_dir) or SPRITES["down"]
-            if frames and player_sprite is not None:
-                canvas.itemconfig(player_sprite, image=frames[0])
-            saved_player_dir = None
-            saved_player_frame = 0
-    except Exception:
-        is_attacking = False
-        current_attack_sprites = None
-        saved_player_dir = None
-        saved_player_frame = 0
+def stop_attack_anim():
+    global attack_anim
+    timeline.stop(attack_anim)
+    attack_anim = None
 
 def handle_action():
-    global quest_active, quest_completed, gold
-    if abs(player_x - npc_x) < 50 and abs(player_y - npc_y) < 50:
-        if not quest_active and not quest_completed:
-            start_quest()
-        elif quest_active and not quest_completed:
-            messagebox.showinfo("NPC", "아직 퀘스트를 완료하지 않았습니다.")
-        elif quest_completed:
-            messagebox.showinfo("NPC", "퀘스트 완료! 보상 50G")
-            gold += 50
-            quest_completed = False
-    elif abs(player_x - shop_x) < 60 and abs(player_y - shop_y) < 60:
+    # 퀘스트 진행 판단은 state.interact(), 여기선 결과만 보여줌
+    record_event("interact")
+    result = state.interact()
+    if result is None:
+        return
+    kind, title, message = result
+    if kind == "shop":
         open_shop()
-
-def start_quest():
-    global quest_active
-    quest_active = True
-    messagebox.showinfo("퀘스트", "괴물을 물리치고 돌아오세요!")
+    else:
+        ui.say(title, message)
 
 def complete_quest():
-    global quest_active, quest_completed
-    if quest_active:
-        quest_active = False
-        quest_completed = True
-        messagebox.showinfo("퀘스트 완료", "NPC에게 돌아가세요!")
+    record_event("complete_quest")
+    if state.complete_quest():
+        ui.say("퀘스트 완료", "NPC에게 돌아가세요!")
 
 def open_shop():
-    global gold
-    shop_win = tk.Toplevel(root)
-    shop_win.title("상점")
-    tk.Label(shop_win, text=f"소지금: {gold} G").pack()
-    def buy(item, price):
-        global gold
-        if gold >= price:
-            gold -= price
-            inventory.append(item)
-            messagebox.showinfo("구매", f"{item} 구매 성공!")
-        else:
-            messagebox.showwarning("실패", "골드 부족!")
-    tk.Button(shop_win, text="체력포션 (30G)", command=lambda: buy("체력포션", 30)).pack(fill="x")
-    tk.Button(shop_win, text="마나포션 (20G)", command=lambda: buy("마나포션", 20)).pack(fill="x")
-    tk.Button(shop_win, text="강화석 (50G)", command=lambda: buy("강화석", 50)).pack(fill="x")
+    ui.open_shop()
+
+def buy(item, price):
+    # 상점 패널의 숫자 키에서 호출
+    record_event(f"buy:{item}:{price}")
+    return state.buy(item, price)
 
 # --------------------
 # map slide animation
 # --------------------
+def collect_map_items():
+    # 현재 맵 요소 수집 (존재하는 것만)
+    items = []
+    if bg_renderer is not None:
+        items.extend(bg_renderer.items())
+    items.extend(chunk_items)
+    if player_sprite is not None:
+        items.append(player_sprite)
+    items.extend(item for _, item in npc_items)
+    items.extend(item for _, item in shop_items)
+    items.extend(item for _, item in monster_items)
+    items.extend(walls)
+    return items
+
 def animate_map_transition(target_map, start_pos=None):
-    global map_transitioning
+    # 렌더 프레임마다 조금씩 진행 — 이벤트 루프를 막지 않음
+    global map_transitioning, transition
     if map_transitioning:
         return
     map_transitioning = True
+    retained.hide_all()
+    # 창 크기 변경 뒤 대기 중인 배경 리샘플이 슬라이드 도중 x=0으로 되돌리지 않게
+    if bg_renderer is not None:
+        bg_renderer.cancel_pending()
+
+    def swap():
+        # 아이템은 지우지 않고 새 맵 이미지/좌표로 다시 묶음 (load_map이 절대 좌표로 배치)
+        for it in collect_map_items():
+            retained.forget(it)
+        load_map(target_map, start_pos=start_pos)
+        bg_renderer.reposition()
+        autosave()
+        reset_game_clock()
+
+    def done(t):
+        global transition
+        transition = None
+        # 슬라이드로 canvas.move 된 아이템들의 기억값은 더 이상 정확하지 않음
+        for it in collect_map_items():
+            retained.forget(it)
+        rescale_elements()
+        reset_game_clock()
+        # 짧은 쿨다운 후 플래그 해제
+        def _clear_flag():
+            global map_transitioning
+            map_transitioning = False
+        root.after(300, _clear_flag)
 
-    # 캔버스 크기와 스텝
     width = canvas.winfo_width() or BASE_WIDTH
-    steps = 18
-    dx = width / steps
+    transition = MapTransition(canvas, collect_map_items, swap, width,
+                               duration_ms=TRANSITION_MS, easing=TRANSITION_EASING, on_done=done)
 
-    # 현재 맵 요소 수집 (존재하는 것만)
-    current_items = []
-    if globals().get("bg_id") is not None:
-        current_items.append(globals()["bg_id"])
-    if player_sprite is not None:
-        current_items.append(player_sprite)
-    if npc is not None:
-        current_items.append(npc)
-    if shop is not None:
-        current_items.append(shop)
-    current_items.extend(walls)
-
-    # 1) 현재 화면을 왼쪽으로 슬라이드 아웃
-    for _ in range(steps):
-        for it in current_items:
-            try:
-                canvas.move(it, -dx, 0)
-            except:
-                pass
-        root.update_idletasks()
-        root.update()
-        root.after(16)
-
-    # 2) 현재 요소들을 캔버스에서 삭제하여 겹침 방지
-    for it in current_items:
-        try:
-            canvas.delete(it)
-        except:
-            pass
-
-    # 비어있는 요소 목록 갱신
-    globals()["bg_id"] = None
-    walls.clear()
-    # player_sprite/npc/shop는 load_map에서 다시 생성 또는 재설정됨
-    globals()["player_sprite"] = None
-    globals()["npc"] = None
-    globals()["shop"] = None
-
-    # 3) 새 맵 로드 (start_pos 전달)
-    load_map(target_map, start_pos=start_pos)
-
-    # 4) 새 요소들을 화면 오른쪽 바깥(오프스크린)으로 이동시킨 뒤 슬라이드 인
-    new_items = []
-    if globals().get("bg_id") is not None:
-        new_items.append(globals()["bg_id"])
-    if player_sprite is not None:
-        new_items.append(player_sprite)
-    if npc is not None:
-        new_items.append(npc)
-    if shop is not None:
-        new_items.append(shop)
-    new_items.extend(walls)
-
-    # 모두 오른쪽 바깥으로 배치
-    for it in new_items:
-        try:
-            canvas.move(it, width, 0)
-        except:
-            pass
-
-    # 새 요소들을 왼쪽으로 슬라이드 인
-    for _ in range(steps):
-        for it in new_items:
-            try:
-                canvas.move(it, -dx, 0)
-            except:
-                pass
-        root.update_idletasks()
-        root.update()
-        root.after(16)
+# --------------------
+# autosave
+# --------------------
+def autosave():
+    # 스냅샷만 여기서 뜨고 인코딩/쓰기는 저장 스레드가 함
+    if saver is not None:
+        with profiler.phase("autosave"):
+            saver.save(state.snapshot())
+
+def autosave_loop():
+    autosave()
+    root.after(savegame.AUTOSAVE_MS, autosave_loop)
+
+def restore_save():
+    # 세이브가 있으면 state에 적용하고 True (없는 맵이면 새 게임)
+    saved = savegame.load()
+    if saved is None or saved.get("current_map") not in MAPS:
+        return False
+    state.restore(saved)
+    print(f"세이브 불러옴: {state.current_map} ({state.gold} G)")
+    return True
 
-    rescale_elements()
+# --------------------
+# hot reload (--watch)
+# --------------------
+def start_watching():
+    global watcher
+    watcher = hotreload.FileWatcher()
+    watcher.watch(game_state.__file__, reload_map_source)
+    watcher.watch(atlas.DEFAULT_PACK, reload_atlas)
+    sheets = set(all_sheet_paths()) | {d["bg"] for d in MAPS.values() if d.get("bg")}
+    for path in sorted(sheets):
+        watcher.watch(path, reload_sheet)
+    for src in tilemap.map_sources():
+        watcher.watch(src, reload_tilemap)
+    root.after(hotreload.POLL_MS, poll_watcher)
+
+def poll_watcher():
+    # 예약부터 — 아래에서 예외가 나도 감시는 계속됨
+    root.after(hotreload.POLL_MS, poll_watcher)
+    # 맵 전환 중이면 다음 주기로 미룸
+    if transition is not None:
+        return
+    sources = tilemap.map_sources()
+    for src in sources:
+        if src not in watcher.callbacks:
+            # 새로 만든 타일맵 파일 (저장 도중이면 다음 변경 때 다시 읽음)
+            watcher.watch(src, reload_tilemap)
+            try:
+                reload_tilemap(src)
+            except Exception as e:
+                print(f"다시 읽기 실패: {src}: {e}")
+    for src in [p for p, cb in watcher.callbacks.items() if cb is reload_tilemap and p not in sources]:
+        # 지워진 타일맵 파일은 감시에서 뺌 (MAPS 항목은 그대로 — 다시 만들면 새 파일로 잡힘)
+        watcher.unwatch(src)
+    watcher.poll()
+
+def reload_sheet(path):
+    # 그 PNG의 캐시만 비우고 지금 크기로 다시 만듦
+    sprite_cache.invalidate(path)
+    bg_renderer.invalidate(path)
+    prefetcher.cancel()
+    if path == state.data.get("bg"):
+        globals()["bg_image"] = sprite_cache.get_sheet(path)
+        bg_renderer.set_source(path, bg_image)
+    rescale_elements(immediate=True)
+    print(f"스프라이트 다시 읽음: {path}")
+
+def reload_atlas(path):
+    # 새 팩을 먼저 열고 바꿔 낀 뒤, 프레임을 전부 새로 만든 다음에 이전 mmap을 닫음
+    # (안 닫으면 다시 읽을 때마다 파일 핸들이 새고, Windows에선 atlas.py build가 덮어쓰지 못함)
+    old = sprite_cache.use_atlas(atlas.load_pack(path))
+    sprite_cache.invalidate()
+    apply_frame_timing()
+    rescale_elements(immediate=True)
+    if old is not None:
+        old.close()
+    print(f"아틀라스 다시 읽음: {path}")
+
+def reload_map_source(path):
+    # game_state.py의 MAPS 리터럴만 다시 읽음 (코드는 그대로)
+    apply_map_changes(hotreload.read_literal(path, "MAPS"))
+
+def reload_tilemap(path):
+    global streamer
+    name = tilemap.map_name(path)
+    # 옆 임시 파일에 먼저 컴파일 — JSON이 깨졌으면 여기서 예외, 지금 맵/mmap은 그대로
+    staged = tilemap.compile_staged(path)
+    old = MAPS.get(name, {}).get("tilemap")
+    if old is not None:
+        # 바꿔치기 직전에 이전 mmap을 닫음 (Windows는 열린 파일을 못 바꿈)
+        if streamer is not None and streamer.tmap is old:
+            streamer.shutdown()
+            streamer = None
+        old.close()
+    tilemap.install_staged(path, staged)
+    apply_map_changes({name: tilemap.TileMap(path).map_data()})
+
+def apply_map_changes(new):
+    changed = hotreload.changed_keys(MAPS, new)
+    if not changed:
+        return
+    MAPS.update(new)
+    prefetcher.cancel()
+    if state.current_map in changed:
+        reload_current_map()
+    print(f"맵 다시 읽음: {', '.join(changed)}")
+
+def reload_current_map():
+    # 맵 데이터(벽/엔티티/배경)만 교체 — load_map은 위치 외의 진행 상태를 건드리지 않음
+    load_map(state.current_map, (state.player_x, state.player_y))
+    reset_game_clock()
+
+def reset_game_clock():
+    # 맵 로드처럼 한 번에 오래 걸린 작업 뒤 — 그동안 쌓인 시간을 틱으로 몰아서 따라잡지 않음
+    if game_loop is not None:
+        game_loop.reset_clock()
 
-    # 짧은 쿨다운 후 플래그 해제
-    def _clear_flag():
-        global map_transitioning
-        map_transitioning = False
-    root.after(300, _clear_flag)
+# --------------------
+# startup (메뉴 먼저 그리고, 무거운 준비는 메뉴가 떠 있는 동안)
+# --------------------
+startup_times = {}   # 단계 이름 -> 시작 후 경과 ms (또는 단계 소요 ms)
+
+def mark_startup(name):
+    startup_times[name] = (time.perf_counter() - STARTUP_T0) * 1000
+
+def warm_imports():
+    global sprite_cache, atlas, ImageTk, BackgroundRenderer, Prefetcher
+    import sprite_cache
+    import atlas
+    from PIL import ImageTk
+    from background import BackgroundRenderer
+    from prefetch import Prefetcher
+    if SOFTWARE:
+        # 프레임 캐시를 채우기 전에 — 이후 스프라이트/배경/청크는 PIL 이미지 그대로
+        from compositor import SoftImage
+        sprite_cache.set_photo_factory(SoftImage)
+
+def warm_atlas():
+    # python atlas.py build 로 만든 팩이 있으면 PNG 자르기/리샘플 생략
+    sprite_cache.use_atlas(atlas.load_pack())
+    apply_frame_timing()
+
+def apply_frame_timing():
+    # 몬스터 프레임은 state.entities가 진행 — 아틀라스의 frame_ms로 맞춤 (상점/공격은 재생할 때 읽음)
+    count, ms = DEFAULT_ANIM[MONSTER]
+    state.entities.set_anim(MONSTER, count, sprite_cache.frame_ms(MONSTER_SPRITE_PATH, ms))
+
+def warm_maps():
+    # maps/*.json 타일맵을 MAPS에 추가 (컴파일본이 최신이면 헤더만 읽음)
+    MAPS.update(tilemap.load_maps())
+
+def all_sheet_paths():
+    return list(SPRITE_PATHS.values()) + [SHOP_SPRITE_PATH, ATTACK_SPRITE_PATH, BACK_ATTACK_SPRITE_PATH,
+                                          MONSTER_SPRITE_PATH]
+
+def warm_sheets():
+    for p in all_sheet_paths():
+        sprite_cache.get_sheet(p)
+    bg_path = MAPS[state.current_map].get("bg")
+    if bg_path:
+        sprite_cache.get_sheet(bg_path)
+
+def warm_frames():
+    # 첫 창 크기(BASE) 기준 프레임을 미리 PhotoImage로
+    for p in all_sheet_paths():
+        size = monster_display_size(1.0) if p == MONSTER_SPRITE_PATH else BASE_PLAYER_SIZE
+        sprite_cache.get_frames(p, size)
+
+WARMUP_STEPS = [("import_pil", warm_imports), ("atlas", warm_atlas), ("maps", warm_maps),
+                ("sheets", warm_sheets), ("frames", warm_frames)]
+warmup_done = 0
+
+def run_warmup_step():
+    global warmup_done
+    name, fn = WARMUP_STEPS[warmup_done]
+    t = time.perf_counter()
+    fn()
+    startup_times["warm_" + name] = (time.perf_counter() - t) * 1000
+    warmup_done += 1
+
+def finish_warmup():
+    # 준비가 끝나기 전에 "게임 시작"을 누르면 남은 단계를 바로 실행
+    while warmup_done < len(WARMUP_STEPS):
+        run_warmup_step()
+
+def print_startup_report():
+    parts = [f"{name}={ms:.1f}ms" for name, ms in startup_times.items()]
+    if "click" in startup_times and "playable" in startup_times:
+        parts.append(f"click->playable={startup_times['playable'] - startup_times['click']:.1f}ms")
+    print("startup: " + ", ".join(parts))
+
+def setup_canvas(c):
+    # 그릴 캔버스에 딸린 층/풀/배경을 만듦 (bench.py는 FakeCanvas로 부름)
+    global canvas, retained, timeline, wall_pool, npc_pool, shop_pool, monster_pool, chunk_pool
+    global bg_renderer, prefetcher, ui
+    canvas = c
+    retained = RetainedCanvas(canvas)
+    timeline = Timeline(lambda item, image: retained.config(item, image=image))
+    ui = GameUI(canvas, retained, state, SHOP_ITEMS, on_buy=buy)
+    wall_pool = CanvasPool(canvas, lambda c: c.create_rectangle(0, 0, 0, 0, outline="", fill="", width=0))
+    npc_pool = CanvasPool(canvas, lambda c: c.create_rectangle(0, 0, 0, 0, fill="orange", outline="black"))
+    # 상점은 anchor="nw"로 좌상단 기준 배치
+    shop_pool = CanvasPool(canvas, lambda c: c.create_image(0, 0, anchor="nw"))
+    monster_pool = CanvasPool(canvas, lambda c: c.create_image(0, 0, anchor="nw"))
+    chunk_pool = CanvasPool(canvas, new_chunk_item)
+    bg_renderer = BackgroundRenderer(root, canvas)
+    prefetcher = Prefetcher(MAPS, bg_renderer)
+    bg_renderer.on_settled = schedule_prefetch
 
 # --------------------
 # start screen
@@ -730,21 +836,83 @@ def start_screen():
     start_frame = tk.Frame(root, width=BASE_WIDTH, height=BASE_HEIGHT)
     start_frame.pack(fill="both", expand=True)
     tk.Label(start_frame, text="픽셀 RPG", font=("Arial", 36)).pack(pady=40)
+    progress = ttk.Progressbar(start_frame, maximum=len(WARMUP_STEPS), length=240)
+    progress.pack(pady=4)
+    status = tk.Label(start_frame, text="준비 중...")
+    status.pack()
+
+    def warm_next():
+        # 한 번에 한 단계씩 — 사이사이 이벤트 루프가 돌아 메뉴가 멈추지 않음
+        if warmup_done >= len(WARMUP_STEPS) or not start_frame.winfo_exists():
+            return
+        run_warmup_step()
+        progress["value"] = warmup_done
+        if warmup_done < len(WARMUP_STEPS):
+            root.after(1, warm_next)
+        else:
+            mark_startup("warm_done")
+            status.config(text="준비 완료")
+
+    def first_pixel():
+        mark_startup("first_pixel")
+        root.after(1, warm_next)
+
     def start_game():
+        mark_startup("click")
+        finish_warmup()
         start_frame.destroy()
-        global canvas
-        canvas = tk.Canvas(root, width=BASE_WIDTH, height=BASE_HEIGHT)
-        canvas.pack(fill="both", expand=True)
-        canvas.bind("<Configure>", lambda e: rescale_elements())
+        global game_loop, saver
+        widget = tk.Canvas(root, width=BASE_WIDTH, height=BASE_HEIGHT)
+        widget.pack(fill="both", expand=True)
+        if SOFTWARE:
+            from compositor import SoftwareCanvas
+            setup_canvas(SoftwareCanvas(widget, BASE_WIDTH, BASE_HEIGHT))
+        else:
+            setup_canvas(widget)
+        canvas.bind("<Configure>", on_configure)
         # 키 바인딩을 전체(window)로 바꿔 포커스 상관없이 입력을 받게 함
         root.bind_all("<KeyPress>", on_key_press)
         root.bind_all("<KeyRelease>", on_key_release)
-        load_map(current_map)
-        # 상점 애니메이션 시작
-        animate_shop()
-        move_loop()
+        if restore_save():
+            load_map(state.current_map, (state.player_x, state.player_y))
+        else:
+            load_map(state.current_map)
+        if RECORD_PATH:
+            global recorder
+            recorder = Recorder(state)
+        if WATCH:
+            start_watching()
+        saver = savegame.AutoSaver()
+        root.after(savegame.AUTOSAVE_MS, autosave_loop)
+        # 고정 틱 시뮬레이션 + 별도 주기 렌더링
+        game_loop = FixedStepLoop(root, move_loop, render)
+        game_loop.start()
+        mark_startup("playable")
+        print_startup_report()
     tk.Button(start_frame, text="게임 시작", font=("Arial", 20), command=start_game).pack(pady=20)
-
-start_screen()
-root.mainloop()
+    root.after(0, first_pixel)
+
+def shutdown():
+    if recorder is not None:
+        recorder.save(RECORD_PATH)
+    if prefetcher is not None:
+        prefetcher.shutdown()
+    if streamer is not None:
+        streamer.shutdown()
+    if saver is not None:
+        autosave()
+        saver.shutdown()
+
+def main():
+    global root
+    root = tk.Tk()
+    root.title("픽셀 RPG")
+    root.geometry(f"{BASE_WIDTH}x{BASE_HEIGHT}")
+    start_screen()
+    root.mainloop()
+    shutdown()
+
+
+if __name__ == "__main__":
+    main()
 
@@ -0,0 +1,214 @@
+from collections import OrderedDict
+import heapq
+import math
+
+# --------------------
+# 설정
+# --------------------
+NAV_CELL = 32            # 통행 격자 한 칸 (px)
+PATH_CACHE_SIZE = 256    # (시작 칸, 목표 칸) -> 경로 최대 보관 개수
+NODES_PER_TICK = 500     # 한 틱에 모든 탐색을 합쳐 펼칠 수 있는 칸 수
+MAX_NODES = 20000        # 탐색 하나의 상한 (넘으면 길 없음으로 처리)
+
+SQRT2 = math.sqrt(2)
+# (dx, dy, 비용) — 8방향
+NEIGHBORS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+             (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2))
+
+
+# --------------------
+# 통행 격자
+# --------------------
+class NavGrid:
+    """맵의 벽을 칸 단위 통행 가능 여부로 (맵 로드 때 한 번).
+
+    칸 (cx, cy)가 열려 있다 = agent x agent 상자의 좌상단을 그 칸 좌상단에 놓아도
+    벽/맵 경계와 겹치지 않음. 그래서 칸 좌상단만 따라가면 벽에 걸리지 않는다.
+    """
+
+    def __init__(self, walls, world_w, world_h, agent=NAV_CELL, cell=NAV_CELL):
+        self.cell = cell
+        self.agent = agent
+        self.cols = cols = max(1, math.ceil(world_w / cell))
+        self.rows = rows = max(1, math.ceil(world_h / cell))
+        self.blocked = bytearray(cols * rows)
+        # 맵 밖으로 삐져나가는 칸
+        self._block(world_w - agent, -math.inf, math.inf, math.inf)
+        self._block(-math.inf, world_h - agent, math.inf, math.inf)
+        for x1, y1, x2, y2 in walls:
+            # 좌상단 px가 x1 - agent < px < x2 이면 겹침 (딱 붙는 건 허용)
+            self._block(x1 - agent, y1 - agent, x2, y2)
+
+    def _block(self, x1, y1, x2, y2):
+        cell, cols = self.cell, self.cols
+        cx1 = max(0, math.floor(x1 / cell) + 1) if x1 > -math.inf else 0
+        cy1 = max(0, math.floor(y1 / cell) + 1) if y1 > -math.inf else 0
+        cx2 = min(cols - 1, math.ceil(x2 / cell) - 1) if x2 < math.inf else cols - 1
+        cy2 = min(self.rows - 1, math.ceil(y2 / cell) - 1) if y2 < math.inf else self.rows - 1
+        blocked = self.blocked
+        for cy in range(cy1, cy2 + 1):
+            row = cy * cols
+            for cx in range(cx1, cx2 + 1):
+                blocked[row + cx] = 1
+
+    def walkable(self, cx, cy):
+        return 0 <= cx < self.cols and 0 <= cy < self.rows and not self.blocked[cy * self.cols + cx]
+
+    def cell_of(self, x, y):
+        return (min(max(int(x // self.cell), 0), self.cols - 1),
+                min(max(int(y // self.cell), 0), self.rows - 1))
+
+    def to_world(self, c):
+        return c[0] * self.cell, c[1] * self.cell
+
+
+def _octile(dx, dy):
+    return dx + dy + (SQRT2 - 2) * min(dx, dy)
+
+def _reconstruct(parent, i, cols):
+    # 꺾이는 칸만 남긴 경로 (시작 칸 제외) — 사이는 직선으로 이동
+    cells = []
+    while i != -1:
+        cells.append((i % cols, i // cols))
+        i = parent[i]
+    cells.reverse()
+    out = []
+    for n in range(1, len(cells)):
+        c = cells[n]
+        if n < len(cells) - 1:
+            p, nxt = cells[n - 1], cells[n + 1]
+            if (c[0] - p[0], c[1] - p[1]) == (nxt[0] - c[0], nxt[1] - c[1]):
+                continue
+        out.append(c)
+    return tuple(out)
+
+def astar(grid, start, goal, max_nodes=MAX_NODES):
+    """A* 제너레이터: 칸 하나 펼칠 때마다 yield, 끝나면 StopIteration.value로 경로.
+
+    경로 = 시작 칸을 뺀 꺾이는 칸들의 튜플. 이미 도착했거나 길이 없으면 빈 튜플.
+    대각선은 양옆 칸이 둘 다 열려 있을 때만 (벽 모서리를 파고들지 않게).
+    """
+    if start == goal or not grid.walkable(*goal):
+        return ()
+    cols, rows, blocked = grid.cols, grid.rows, grid.blocked
+    gx, gy = goal
+    start_i = start[1] * cols + start[0]
+    goal_i = gy * cols + gx
+    g = {start_i: 0.0}
+    parent = {start_i: -1}
+    closed = set()
+    heap = [(_octile(abs(start[0] - gx), abs(start[1] - gy)), 0.0, start_i)]
+    expanded = 0
+    while heap:
+        _, cost, i = heapq.heappop(heap)
+        if i in closed:
+            continue
+        if i == goal_i:
+            return _reconstruct(parent, i, cols)
+        closed.add(i)
+        expanded += 1
+        if expanded > max_nodes:
+            return ()
+        yield
+        x, y = i % cols, i // cols
+        for dx, dy, step in NEIGHBORS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                continue
+            ni = ny * cols + nx
+            if blocked[ni] or ni in closed:
+                continue
+            if dx and dy and (blocked[y * cols + nx] or blocked[ny * cols + x]):
+                continue
+            ng = cost + step
+            if ng < g.get(ni, math.inf):
+                g[ni] = ng
+                parent[ni] = i
+                heapq.heappush(heap, (ng + _octile(abs(nx - gx), abs(ny - gy)), ng, ni))
+    return ()
+
+
+# --------------------
+# 경로 요청 처리
+# --------------------
+class Navigator:
+    """경로 요청을 모아 틱마다 budget 칸만큼만 탐색하고, 결과는 (시작 칸, 목표 칸)으로 캐시.
+
+    벽/맵 크기가 바뀐 build()에서만 격자를 다시 만들고 캐시를 비운다.
+    agent는 요청한 쪽 키(엔티티 번호 등) — 같은 agent가 다시 요청하면 이전 요청은 버림.
+    """
+
+    def __init__(self, cache_size=PATH_CACHE_SIZE, budget=NODES_PER_TICK):
+        self.grid = None
+        self.grid_key = None
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.budget = budget
+        self.pending = OrderedDict()   # agent -> (캐시 키, 탐색 제너레이터)
+        self.results = {}              # agent -> 경로 (take_all()로 가져감)
+        self.hits = 0
+        self.misses = 0
+        self.expanded = 0              # 누적 펼친 칸 수
+        self.builds = 0
+
+    def build(self, walls, world_w, world_h, agent=NAV_CELL):
+        # 맵 로드 때 — 같은 벽이면 격자와 캐시를 그대로 씀
+        self.reset()
+        key = (tuple(tuple(w) for w in walls), world_w, world_h, agent)
+        if key == self.grid_key:
+            return False
+        self.grid = NavGrid(walls, world_w, world_h, agent)
+        self.grid_key = key
+        self.cache.clear()
+        self.builds += 1
+        return True
+
+    def reset(self):
+        # 엔티티 번호가 새로 매겨질 때 (맵 로드) 진행 중 요청 버림
+        self.pending.clear()
+        self.results.clear()
+
+    def request(self, agent, start_xy, goal_xy):
+        grid = self.grid
+        key = (grid.cell_of(*start_xy), grid.cell_of(*goal_xy))
+        path = self.cache.get(key)
+        if path is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            self.pending.pop(agent, None)
+            self.results[agent] = path
+            return
+        self.misses += 1
+        self.pending.pop(agent, None)
+        self.pending[agent] = (key, astar(grid, *key))
+
+    def update(self, budget=None):
+        """대기 중 탐색을 앞에서부터 합쳐 budget 칸까지만 진행. 이번에 끝난 요청 수."""
+        left = self.budget if budget is None else budget
+        done = 0
+        pending = self.pending
+        while pending and left > 0:
+            agent, (key, search) = next(iter(pending.items()))
+            try:
+                while left > 0:
+                    next(search)
+                    left -= 1
+                    self.expanded += 1
+            except StopIteration as stop:
+                del pending[agent]
+                self._store(key, stop.value)
+                self.results[agent] = stop.value
+                done += 1
+        return done
+
+    def _store(self, key, path):
+        self.cache[key] = path
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def take_all(self):
+        # 이번까지 끝난 [(agent, 월드 좌표 경유점 목록)]
+        results, self.results = self.results, {}
+        to_world = self.grid.to_world
+        return [(agent, [to_world(c) for c in path]) for agent, path in results.items()]
@@ -0,0 +1,72 @@
+# --------------------
+# retained 캔버스 (바뀐 것만 Tcl로 보냄)
+# --------------------
+class RetainedCanvas:
+    """아이템별 마지막 coords/옵션을 기억해서 같은 값이면 호출을 건너뜀.
+
+    힌트 같은 텍스트는 이름으로 한 번만 만들고 이후엔 이동/숨김만 한다.
+    canvas.move 등으로 밖에서 아이템을 바꿨다면 forget()으로 기억을 지울 것.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.last = {}      # item -> {"coords": ..., 옵션: 값}
+        self.labels = {}    # 이름 -> 텍스트 아이템
+        self.calls = 0
+        self.skipped = 0
+
+    def coords(self, item, *xy):
+        st = self.last.setdefault(item, {})
+        if st.get("coords") == xy:
+            self.skipped += 1
+            return
+        self.canvas.coords(item, *xy)
+        st["coords"] = xy
+        self.calls += 1
+
+    def config(self, item, **opts):
+        st = self.last.setdefault(item, {})
+        changed = {}
+        for k, v in opts.items():
+            if k not in st or (st[k] is not v and st[k] != v):
+                changed[k] = v
+        if not changed:
+            self.skipped += 1
+            return
+        self.canvas.itemconfig(item, **changed)
+        st.update(changed)
+        self.calls += 1
+
+    def forget(self, item=None):
+        if item is None:
+            self.last.clear()
+        else:
+            self.last.pop(item, None)
+
+    # --------------------
+    # 이름 붙은 텍스트 (힌트 등)
+    # --------------------
+    def label(self, name, x, y, text, **opts):
+        item = self.labels.get(name)
+        if item is None:
+            item = self.canvas.create_text(x, y, text=text, tag=name, **opts)
+            self.labels[name] = item
+            self.last[item] = dict(opts, coords=(x, y), text=text, state="normal")
+            self.calls += 1
+            return item
+        if self.last.get(item, {}).get("state") == "hidden":
+            # 다시 보일 때만 맨 위로 (그 사이 새로 만든 아이템에 가려지지 않게)
+            self.canvas.tag_raise(item)
+            self.calls += 1
+        self.coords(item, x, y)
+        self.config(item, text=text, state="normal", **opts)
+        return item
+
+    def hide(self, name):
+        item = self.labels.get(name)
+        if item is not None:
+            self.config(item, state="hidden")
+
+    def hide_all(self):
+        for name in self.labels:
+            self.hide(name)
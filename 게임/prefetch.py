@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from PIL import Image
+
+import sprite_cache
+
+# --------------------
+# 설정
+# --------------------
+PREFETCH_WORKERS = 2
+PHOTOS_PER_POLL = 1    # 한 프레임에 PhotoImage로 바꿀 결과 수 (렉 방지)
+
+
+# --------------------
+# 워커에서 도는 작업 (PIL만 사용, Tk 금지)
+# --------------------
+def _decode_background(path, size, cancel):
+    mtime = sprite_cache.file_mtime(path)
+    img = sprite_cache.safe_open_pil(path)
+    if cancel.is_set():
+        return None
+    return ("bg", path, mtime, img, size, img.resize(size, Image.NEAREST))
+
+def _decode_sprites(path, size, cancel):
+    mtime = sprite_cache.file_mtime(path)
+    img = sprite_cache.safe_open_pil(path)
+    if cancel.is_set():
+        return None
+    return ("sprite", path, mtime, img, size, sprite_cache.slice_frames(img, size))
+
+
+# --------------------
+# 이웃 맵 선읽기
+# --------------------
+class Prefetcher:
+    """현재 맵의 left_map/right_map 에셋을 스레드에서 미리 디코딩/리샘플.
+
+    PhotoImage 생성은 poll()에서(Tk 스레드) 한다. 다른 맵으로 가면 이전 작업은
+    취소되고 늦게 끝난 결과는 버려진다.
+    """
+
+    def __init__(self, maps, bg_renderer, workers=PREFETCH_WORKERS):
+        self.maps = maps
+        self.bg_renderer = bg_renderer
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self.futures = []
+        self.cancel_event = threading.Event()
+        self.ready = []
+        self.last_request = None
+        self.completed = 0
+        self.cancelled = 0
+
+    def neighbors(self, map_name):
+        data = self.maps.get(map_name, {})
+        return [m for m in (data.get("left_map"), data.get("right_map")) if m in self.maps]
+
+    def schedule(self, map_name, bg_size, sprite_paths, sprite_size):
+        request = (map_name, bg_size, tuple(sprite_paths), sprite_size)
+        if request == self.last_request:
+            return
+        self.cancel()
+        self.last_request = request
+        cancel = self.cancel_event = threading.Event()
+        for name in self.neighbors(map_name):
+            bg_path = self.maps[name].get("bg")
+            if bg_path and bg_size and not self.bg_renderer.has(bg_path, bg_size):
+                self._submit(_decode_background, bg_path, bg_size, cancel)
+        for path in sprite_paths:
+            if not sprite_cache.has_frames(path, sprite_size):
+                self._submit(_decode_sprites, path, sprite_size, cancel)
+
+    def _submit(self, fn, *args):
+        self.futures.append(self.executor.submit(fn, *args))
+
+    def cancel(self):
+        # 아직 시작 안 한 작업은 취소, 도는 중인 작업은 결과를 버리게 표시
+        self.cancel_event.set()
+        for f in self.futures:
+            if f.cancel():
+                self.cancelled += 1
+        self.futures = []
+        self.ready = []
+        self.last_request = None
+
+    def poll(self, budget=PHOTOS_PER_POLL):
+        if self.futures:
+            still = []
+            for f in self.futures:
+                if not f.done():
+                    still.append(f)
+                elif not f.cancelled() and f.exception() is None and f.result() is not None:
+                    self.ready.append(f.result())
+            self.futures = still
+        while self.ready and budget > 0:
+            self._install(self.ready.pop(0))
+            budget -= 1
+
+    def _install(self, result):
+        kind, path, mtime, img, size, scaled = result
+        if not sprite_cache.has_sheet(path, mtime):
+            sprite_cache.put_sheet(path, img, mtime)
+        if kind == "bg":
+            self.bg_renderer.store(path, size, scaled)
+        elif not sprite_cache.has_frames(path, size):
+            sprite_cache.put_frames(path, size, scaled, mtime=mtime)
+        self.completed += 1
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,120 @@
+from collections import deque
+import contextlib
+import functools
+import json
+import os
+import time
+
+# --------------------
+# 설정
+# --------------------
+WINDOW = 300            # 단계별로 기억할 최근 샘플 수
+MAX_TRACE_EVENTS = 20000
+
+_NULL = contextlib.nullcontext()
+
+
+# --------------------
+# 프로파일러
+# --------------------
+class Profiler:
+    """틱의 단계/예약 콜백 시간을 재서 p50/p95/p99, 최악값을 보여주고 trace로 저장.
+
+    꺼져 있으면 phase()는 재사용하는 빈 컨텍스트만 돌려줘서 비용이 거의 없다.
+    """
+
+    def __init__(self, window=WINDOW, clock=time.perf_counter):
+        self.enabled = False
+        self.window = window
+        self.clock = clock
+        self.samples = {}
+        self.worst = {}
+        self.counts = {}
+        self.trace = deque(maxlen=MAX_TRACE_EVENTS)
+        self.origin = clock()
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL
+        return self._measure(name)
+
+    @contextlib.contextmanager
+    def _measure(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(name, start, self.clock())
+
+    def timed(self, name):
+        # 함수 전체를 한 단계로 재는 데코레이터 (after 콜백 등)
+        def deco(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = self.clock()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, start, self.clock())
+            return wrapper
+        return deco
+
+    def record(self, name, start, end):
+        dur = end - start
+        buf = self.samples.get(name)
+        if buf is None:
+            buf = self.samples[name] = deque(maxlen=self.window)
+        buf.append(dur)
+        self.counts[name] = self.counts.get(name, 0) + 1
+        if dur > self.worst.get(name, 0.0):
+            self.worst[name] = dur
+        self.trace.append((name, start, dur))
+
+    def reset(self):
+        self.samples.clear()
+        self.worst.clear()
+        self.counts.clear()
+        self.trace.clear()
+
+    # --------------------
+    # 통계
+    # --------------------
+    def percentiles(self, name):
+        buf = self.samples.get(name)
+        if not buf:
+            return None
+        data = sorted(buf)
+        def pick(q):
+            return data[min(len(data) - 1, int(q * len(data)))]
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99),
+                "worst": self.worst.get(name, 0.0), "count": self.counts.get(name, 0)}
+
+    def summary(self):
+        return {name: self.percentiles(name) for name in sorted(self.samples)}
+
+    def summary_lines(self):
+        lines = ["phase           p50    p95    p99  worst (ms)"]
+        for name, st in self.summary().items():
+            lines.append("%-12s %6.2f %6.2f %6.2f %6.2f" % (
+                name[:12], st["p50"] * 1000, st["p95"] * 1000, st["p99"] * 1000, st["worst"] * 1000))
+        return lines
+
+    # --------------------
+    # Chrome trace / Perfetto
+    # --------------------
+    def dump_trace(self, path="trace.json"):
+        events = []
+        for name, start, dur in self.trace:
+            events.append({"name": name, "ph": "X", "pid": os.getpid(), "tid": 1,
+                           "ts": (start - self.origin) * 1e6, "dur": dur * 1e6})
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp, path)
+        return len(events)
+
+
+# 아무 것도 재지 않는 기본값 (GameState 등 headless 코드용)
+NULL_PROFILER = Profiler()
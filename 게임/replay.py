@@ -0,0 +1,150 @@
+"""입력 녹화/재생.
+
+녹화 파일은 zlib으로 압축한 JSON 한 덩어리:
+    {"version": 1, "start": 시작 스냅샷,
+     "keys": [[틱, "a,d"], ...]   # 누른 키 집합이 바뀐 틱만
+     "events": [[틱, "jump"], ...] # 그 틱의 step() 전에 적용할 1회성 동작
+     "end": 마지막 스냅샷}
+
+    python replay.py session.rec            # 최대 속도로 재생 후 결과 검증
+    python replay.py session.rec --realtime # TICK_MS 간격으로 재생
+"""
+import argparse
+import json
+import sys
+import time
+import zlib
+
+from game_state import GameState, MAPS, TICK_MS
+from tilemap import load_maps
+
+FORMAT_VERSION = 1
+
+# 녹화된 결과와 비교할 값
+VERIFY_FIELDS = ("current_map", "player_x", "player_y", "gold", "inventory",
+                 "quest_active", "quest_completed", "tick")
+
+
+# --------------------
+# 녹화
+# --------------------
+class Recorder:
+    def __init__(self, state):
+        self.state = state
+        self.start = state.snapshot()
+        self.keys = []
+        self.events = []
+        self.last_keys = None
+
+    def event(self, name):
+        # 다음 step() 전에 일어난 동작으로 기록
+        self.events.append([self.state.tick + 1, name])
+
+    def record_tick(self, keys):
+        # step() 직전에 호출 — 키 집합이 바뀐 경우만 저장
+        packed = ",".join(sorted(keys))
+        if packed != self.last_keys:
+            self.keys.append([self.state.tick + 1, packed])
+            self.last_keys = packed
+
+    def to_bytes(self):
+        data = {"version": FORMAT_VERSION, "start": self.start, "keys": self.keys,
+                "events": self.events, "end": self.state.snapshot()}
+        return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+def load_recording(path):
+    with open(path, "rb") as f:
+        data = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 녹화 버전: {data.get('version')}")
+    return data
+
+
+# --------------------
+# 재생
+# --------------------
+def apply_event(state, name):
+    # main.py에서 기록하는 동작 이름과 1:1 대응
+    kind, _, arg = name.partition(":")
+    if kind == "jump":
+        state.start_jump()
+    elif kind == "attack":
+        state.start_attack()
+    elif kind == "interact":
+        state.interact()
+    elif kind == "complete_quest":
+        state.complete_quest()
+    elif kind == "buy":
+        item, _, price = arg.rpartition(":")
+        state.buy(item, int(price))
+    elif kind == "map":
+        map_name, x, y = arg.split(":")
+        state.load_map(map_name, (float(x), float(y)))
+    else:
+        raise ValueError(f"알 수 없는 동작: {name}")
+
+def replay(data, state=None, realtime=False, on_tick=None):
+    """녹화를 state에 재생하고 state를 돌려줌. realtime이면 TICK_MS마다 한 틱."""
+    if state is None:
+        state = GameState(MAPS)
+    state.restore(data["start"])
+    end_tick = data["end"]["tick"]
+    keys_at = {tick: set(k for k in packed.split(",") if k) for tick, packed in data["keys"]}
+    events_at = {}
+    for tick, name in data["events"]:
+        events_at.setdefault(tick, []).append(name)
+
+    keys = set()
+    next_time = time.perf_counter()
+    while state.tick < end_tick:
+        tick = state.tick + 1
+        for name in events_at.get(tick, ()):
+            apply_event(state, name)
+        if tick in keys_at:
+            keys = keys_at[tick]
+        state.keys_pressed = keys
+        state.step(keys)
+        if on_tick is not None:
+            on_tick(state)
+        if realtime:
+            next_time += TICK_MS / 1000.0
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    return state
+
+def verify(data, state):
+    # 다른 값 목록 [(이름, 기록값, 재생값)] — 비어 있으면 비트 단위로 같음
+    expected = data["end"]
+    got = state.snapshot()
+    return [(name, expected.get(name), got.get(name)) for name in VERIFY_FIELDS
+            if expected.get(name) != got.get(name)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="녹화 파일 재생/검증")
+    parser.add_argument("path")
+    parser.add_argument("--realtime", action="store_true")
+    args = parser.parse_args(argv)
+
+    data = load_recording(args.path)
+    # 녹화 중 타일맵 맵에 들어갔을 수 있음
+    MAPS.update(load_maps())
+    start = time.perf_counter()
+    state = replay(data, realtime=args.realtime)
+    elapsed = time.perf_counter() - start
+    ticks = data["end"]["tick"] - data["start"]["tick"]
+    print(f"{ticks} ticks, {elapsed:.3f}s ({ticks / elapsed if elapsed else 0:.0f} ticks/s)")
+    diffs = verify(data, state)
+    for name, want, got in diffs:
+        print(f"불일치: {name} 기록={want!r} 재생={got!r}")
+    return 1 if diffs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""세이브 파일: 진행 상태(위치/골드/인벤토리/퀘스트)를 작게 저장하고 시작할 때 불러옴.
+
+형식: MAGIC(6) + 버전(uint16) + zlib(JSON). 쓰기는 백그라운드 스레드에서
+임시 파일에 쓴 뒤 os.replace로 바꿔치기 — 도중에 꺼져도 이전 세이브는 남는다.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import struct
+import threading
+import zlib
+
+# --------------------
+# 설정
+# --------------------
+SAVE_PATH = "save.dat"
+AUTOSAVE_MS = 30000
+MAGIC = b"PXSAVE"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<6sH")
+
+# GameState.snapshot()에서 저장할 값 (틱/입력 같은 순간 상태는 빼고 진행 상태만)
+SAVE_FIELDS = ("current_map", "player_x", "player_y", "player_dir", "last_horizontal",
+               "gold", "inventory", "quest_active", "quest_completed", "quest_kills")
+
+
+# --------------------
+# 인코딩
+# --------------------
+def encode(snap):
+    data = {name: snap[name] for name in SAVE_FIELDS if name in snap}
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(MAGIC, FORMAT_VERSION) + zlib.compress(body, 6)
+
+def decode(blob):
+    if len(blob) < HEADER.size:
+        raise ValueError("세이브 파일이 잘림")
+    magic, version = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("세이브 파일이 아님")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"더 새로운 버전의 세이브: {version}")
+    # 버전이 올라가면 여기서 이전 형식을 현재 형식으로 변환
+    return json.loads(zlib.decompress(blob[HEADER.size:]).decode("utf-8"))
+
+def write_atomic(path, blob):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def load(path=SAVE_PATH):
+    """세이브 내용 dict. 없으면 None, 깨졌으면 알리고 None (새 게임으로 시작)."""
+    try:
+        with open(path, "rb") as f:
+            return decode(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, zlib.error) as e:
+        print(f"세이브 읽기 실패: {path}: {e}")
+        return None
+
+
+# --------------------
+# 백그라운드 저장
+# --------------------
+class AutoSaver:
+    """save(snapshot)은 Tk 스레드에서 바로 반환하고, 인코딩/디스크 쓰기는 작업 스레드 하나가 함.
+
+    쓰는 도중 또 요청이 오면 가장 최근 스냅샷 하나만 남겨 두었다가 이어서 씀.
+    """
+
+    def __init__(self, path=SAVE_PATH):
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self.lock = threading.Lock()
+        self.latest = None      # 아직 안 쓴 최신 스냅샷
+        self.busy = False
+        self.writes = 0
+        self.bytes = 0
+        self.last_error = None
+
+    def save(self, snap):
+        with self.lock:
+            self.latest = snap
+            if self.busy:
+                return
+            self.busy = True
+        self.executor.submit(self._run)
+
+    def _run(self):
+        while True:
+            with self.lock:
+                snap, self.latest = self.latest, None
+                if snap is None:
+                    self.busy = False
+                    return
+            try:
+                blob = encode(snap)
+                write_atomic(self.path, blob)
+                self.writes += 1
+                self.bytes = len(blob)
+            except Exception as e:
+                self.last_error = e
+                print(f"세이브 쓰기 실패: {self.path}: {e}")
+
+    def shutdown(self):
+        # 남은 저장까지 끝내고 종료
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+import os
+
+from PIL import Image, ImageTk
+
+# --------------------
+# 설정
+# --------------------
+FRAME_WIDTH = 32
+SHEET_CACHE_SIZE = 16   # 원본 시트(PIL 이미지) 최대 보관 개수
+FRAME_CACHE_SIZE = 48   # (경로, 크기)별 프레임 목록 최대 보관 개수
+FALLBACK_SIZE = 64
+
+
+# --------------------
+# LRU 캐시
+# --------------------
+class LRUCache:
+    """최근에 안 쓴 항목부터 버리는 크기 제한 캐시 (적중/실패 횟수 기록)."""
+
+    def __init__(self, max_items):
+        self.max_items = max_items
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        if key in self.items:
+            self.items.move_to_end(key)
+            self.hits += 1
+            return self.items[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.max_items:
+            self.items.popitem(last=False)
+            self.evictions += 1
+
+    def discard_if(self, pred):
+        for key in [k for k in self.items if pred(k)]:
+            del self.items[key]
+
+    def clear(self):
+        self.items.clear()
+
+    def __contains__(self, key):
+        # 적중/실패 횟수에 영향 없음
+        return key in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+
+_sheets = LRUCache(SHEET_CACHE_SIZE)
+_frames = LRUCache(FRAME_CACHE_SIZE)
+_atlas = None   # atlas.AtlasPack — 있으면 PNG 대신 미리 잘라둔 프레임 사용
+_photo_factory = None   # None이면 ImageTk.PhotoImage (소프트웨어 렌더러는 PIL 이미지를 그대로 씀)
+
+
+# --------------------
+# helpers
+# --------------------
+def file_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except (OSError, TypeError):
+        return None
+
+def safe_open_pil(path, fallback_size=FALLBACK_SIZE):
+    if path and os.path.exists(path):
+        try:
+            return Image.open(path).convert("RGBA")
+        except:
+            pass
+    return Image.new("RGBA", (fallback_size, fallback_size), (200, 200, 200, 255))
+
+def set_photo_factory(factory):
+    # 이미 만든 프레임은 다른 종류라 비움
+    global _photo_factory
+    _photo_factory = factory
+    _frames.clear()
+
+def to_photo(img):
+    # PIL 이미지 -> 화면에 올릴 이미지 (Tk 스레드에서만 호출)
+    if _photo_factory is None:
+        return ImageTk.PhotoImage(img)
+    return _photo_factory(img)
+
+def get_sheet(path):
+    # 파일이 바뀌면 mtime이 달라져 자동으로 새 키가 됨
+    key = (path, file_mtime(path))
+    img = _sheets.get(key)
+    if img is None:
+        img = safe_open_pil(path)
+        _sheets.put(key, img)
+    return img
+
+def has_sheet(path, mtime=None):
+    return (path, file_mtime(path) if mtime is None else mtime) in _sheets
+
+def put_sheet(path, img, mtime=None):
+    # 다른 스레드에서 디코딩한 시트를 넣을 때 (호출은 Tk 스레드에서)
+    _sheets.put((path, file_mtime(path) if mtime is None else mtime), img)
+
+def slice_frames(img, size, frame_w=FRAME_WIDTH):
+    # PIL 프레임 목록 (PhotoImage 변환 전 단계)
+    num = max(1, img.width // frame_w)
+    frames = []
+    for i in range(num):
+        left = i * frame_w
+        frame = img.crop((left, 0, left + frame_w, img.height))
+        frames.append(frame.resize((size, size), Image.NEAREST))
+    return frames
+
+def use_atlas(pack):
+    # 이전 팩을 돌려줌 — 닫는 건 호출한 쪽이 새 프레임으로 다 바꾼 뒤에
+    global _atlas
+    old, _atlas = _atlas, pack
+    return old
+
+def frame_ms(path, default):
+    # 매니페스트(sprites.json)에 적힌 시트의 프레임 속도 — 아틀라스가 없거나 안 적혀 있으면 default
+    ms = _atlas.frame_ms(path) if _atlas is not None else None
+    return ms or default
+
+def get_frames(path, size, frame_w=FRAME_WIDTH):
+    mtime = file_mtime(path)
+    key = (path, mtime, size, frame_w)
+    frames = _frames.get(key)
+    if frames is None:
+        if _atlas is not None and _atlas.has(path, size, mtime, frame_w):
+            pil_frames = _atlas.frames(path, size)
+        else:
+            pil_frames = slice_frames(get_sheet(path), size, frame_w)
+        frames = [to_photo(f) for f in pil_frames]
+        _frames.put(key, frames)
+    return frames
+
+def has_frames(path, size, frame_w=FRAME_WIDTH):
+    return (path, file_mtime(path), size, frame_w) in _frames
+
+def put_frames(path, size, pil_frames, frame_w=FRAME_WIDTH, mtime=None):
+    # 미리 잘라둔 PIL 프레임 → PhotoImage (Tk 스레드에서만 호출)
+    key = (path, file_mtime(path) if mtime is None else mtime, size, frame_w)
+    _frames.put(key, [to_photo(f) for f in pil_frames])
+
+def invalidate(path=None):
+    # path가 없으면 전부 비움
+    if path is None:
+        _sheets.clear()
+        _frames.clear()
+        return
+    _sheets.discard_if(lambda k: k[0] == path)
+    _frames.discard_if(lambda k: k[0] == path)
+
+def stats():
+    return {
+        "sheets": {"size": len(_sheets), "hits": _sheets.hits, "misses": _sheets.misses,
+                   "evictions": _sheets.evictions},
+        "frames": {"size": len(_frames), "hits": _frames.hits, "misses": _frames.misses,
+                   "evictions": _frames.evictions},
+    }
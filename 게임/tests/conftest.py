@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 게임 모듈은 패키지가 아니라 게임/ 폴더에 바로 있음
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
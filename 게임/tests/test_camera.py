@@ -0,0 +1,31 @@
+import random
+
+from camera import Camera, EntityIndex, visible_entities
+from entities import EntityStore, NPC, MONSTER
+
+
+def brute_force(store, kind, camera):
+    x1, y1, x2, y2 = camera.view_rect()
+    return sorted(i for i in store.indices(kind)
+                  if store.x[i] < x2 and store.x[i] + store.w[i] > x1
+                  and store.y[i] < y2 and store.y[i] + store.h[i] > y1)
+
+def test_entity_index_matches_full_scan():
+    rng = random.Random(1)
+    store = EntityStore()
+    for n in range(400):
+        kind = MONSTER if n % 3 == 0 else NPC
+        store.spawn(kind, rng.randrange(20000), rng.randrange(768), vx=rng.choice((-5, 5)) if kind == MONSTER else 0)
+    camera = Camera()
+    indexes = {kind: EntityIndex(kind) for kind in (NPC, MONSTER)}
+    for step in range(200):
+        camera.follow(step * 97 % 20000, 400, 20000, 768)
+        store.update(50, (0, 0, 20000, 768))
+        if step % 50 == 7:
+            store.kill(store.indices(MONSTER)[0])
+        for kind, index in indexes.items():
+            assert sorted(visible_entities(index, store, camera)) == brute_force(store, kind, camera)
+    # 색인은 생성/제거 때만 다시 만듦 — 매 틱 움직이는 몬스터는 칸을 넘은 것만 옮김
+    assert indexes[NPC].rebuilds <= 5
+    assert indexes[MONSTER].rebuilds <= 5
+    assert indexes[MONSTER].moved > 0
@@ -0,0 +1,177 @@
+"""GameState.step을 Tk 없이 틱 단위로 돌려 보는 테스트.
+
+main.py는 import해도 창을 띄우지 않지만 (Tk root는 main()에서 만듦),
+여기서는 그리기와 상관없는 게임 규칙만 보므로 game_state만 쓴다.
+"""
+import os
+
+from combat import QUEST_KILLS
+from entities import NPC
+from game_state import GameState, MAPS, MOVE_SPEED, BASE_WIDTH, BASE_HEIGHT, SHOP_ITEMS
+import tilemap
+
+
+def make_map(**extra):
+    # 테두리 벽만 있는 중력 없는 맵 한 장
+    data = {"bg": None, "npc": [], "shop": [], "monsters": [],
+            "walls": [(0, 0, BASE_WIDTH, 32), (0, BASE_HEIGHT - 32, BASE_WIDTH, BASE_HEIGHT),
+                      (0, 0, 32, BASE_HEIGHT), (BASE_WIDTH - 32, 0, BASE_WIDTH, BASE_HEIGHT)],
+            "player_start": (200, 300), "left_map_trigger": None, "right_map_trigger": None,
+            "left_map": None, "right_map": None}
+    data.update(extra)
+    return data
+
+def new_state(**extra):
+    state = GameState({"m": make_map(**extra)}, "m")
+    state.load_map("m")
+    return state
+
+
+# --------------------
+# 이동/충돌
+# --------------------
+def test_step_moves_and_accelerates():
+    state = new_state()
+    state.step({'d'})
+    assert (state.player_x, state.player_y) == (200 + MOVE_SPEED, 300)
+    assert state.player_dir == "right" and state.moved
+    state.step({'d'})
+    assert state.player_x == 200 + MOVE_SPEED * 2 + 1
+    state.step(set())
+    assert not state.moved and state.current_speed == MOVE_SPEED
+
+def test_step_vertical_only_without_gravity():
+    state = new_state()
+    state.step({'w'})
+    assert state.player_y == 300 - MOVE_SPEED and state.player_dir == "up"
+    state.step({'s'})
+    assert state.player_dir == "down"
+
+def test_wall_stops_player_at_contact():
+    state = new_state(walls=[(400, 0, 432, BASE_HEIGHT)])
+    for _ in range(40):
+        state.step({'d'})
+    assert state.player_x + state.player_size == 400
+    assert not state.check_collision(state.player_x, state.player_y)
+
+def test_gravity_lands_on_floor():
+    state = new_state(gravity=True, player_start=(200, 100))
+    for _ in range(60):
+        state.step(set())
+    assert state.player_y + state.player_size == BASE_HEIGHT - 32
+    assert state.on_ground
+    assert state.start_jump()
+    state.step(set())
+    assert state.player_y + state.player_size < BASE_HEIGHT - 32
+
+
+# --------------------
+# 포탈
+# --------------------
+def test_portal_right_edge_of_village():
+    state = GameState(MAPS, "village")
+    state.load_map("village", (900, 400))
+    assert state.portal() is None
+    for _ in range(20):
+        state.step({'d'})
+    target = state.portal()
+    assert target is not None and target[0] == "forest"
+    state.load_map(*target)
+    assert state.current_map == "forest" and state.player_x == 10
+
+def test_portal_forest_to_chunked_map(tmp_path):
+    # 숲 오른쪽 끝 -> maps/long_forest (청크 타일맵) -> 왼쪽 끝으로 다시 숲
+    folder = os.path.join(os.path.dirname(tilemap.__file__), tilemap.MAP_DIR)
+    src = str(tmp_path / "long_forest.json")
+    with open(os.path.join(folder, "long_forest.json"), encoding="utf-8") as f, open(src, "w", encoding="utf-8") as out:
+        out.write(f.read())
+    chunked = tilemap.load_maps(str(tmp_path))
+    maps = dict(MAPS, **chunked)
+    state = GameState(maps, "forest")
+    state.load_map("forest", (980, 600))
+    target = state.portal()
+    assert target is not None and target[0] == "long_forest"
+    state.load_map(*target)
+    assert state.data["tilemap"] is chunked["long_forest"]["tilemap"]
+    state.player_x = 0
+    assert state.portal()[0] == "forest"
+    chunked["long_forest"]["tilemap"].close()
+
+def test_portal_to_unloaded_map_is_none():
+    # maps/ 폴더를 못 읽었으면 숲 오른쪽 끝은 막힘
+    state = GameState(MAPS, "forest")
+    state.load_map("forest", (980, 600))
+    assert state.portal() is None
+
+def test_portal_without_neighbor_is_none():
+    state = GameState(MAPS, "village")
+    state.load_map("village", (40, 400))
+    assert state.portal() is None
+
+
+# --------------------
+# 퀘스트/상점
+# --------------------
+def swing(state):
+    state.start_attack()
+    while state.is_attacking:
+        state.step(set())
+
+def test_quest_needs_kills_then_reward():
+    monsters = [(500, 100 + n * 120) for n in range(QUEST_KILLS)]
+    state = new_state(npc=[(220, 300)], monsters=monsters)
+    state.last_horizontal = 'd'
+    kind, title, _ = state.interact()
+    assert (kind, title) == ("npc", "퀘스트") and state.quest_active
+    assert state.interact()[2] == "아직 퀘스트를 완료하지 않았습니다."
+
+    # 남은 몬스터 왼쪽에 붙어 서서 오른쪽으로 때림 (몬스터 hp 3 = 세 번씩, 쫓아와도 맞는 거리)
+    ents = state.entities
+    for _ in range(QUEST_KILLS * 3):
+        alive = state.combat.monsters_of(ents)
+        if not alive:
+            break
+        i = alive[0]
+        state.player_x, state.player_y = ents.x[i] - 64, ents.y[i]
+        swing(state)
+    assert state.quest_kills == QUEST_KILLS and state.quest_ready()
+    assert state.complete_quest() and not state.quest_active
+
+    state.player_x, state.player_y = 220, 300
+    gold = state.gold
+    assert state.interact() == ("npc", "NPC", "퀘스트 완료! 보상 50G")
+    assert state.gold == gold + 50 and not state.quest_completed
+
+def test_shop_interact_and_buy():
+    state = new_state(shop=[(200, 300)])
+    assert state.interact() == ("shop", None, None)
+    name, price = SHOP_ITEMS[0]
+    state.gold = price
+    assert state.buy(name, price)
+    assert state.gold == 0 and state.inventory == [name]
+    assert not state.buy(name, price)
+    assert state.inventory == [name]
+
+def test_snapshot_restore_round_trip():
+    state = new_state(shop=[(200, 300)])
+    state.buy(*SHOP_ITEMS[1])
+    for _ in range(5):
+        state.step({'d'})
+    snap = state.snapshot()
+    other = GameState(state.maps, "m")
+    other.restore(snap)
+    assert other.snapshot() == snap
+
+def test_monster_kill_keeps_interaction_grid():
+    # 몬스터가 죽어도 NPC/상점 색인은 다시 만들지 않음
+    state = new_state(npc=[(220, 300)], monsters=[(500, 300)])
+    assert state.nearby() == "npc"
+    builds = state.interactions.builds
+    (i,) = state.combat.monsters_of(state.entities)
+    state.entities.kill(i)
+    assert state.nearby() == "npc"
+    assert state.interactions.builds == builds
+    state.entities.spawn(NPC, 900, 300)    # NPC가 새로 생기면 다시 만듦
+    state.player_x = 900
+    assert state.nearby() == "npc"
+    assert state.interactions.builds == builds + 1
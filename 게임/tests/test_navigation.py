@@ -0,0 +1,55 @@
+from entities import MONSTER, DEFAULT_SIZE
+from game_state import GameState, MAPS, BASE_WIDTH, BASE_HEIGHT
+from navigation import NavGrid, astar
+
+
+# 가운데 세로 벽 — 아래쪽(y 400~736)만 뚫려 있음. 돌아가는 동안에도 추적 거리 안
+WALL = (400, 32, 432, 400)
+
+def walled_map():
+    return {"bg": None, "npc": [], "shop": [], "monsters": [(300, 200)],
+            "walls": [(0, 0, BASE_WIDTH, 32), (0, BASE_HEIGHT - 32, BASE_WIDTH, BASE_HEIGHT),
+                      (0, 0, 32, BASE_HEIGHT), (BASE_WIDTH - 32, 0, BASE_WIDTH, BASE_HEIGHT), WALL],
+            "player_start": (600, 200), "left_map_trigger": None, "right_map_trigger": None,
+            "left_map": None, "right_map": None}
+
+def run_search(grid, start, goal):
+    search = astar(grid, start, goal)
+    try:
+        while True:
+            next(search)
+    except StopIteration as stop:
+        return stop.value
+
+
+def test_astar_goes_through_gap():
+    data = walled_map()
+    grid = NavGrid(data["walls"], BASE_WIDTH, BASE_HEIGHT, DEFAULT_SIZE[MONSTER])
+    path = run_search(grid, grid.cell_of(300, 100), grid.cell_of(600, 100))
+    assert path
+    # 벽 아래 틈으로 내려갔다가 올라옴
+    assert max(y for _, y in path) * grid.cell >= WALL[3]
+    for cx, cy in path:
+        assert grid.walkable(cx, cy)
+
+def test_monster_paths_around_wall():
+    state = GameState({"m": walled_map()}, "m")
+    state.load_map("m")
+    ents = state.entities
+    (i,) = state.combat.monsters_of(ents)
+    size = DEFAULT_SIZE[MONSTER]
+    for _ in range(800):
+        state.step(set())
+        x, y = ents.x[i], ents.y[i]
+        # 가는 동안 한 번도 벽과 겹치지 않음
+        assert not (x < WALL[2] and x + size > WALL[0] and y < WALL[3] and y + size > WALL[1])
+    assert ents.x[i] >= WALL[2]
+    assert abs(ents.x[i] - state.player_x) < 64 and abs(ents.y[i] - state.player_y) < 64
+
+def test_village_monsters_chase():
+    # 실제 맵에서도 탐색이 돎 (숲은 중력 맵이라 추적 없음)
+    state = GameState(MAPS, "village")
+    state.load_map("village", (300, 500))
+    for _ in range(30):
+        state.step(set())
+    assert state.nav.expanded > 0 and state.paths
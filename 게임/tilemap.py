@@ -0,0 +1,420 @@
+"""청크 단위 타일맵 (큰 맵을 배경 PNG 한 장 대신 조각으로).
+
+    python tilemap.py new maps/long_forest.json --chunks 40x2 --left forest   # 예제 맵 생성
+    python tilemap.py compile maps/long_forest.json             # → .mapc (보통은 처음 읽을 때 자동)
+    python tilemap.py info maps/long_forest.json
+
+원본 JSON:
+    {"version": 1, "tile_size": 32, "chunk_tiles": 16, "chunks_w": 40, "chunks_h": 2,
+     "palette": {"1": "#4a7a3a", ...},   # 타일 번호 -> 색 (0 = 빈칸)
+     "tileset": "tiles.png",             # 있으면 가로로 늘어선 타일 그림 사용 (번호 1부터)
+     "player_start": [x, y], "left_map": ..., "right_map": ..., "gravity": true,
+     "npc": [[x, y]], "shop": [[x, y]], "monsters": [[x, y]],
+     "chunks": {"cx,cy": {"tiles": [행 우선 타일 번호...], "solid": [0/1 ...]}}}
+
+컴파일본(.mapc): MAGIC + 헤더 길이(uint32 LE) + marshal(헤더) + marshal(청크 타일)...
+헤더에 청크별 (오프셋, 길이)와 충돌 사각형이 다 있어서 맵 로드는 헤더만 읽고,
+타일 그림은 ChunkStreamer가 플레이어 주변 청크만 스레드에서 읽어 만든다.
+"""
+import argparse
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import glob
+import json
+import marshal
+import math
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b"PXTMAP01"
+FORMAT_VERSION = 1
+MAP_DIR = "maps"
+CHUNK_BUDGET = 64 * 1024 * 1024   # 올려둔 청크 그림의 최대 바이트 (RGBA 기준 추정)
+STREAM_RADIUS = 1                 # 화면에 걸친 청크 바깥으로 미리 읽을 청크 수
+STREAM_WORKERS = 1
+CHUNKS_PER_POLL = 2               # 한 프레임에 PhotoImage로 바꿀 청크 수
+
+
+# --------------------
+# 컴파일
+# --------------------
+def solid_rects(solid, cx, cy, chunk_tiles, tile_size):
+    # 충돌 칸을 행마다 가로로 이어 붙여 사각형으로 (월드 좌표)
+    rects = []
+    ox = cx * chunk_tiles * tile_size
+    oy = cy * chunk_tiles * tile_size
+    for row in range(chunk_tiles):
+        col = 0
+        while col < chunk_tiles:
+            if solid[row * chunk_tiles + col]:
+                start = col
+                while col < chunk_tiles and solid[row * chunk_tiles + col]:
+                    col += 1
+                rects.append((ox + start * tile_size, oy + row * tile_size,
+                              ox + col * tile_size, oy + (row + 1) * tile_size))
+            else:
+                col += 1
+    return rects
+
+def compiled_path(src):
+    return os.path.splitext(src)[0] + ".mapc"
+
+def compile_map(src, out=None):
+    out = out or compiled_path(src)
+    with open(src, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 타일맵 버전: {data.get('version')}")
+    tile_size = data.get("tile_size", 32)
+    chunk_tiles = data.get("chunk_tiles", 16)
+    cells = chunk_tiles * chunk_tiles
+    st = os.stat(src)
+
+    walls = []
+    offsets = {}
+    blobs = []
+    offset = 0
+    for key, chunk in data.get("chunks", {}).items():
+        cx, cy = (int(v) for v in key.split(","))
+        tiles = chunk.get("tiles") or [0] * cells
+        solid = chunk.get("solid") or [0] * cells
+        if len(tiles) != cells or len(solid) != cells:
+            raise ValueError(f"{src}: 청크 {key} 크기가 {cells}칸이 아님")
+        walls.extend(solid_rects(solid, cx, cy, chunk_tiles, tile_size))
+        blob = marshal.dumps(array("H", tiles).tobytes())
+        offsets[(cx, cy)] = (offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+
+    meta = {k: data[k] for k in ("player_start", "left_map", "right_map", "left_map_trigger",
+                                 "right_map_trigger", "gravity", "npc", "shop", "monsters")
+            if k in data}
+    header = {"version": FORMAT_VERSION, "source_mtime": st.st_mtime, "source_size": st.st_size,
+              "tile_size": tile_size, "chunk_tiles": chunk_tiles,
+              "chunks_w": data["chunks_w"], "chunks_h": data["chunks_h"],
+              "palette": {int(k): v for k, v in data.get("palette", {}).items()},
+              "tileset": data.get("tileset"), "meta": meta, "walls": walls, "chunks": offsets}
+    head = marshal.dumps(header)
+    tmp = out + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(head)))
+        f.write(head)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, out)
+    return header
+
+def compile_staged(src):
+    """원본을 컴파일본 옆 임시 파일로 컴파일 (다시 읽기용). 열려 있는 컴파일본은 건드리지 않음."""
+    staged = compiled_path(src) + ".new"
+    compile_map(src, staged)
+    return staged
+
+def install_staged(src, staged):
+    # 이전 TileMap을 닫은 뒤 — 그 다음 TileMap(src)은 최신으로 보고 헤더만 읽음
+    os.replace(staged, compiled_path(src))
+
+
+# --------------------
+# 런타임
+# --------------------
+class TileMap:
+    """컴파일된 맵. 헤더만 읽어두고 청크 타일은 요청할 때 mmap에서 꺼냄."""
+
+    def __init__(self, src):
+        self.source = src
+        self.path = compiled_path(src)
+        if not self._fresh():
+            compile_map(src, self.path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = self._read_header()
+        h = self.header
+        self.tile_size = h["tile_size"]
+        self.chunk_tiles = h["chunk_tiles"]
+        self.chunk_px = self.tile_size * self.chunk_tiles
+        self.size = (h["chunks_w"] * self.chunk_px, h["chunks_h"] * self.chunk_px)
+        self._tileset = None
+
+    def _read_header(self):
+        mm = self._mm
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"타일맵 컴파일본이 아님: {self.path}")
+        (head_len,) = struct.unpack_from("<I", mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = marshal.loads(mm[start:start + head_len])
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 타일맵 버전: {header.get('version')}")
+        self.data_start = start + head_len
+        return header
+
+    def _fresh(self):
+        # 원본 JSON이 컴파일 이후 바뀌지 않았으면 그대로 사용
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                head = f.read(len(MAGIC) + 4)
+                if head[:len(MAGIC)] != MAGIC:
+                    return False
+                (head_len,) = struct.unpack_from("<I", head, len(MAGIC))
+                header = marshal.loads(f.read(head_len))
+            st = os.stat(self.source)
+        except (OSError, ValueError, EOFError, struct.error):
+            return False
+        return (header.get("version") == FORMAT_VERSION and header.get("source_mtime") == st.st_mtime
+                and header.get("source_size") == st.st_size)
+
+    def map_data(self):
+        # MAPS 항목과 같은 모양 (배경 PNG 대신 "tilemap")
+        meta = self.header["meta"]
+        w, h = self.size
+        return {"bg": None, "tilemap": self, "size": self.size,
+                "walls": list(self.header["walls"]),
+                "npc": [tuple(p) for p in meta.get("npc", [])],
+                "shop": [tuple(p) for p in meta.get("shop", [])],
+                "monsters": [tuple(p) for p in meta.get("monsters", [])],
+                "player_start": tuple(meta.get("player_start", (64, 64))),
+                "left_map_trigger": tuple(meta.get("left_map_trigger", (0, 0, 32, h))),
+                "right_map_trigger": tuple(meta.get("right_map_trigger", (w - 32, 0, w, h))),
+                "left_map": meta.get("left_map"), "right_map": meta.get("right_map"),
+                "gravity": meta.get("gravity", False)}
+
+    def chunk_tiles_at(self, cx, cy):
+        entry = self.header["chunks"].get((cx, cy))
+        if entry is None:
+            return None
+        off, length = entry
+        start = self.data_start + off
+        tiles = array("H")
+        tiles.frombytes(marshal.loads(self._mm[start:start + length]))
+        return tiles
+
+    def chunks_in(self, x1, y1, x2, y2):
+        # 월드 사각형에 걸친 청크 좌표들 (맵 밖은 제외)
+        cp = self.chunk_px
+        cw, ch = self.header["chunks_w"], self.header["chunks_h"]
+        return [(cx, cy)
+                for cy in range(max(0, int(y1 // cp)), min(ch, int(math.ceil(y2 / cp))))
+                for cx in range(max(0, int(x1 // cp)), min(cw, int(math.ceil(x2 / cp))))]
+
+    def render_chunk(self, cx, cy, size):
+        """청크 하나를 size(w, h) 크기 PIL 이미지로. 워커 스레드에서 호출 (Tk 금지)."""
+        from PIL import Image
+        ts, n = self.tile_size, self.chunk_tiles
+        img = Image.new("RGBA", (self.chunk_px, self.chunk_px), (0, 0, 0, 0))
+        tiles = self.chunk_tiles_at(cx, cy)
+        if tiles is not None:
+            tileset = self._load_tileset()
+            palette = self.header["palette"]
+            for i, tile in enumerate(tiles):
+                if not tile:
+                    continue
+                x, y = (i % n) * ts, (i // n) * ts
+                if tileset is not None and tile <= tileset.width // ts:
+                    img.paste(tileset.crop(((tile - 1) * ts, 0, tile * ts, ts)), (x, y))
+                elif tile in palette:
+                    img.paste(palette[tile], (x, y, x + ts, y + ts))
+        if size != img.size:
+            img = img.resize(size, Image.NEAREST)
+        return img
+
+    def _load_tileset(self):
+        name = self.header.get("tileset")
+        if not name:
+            return None
+        if self._tileset is None:
+            import sprite_cache
+            path = os.path.join(os.path.dirname(self.source), name)
+            self._tileset = sprite_cache.safe_open_pil(path, self.tile_size)
+        return self._tileset
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+
+def map_sources(folder=MAP_DIR):
+    return sorted(glob.glob(os.path.join(folder, "*.json")))
+
+def map_name(src):
+    return os.path.splitext(os.path.basename(src))[0]
+
+def load_maps(folder=MAP_DIR):
+    # maps/*.json -> {이름: MAPS 항목}. 폴더가 없으면 빈 dict
+    return {map_name(src): TileMap(src).map_data() for src in map_sources(folder)}
+
+
+# --------------------
+# 스트리밍
+# --------------------
+class ChunkStreamer:
+    """플레이어 주변 청크만 스레드에서 그려 올리고, 예산을 넘으면 먼 것부터 내림.
+
+    update()는 필요한 청크를 워커에 맡기고, poll()은 Tk 스레드에서 결과를
+    make_photo(PIL 이미지)로 바꿔 보관한다. get()은 지금 크기의 그림이 있을 때만 돌려줌.
+    """
+
+    def __init__(self, tmap, make_photo, budget=CHUNK_BUDGET, radius=STREAM_RADIUS,
+                 workers=STREAM_WORKERS):
+        self.tmap = tmap
+        self.make_photo = make_photo
+        self.budget = budget
+        self.radius = radius
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunks")
+        self.loaded = OrderedDict()   # (cx, cy) -> (크기, 그림, 바이트)
+        self.pending = {}             # (cx, cy) -> (크기, future)
+        self.bytes = 0
+        self.wanted = set()
+        self.loads = 0
+        self.unloads = 0
+
+    def update(self, view_rect, size):
+        """view_rect(월드 좌표)에 걸친 청크 목록 반환. 없는 것은 읽기 시작."""
+        x1, y1, x2, y2 = view_rect
+        visible = self.tmap.chunks_in(x1, y1, x2, y2)
+        pad = self.radius * self.tmap.chunk_px
+        self.wanted = set(self.tmap.chunks_in(x1 - pad, y1 - pad, x2 + pad, y2 + pad))
+        # 화면에 보이는 것부터
+        for key in visible + [k for k in self.wanted if k not in visible]:
+            have = self.loaded.get(key)
+            if have is not None and have[0] == size:
+                self.loaded.move_to_end(key)
+                continue
+            job = self.pending.get(key)
+            if job is not None and job[0] == size:
+                continue
+            if job is not None:
+                job[1].cancel()
+            self.pending[key] = (size, self.executor.submit(self.tmap.render_chunk, key[0], key[1], size))
+        # 더 이상 필요 없는 대기 작업은 취소
+        for key in [k for k in self.pending if k not in self.wanted]:
+            self.pending.pop(key)[1].cancel()
+        return visible
+
+    def poll(self, budget=CHUNKS_PER_POLL):
+        installed = 0
+        for key in list(self.pending):
+            if installed >= budget:
+                break
+            size, future = self.pending[key]
+            if not future.done():
+                continue
+            del self.pending[key]
+            if future.cancelled() or future.exception() is not None:
+                continue
+            self._install(key, size, future.result())
+            installed += 1
+        if installed:
+            self._evict()
+        return installed
+
+    def _install(self, key, size, img):
+        old = self.loaded.pop(key, None)
+        if old is not None:
+            self.bytes -= old[2]
+        nbytes = size[0] * size[1] * 4
+        self.loaded[key] = (size, self.make_photo(img), nbytes)
+        self.bytes += nbytes
+        self.loads += 1
+
+    def _evict(self):
+        # 예산을 넘으면 필요 없는 것 중 오래 안 쓴 것부터
+        for key in list(self.loaded):
+            if self.bytes <= self.budget:
+                break
+            if key in self.wanted:
+                continue
+            self.bytes -= self.loaded.pop(key)[2]
+            self.unloads += 1
+
+    def get(self, key, size=None):
+        # size가 None이면 크기와 상관없이 (새 크기 그림이 오기 전 임시로)
+        have = self.loaded.get(key)
+        if have is None or (size is not None and have[0] != size):
+            return None
+        return have[1]
+
+    def shutdown(self):
+        for _, future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
+        self.loaded.clear()
+        self.bytes = 0
+
+
+# --------------------
+# CLI
+# --------------------
+def new_map(path, chunks_w, chunks_h, chunk_tiles=16, tile_size=32, left_map=None, right_map=None):
+    # 바닥/천장만 있는 길쭉한 예제 맵 (left_map/right_map = 양 끝 포탈로 이어질 맵 이름)
+    cells = chunk_tiles * chunk_tiles
+    chunks = {}
+    rows_total = chunks_h * chunk_tiles
+    for cy in range(chunks_h):
+        for cx in range(chunks_w):
+            tiles = [0] * cells
+            solid = [0] * cells
+            for row in range(chunk_tiles):
+                world_row = cy * chunk_tiles + row
+                for col in range(chunk_tiles):
+                    i = row * chunk_tiles + col
+                    if world_row in (0, rows_total - 1):
+                        tiles[i] = 2
+                        solid[i] = 1
+                    else:
+                        tiles[i] = 1
+            chunks[f"{cx},{cy}"] = {"tiles": tiles, "solid": solid}
+    h = chunks_h * chunk_tiles * tile_size
+    data = {"version": FORMAT_VERSION, "tile_size": tile_size, "chunk_tiles": chunk_tiles,
+            "chunks_w": chunks_w, "chunks_h": chunks_h,
+            "palette": {"1": "#3f7a45", "2": "#6b4f2a"},
+            "player_start": [64, h - tile_size - 65], "gravity": True,
+            "left_map": left_map, "right_map": right_map,
+            "npc": [[cx * chunk_tiles * tile_size + 200, h - tile_size - 32] for cx in range(0, chunks_w, 4)],
+            "shop": [], "monsters": [], "chunks": chunks}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="청크 타일맵 생성/컴파일/조회")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    n = sub.add_parser("new")
+    n.add_argument("path")
+    n.add_argument("--chunks", default="40x2", help="가로x세로 청크 수")
+    n.add_argument("--left", help="왼쪽 끝 포탈로 갈 맵 이름")
+    n.add_argument("--right", help="오른쪽 끝 포탈로 갈 맵 이름")
+    c = sub.add_parser("compile")
+    c.add_argument("path")
+    i = sub.add_parser("info")
+    i.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "new":
+        w, h = (int(v) for v in args.chunks.split("x"))
+        new_map(args.path, w, h, left_map=args.left, right_map=args.right)
+        print(f"{args.path}: {w}x{h} chunks, left={args.left} right={args.right}")
+    elif args.cmd == "compile":
+        header = compile_map(args.path)
+        out = compiled_path(args.path)
+        print(f"{out}: {len(header['chunks'])} chunks, {len(header['walls'])} walls, "
+              f"{os.path.getsize(out)} bytes")
+    else:
+        tmap = TileMap(args.path)
+        h = tmap.header
+        print(f"{tmap.path}: size={tmap.size[0]}x{tmap.size[1]} chunks={len(h['chunks'])} "
+              f"walls={len(h['walls'])} tile={tmap.tile_size} chunk={tmap.chunk_tiles}")
+        tmap.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import time
+
+# --------------------
+# 설정
+# --------------------
+TRANSITION_MS = 600    # 슬라이드 아웃 + 슬라이드 인 전체 시간
+
+
+# --------------------
+# easing
+# --------------------
+def linear(p):
+    return p
+
+def ease_in_out(p):
+    return p * p * (3 - 2 * p)
+
+def ease_out(p):
+    return 1 - (1 - p) * (1 - p)
+
+EASINGS = {"linear": linear, "ease_in_out": ease_in_out, "ease_out": ease_out}
+
+
+# --------------------
+# 맵 전환 (프레임마다 update() 호출)
+# --------------------
+class MapTransition:
+    """slide-out → swap → slide-in 을 렌더 프레임마다 한 단계씩 진행.
+
+    collect_items()는 지금 화면의 캔버스 아이템 목록, swap()은 이전 맵 아이템을
+    지우고 새 맵을 로드한다. 이벤트 루프를 막거나 다시 돌리지 않는다.
+    """
+
+    def __init__(self, canvas, collect_items, swap, width, duration_ms=TRANSITION_MS,
+                 easing="ease_in_out", on_done=None, clock=time.perf_counter):
+        self.canvas = canvas
+        self.collect_items = collect_items
+        self.swap = swap
+        self.width = width
+        self.half = duration_ms / 2000.0
+        self.ease = EASINGS[easing] if isinstance(easing, str) else easing
+        self.on_done = on_done
+        self.clock = clock
+
+        self.phase = "out"
+        self.items = collect_items()
+        self.offset = 0.0
+        self.start_time = self.phase_start = clock()
+        self.elapsed = None    # 끝나면 실제 걸린 시간(초)
+
+    @property
+    def active(self):
+        return self.phase != "done"
+
+    def _slide_to(self, offset):
+        delta = offset - self.offset
+        if delta:
+            for it in self.items:
+                try:
+                    self.canvas.move(it, delta, 0)
+                except Exception:
+                    pass
+        self.offset = offset
+
+    def _progress(self, now):
+        if self.half <= 0:
+            return 1.0
+        return min(1.0, (now - self.phase_start) / self.half)
+
+    def update(self):
+        now = self.clock()
+        if self.phase == "out":
+            p = self._progress(now)
+            self._slide_to(-self.width * self.ease(p))
+            if p >= 1.0:
+                # 다 밀려난 화면을 한 프레임 보여준 뒤 교체
+                self.phase = "swap"
+        elif self.phase == "swap":
+            self.swap()
+            self.items = self.collect_items()
+            self.offset = 0.0
+            self._slide_to(self.width)
+            self.phase = "in"
+            self.phase_start = now
+        elif self.phase == "in":
+            p = self._progress(now)
+            self._slide_to(self.width * (1 - self.ease(p)))
+            if p >= 1.0:
+                self.phase = "done"
+                self.elapsed = now - self.start_time
+                if self.on_done is not None:
+                    self.on_done(self)
+        return self.active
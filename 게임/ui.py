@@ -0,0 +1,194 @@
+from collections import Counter
+import functools
+import unicodedata
+
+from canvas_pool import CanvasPool
+
+# --------------------
+# 설정
+# --------------------
+FONT = ("Arial", 14)
+LINE_HEIGHT = 24
+PANEL_MARGIN = 20
+PANEL_PADDING = 12
+WRAP_COLUMNS = 56       # 한 줄 최대 폭 (반각 글자 기준, 한글은 2칸)
+DIALOG_TICKS = 80       # 대화창이 저절로 닫히기까지 틱 수 (50ms x 80 = 4초)
+
+
+# --------------------
+# 글자 배치 (같은 문장은 한 번만 계산)
+# --------------------
+def char_columns(ch):
+    # 한글 등 전각 글자는 2칸
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+@functools.lru_cache(maxsize=256)
+def wrap_text(text, columns=WRAP_COLUMNS):
+    """문장을 columns 폭에 맞춰 줄 목록(튜플)으로. 공백에서 먼저 끊음."""
+    lines = []
+    for para in text.split("\n"):
+        line, width = "", 0
+        for word in para.split(" "):
+            w = sum(char_columns(c) for c in word)
+            if line and width + 1 + w > columns:
+                lines.append(line.rstrip())
+                line, width = "", 0
+            while w > columns:
+                # 공백 없이 긴 단어는 글자 단위로 자름
+                cut, cw = 0, 0
+                while cw + char_columns(word[cut]) <= columns:
+                    cw += char_columns(word[cut])
+                    cut += 1
+                lines.append(word[:cut])
+                word, w = word[cut:], w - cw
+            line = f"{line} {word}" if line else word
+            width = width + 1 + w if width else w
+        lines.append(line.rstrip())
+    return tuple(lines)
+
+
+# --------------------
+# 게임 안 UI (대화창/상점/가방)
+# --------------------
+class GameUI:
+    """messagebox/Toplevel 대신 캔버스 위 패널 하나에 그리는 UI.
+
+    창을 띄우지 않으므로 게임은 계속 돌고 키 입력도 그대로 들어온다.
+    대화는 큐에 쌓여 하나씩 보이고 틱마다 줄어드는 시간이 다 되거나 E로 닫힘.
+    상점은 숫자 키로 사고 Esc로 닫으며, 상점에서 멀어지면 저절로 닫힌다.
+    패널/줄 텍스트 아이템은 풀에서 재사용하고, 내용이 그대로면 draw()는 아무것도 안 함.
+    """
+
+    def __init__(self, canvas, retained, state, shop_items=(), on_buy=None):
+        self.canvas = canvas
+        self.retained = retained
+        self.state = state
+        self.shop_items = list(shop_items)
+        self.on_buy = on_buy            # (이름, 가격) -> 성공 여부
+        self.dialogs = []               # [(제목, 메시지)]
+        self.dialog_ticks = 0
+        self.shop_open = False
+        self.shop_notice = ""
+        self.inventory_open = False
+        self.panel = None
+        self.lines = CanvasPool(canvas, lambda c: c.create_text(0, 0, anchor="nw", font=FONT))
+        self.shown = None               # 마지막으로 그린 (내용, 창 크기)
+        self.redraws = 0
+
+    # --------------------
+    # 열기/닫기
+    # --------------------
+    def say(self, title, message):
+        self.dialogs.append((title, message))
+        if len(self.dialogs) == 1:
+            self.dialog_ticks = DIALOG_TICKS
+
+    def dismiss(self):
+        if self.dialogs:
+            self.dialogs.pop(0)
+            self.dialog_ticks = DIALOG_TICKS
+
+    def open_shop(self):
+        self.shop_open = True
+        self.shop_notice = ""
+        self.inventory_open = False
+
+    def close(self):
+        self.shop_open = False
+        self.inventory_open = False
+
+    def toggle_inventory(self):
+        self.inventory_open = not self.inventory_open
+        if self.inventory_open:
+            self.shop_open = False
+
+    def visible(self):
+        return bool(self.dialogs) or self.shop_open or self.inventory_open
+
+    # --------------------
+    # 입력/틱
+    # --------------------
+    def key(self, key):
+        """UI가 쓴 키면 True (호출한 쪽은 그 키로 다른 동작을 하지 않음)."""
+        if self.dialogs and key in ("e", "return", "escape"):
+            self.dismiss()
+            return True
+        if self.shop_open:
+            if key == "escape":
+                self.close()
+                return True
+            if key.isdigit() and 1 <= int(key) <= len(self.shop_items):
+                name, price = self.shop_items[int(key) - 1]
+                ok = self.on_buy(name, price) if self.on_buy is not None else False
+                self.shop_notice = f"{name} 구매 성공!" if ok else "골드 부족!"
+                return True
+        if key == "i":
+            self.toggle_inventory()
+            return True
+        if key == "escape" and self.inventory_open:
+            self.close()
+            return True
+        return False
+
+    def tick(self):
+        # 게임 틱마다 — 대화 시간 줄이기, 상점에서 벗어나면 닫기
+        if self.dialogs:
+            self.dialog_ticks -= 1
+            if self.dialog_ticks <= 0:
+                self.dismiss()
+        if self.shop_open and self.state.nearby() != "shop":
+            self.close()
+
+    # --------------------
+    # 그리기
+    # --------------------
+    def content(self):
+        # (제목, 본문 줄들, 안내) — 보이는 게 없으면 None
+        state = self.state
+        if self.dialogs:
+            title, message = self.dialogs[0]
+            more = f"  (+{len(self.dialogs) - 1})" if len(self.dialogs) > 1 else ""
+            return title, wrap_text(message), "[E] 닫기" + more
+        if self.shop_open:
+            body = tuple(f"{n}. {name} ({price}G)" for n, (name, price) in enumerate(self.shop_items, 1))
+            if self.shop_notice:
+                body += ("", self.shop_notice)
+            return f"상점 — 소지금 {state.gold} G", body, f"[1-{len(self.shop_items)}] 구매  [Esc] 닫기"
+        if self.inventory_open:
+            counts = Counter(state.inventory)
+            body = tuple(f"{name} x{n}" for name, n in counts.items()) or ("(비어 있음)",)
+            return f"가방 — 소지금 {state.gold} G", body, "[I] 닫기"
+        return None
+
+    def draw(self, width, height):
+        """내용이나 창 크기가 바뀌었을 때만 패널을 다시 배치. 다시 그렸으면 True."""
+        content = self.content()
+        key = (content, width, height)
+        if key == self.shown:
+            return False
+        self.shown = key
+        self.redraws += 1
+        retained = self.retained
+        if content is None:
+            if self.panel is not None:
+                retained.config(self.panel, state="hidden")
+            self.lines.sync(0)
+            return True
+        title, body, footer = content
+        rows = (title,) + body + (footer,)
+        x1 = PANEL_MARGIN
+        x2 = max(x1 + 1, width - PANEL_MARGIN)
+        y2 = height - PANEL_MARGIN
+        y1 = y2 - PANEL_PADDING * 2 - LINE_HEIGHT * len(rows)
+        if self.panel is None:
+            self.panel = self.canvas.create_rectangle(x1, y1, x2, y2, fill="white", outline="black")
+        retained.coords(self.panel, x1, y1, x2, y2)
+        retained.config(self.panel, state="normal")
+        # 월드 아이템 위로 (새로 만든 풀 아이템에 가려지지 않게)
+        self.canvas.tag_raise(self.panel)
+        items = self.lines.sync(len(rows))
+        for n, (item, text) in enumerate(zip(items, rows)):
+            retained.coords(item, x1 + PANEL_PADDING, y1 + PANEL_PADDING + n * LINE_HEIGHT)
+            retained.config(item, text=text, fill="blue" if n in (0, len(rows) - 1) else "black")
+            self.canvas.tag_raise(item)
+        return True